@@ -0,0 +1 @@
+"""Benchmarks for nhl_api, run against a local stand-in for the NHL API (see benchmarks/README.md)"""
@@ -0,0 +1,61 @@
+"""Compare two benchmark result files (from benchmarks.run)
+
+Prints the relative change of each metric per scenario and exits with status 1 if any
+metric regressed by more than the threshold - handy for checking a change against its
+parent commit.
+
+Usage:
+    python -m benchmarks.compare before.json after.json [--threshold 0.10]
+"""
+import argparse
+import json
+import sys
+
+# metric -> True if higher is better
+METRICS = {
+    'p50_ms': False,
+    'p99_ms': False,
+    'requests_per_s': True,
+    'peak_rss_bytes': False,
+    'peak_alloc_bytes': False,
+}
+
+
+def compare(before, after, threshold=0.10):
+    """Return [(scenario, metric, before, after, change, regressed)] for scenarios in both reports"""
+    rows = []
+    for name, old in before['scenarios'].items():
+        new = after['scenarios'].get(name)
+        if new is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if not old.get(metric) or new.get(metric) is None:
+                continue
+            change = (new[metric] - old[metric]) / old[metric]
+            regressed = -change > threshold if higher_is_better else change > threshold
+            rows.append((name, metric, old[metric], new[metric], change, regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.compare')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=0.10, help="Relative change counted as a regression")
+    args = parser.parse_args(argv)
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    print(f"{str(before.get('commit'))[:10]} -> {str(after.get('commit'))[:10]}")
+    rows = compare(before, after, args.threshold)
+    for name, metric, old, new, change, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{name:<22}{metric:<18}{old:>14.2f}{new:>14.2f}{change:>+10.1%}{flag}")
+    if any(row[-1] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,314 @@
+"""Fixtures served by the benchmark stub server
+
+Every endpoint called by Nhl, Game, Player and Team has a deterministic synthetic payload
+shaped like the real API response (see nhl_api/README.md). Recorded responses can be
+dropped into a fixtures directory, mirroring the URL path - for example
+`<dir>/v1/gamecenter/2023020204/play-by-play.json` or `<dir>/stats/rest/en/team.json` -
+and take precedence over the synthetic ones (query strings are ignored when matching).
+`python -m benchmarks.fixtures record DIR` records a set from the live API.
+"""
+import argparse
+import json
+import os
+import random
+import re
+
+SEASON = 20232024
+TEAM_CODES = [
+    'ANA', 'ARI', 'BOS', 'BUF', 'CGY', 'CAR', 'CHI', 'COL', 'CBJ', 'DAL', 'DET', 'EDM', 'FLA', 'LAK', 'MIN', 'MTL',
+    'NSH', 'NJD', 'NYI', 'NYR', 'OTT', 'PHI', 'PIT', 'SJS', 'SEA', 'STL', 'TBL', 'TOR', 'VAN', 'VGK', 'WSH', 'WPG',
+]
+# Active clubs get ids 1..32; historical franchises fill the rest of the team list
+TEAMS = [{'id': i + 1, 'franchiseId': i + 1, 'fullName': f"Team {code}", 'leagueId': 133,
+          'rawTricode': code, 'triCode': code} for i, code in enumerate(TEAM_CODES)]
+TEAMS += [{'id': 33 + i, 'franchiseId': 33 + i, 'fullName': f"Historical {i}", 'leagueId': 133,
+           'rawTricode': f"H{i:02d}", 'triCode': f"H{i:02d}"} for i in range(28)]
+PLAY_TYPES = [
+    (502, 'faceoff'), (503, 'hit'), (504, 'giveaway'), (505, 'goal'), (506, 'shot-on-goal'),
+    (507, 'missed-shot'), (508, 'blocked-shot'), (509, 'penalty'), (516, 'stoppage'), (525, 'takeaway'),
+]
+
+
+def _rng(*seed):
+    return random.Random(repr(seed))  # str seeds are stable across processes, unlike hash()
+
+
+def _mmss(seconds):
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def _teams_for_game(game_id):
+    rng = _rng('teams', game_id)
+    away, home = rng.sample(range(32), 2)
+    return TEAMS[away], TEAMS[home]
+
+
+def _roster(team):
+    return [team['id'] * 1000 + n for n in range(20)]
+
+
+def _game_header(game_id, game_state='OFF'):
+    away, home = _teams_for_game(game_id)
+    return {
+        'id': game_id, 'season': SEASON, 'gameType': 2, 'limitedScoring': False, 'gameDate': '2023-11-10',
+        'venue': {'default': 'Arena'}, 'venueLocation': {'default': 'City'}, 'startTimeUTC': '2023-11-11T00:00:00Z',
+        'easternUTCOffset': '-05:00', 'venueUTCOffset': '-05:00',
+        'tvBroadcasts': [{'id': 284, 'market': 'N', 'countryCode': 'CA', 'network': 'SN1', 'sequenceNumber': 22}],
+        'gameState': game_state, 'gameScheduleState': 'OK', 'periodDescriptor': {'number': 3, 'periodType': 'REG'},
+        'awayTeam': {'id': away['id'], 'name': {'default': away['fullName']}, 'abbrev': away['triCode'], 'score': 2,
+                     'sog': 30, 'logo': f"https://assets.nhle.com/logos/nhl/svg/{away['triCode']}_light.svg"},
+        'homeTeam': {'id': home['id'], 'name': {'default': home['fullName']}, 'abbrev': home['triCode'], 'score': 3,
+                     'sog': 28, 'logo': f"https://assets.nhle.com/logos/nhl/svg/{home['triCode']}_light.svg"},
+        'shootoutInUse': True, 'otInUse': True, 'maxPeriods': 5, 'regPeriods': 3,
+        'clock': {'timeRemaining': '00:00', 'secondsRemaining': 0, 'running': False, 'inIntermission': False},
+        'gameOutcome': {'lastPeriodType': 'REG'}, 'gameVideo': {'threeMinRecap': 1, 'condensedGame': 2},
+    }
+
+
+def play_by_play(game_id, n_plays=320):
+    rng = _rng('pbp', game_id)
+    payload = _game_header(game_id)
+    away, home = _teams_for_game(game_id)
+    players = {away['id']: _roster(away), home['id']: _roster(home)}
+    plays = []
+    for i in range(n_plays):
+        period = 1 + i * 3 // n_plays
+        elapsed = (i * 3 * 1200 // n_plays) % 1200
+        type_code, type_key = rng.choice(PLAY_TYPES)
+        team_id = rng.choice((away['id'], home['id']))
+        details = {
+            'xCoord': rng.randint(-99, 99), 'yCoord': rng.randint(-42, 42), 'zoneCode': rng.choice('ODN'),
+            'eventOwnerTeamId': team_id, 'shootingPlayerId': rng.choice(players[team_id]),
+            'goalieInNetId': players[home['id'] if team_id == away['id'] else away['id']][0],
+        }
+        if type_key in ('shot-on-goal', 'goal', 'missed-shot'):
+            details['shotType'] = rng.choice(('wrist', 'snap', 'slap', 'backhand', 'tip-in'))
+        plays.append({
+            'eventId': 100 + i, 'periodDescriptor': {'number': period, 'periodType': 'REG'},
+            'timeInPeriod': _mmss(elapsed), 'timeRemaining': _mmss(1200 - elapsed), 'situationCode': '1551',
+            'homeTeamDefendingSide': 'left', 'typeCode': type_code, 'typeDescKey': type_key, 'sortOrder': 10 * i,
+            'details': details,
+        })
+    payload['plays'] = plays
+    payload['rosterSpots'] = [
+        {'teamId': team_id, 'playerId': player_id, 'firstName': {'default': 'First'}, 'lastName': {'default': 'Last'},
+         'sweaterNumber': player_id % 100, 'positionCode': 'G' if player_id % 1000 == 0 else 'C',
+         'headshot': f"https://assets.nhle.com/mugs/nhl/{SEASON}/{player_id}.png"}
+        for team_id, roster in players.items() for player_id in roster
+    ]
+    payload['displayPeriod'] = 1
+    payload['summary'] = {'teamGameStats': [{'category': 'sog', 'awayValue': 30, 'homeValue': 28}]}
+    return payload
+
+
+def landing(game_id):
+    payload = _game_header(game_id)
+    payload['venueTimezone'] = 'US/Eastern'
+    payload['tiesInUse'] = False
+    payload['summary'] = {
+        'scoring': [{'periodDescriptor': {'number': p, 'periodType': 'REG'}, 'goals': [{'playerId': 1, 'timeInPeriod': '05:00'}]}
+                    for p in (1, 2, 3)],
+        'threeStars': [{'star': s, 'playerId': s} for s in (1, 2, 3)],
+    }
+    return payload
+
+
+def boxscore(game_id):
+    payload = _game_header(game_id)
+    away, home = _teams_for_game(game_id)
+
+    def skaters(team):
+        return [{'playerId': player_id, 'sweaterNumber': player_id % 100, 'name': {'default': 'A. Player'},
+                 'position': 'C', 'goals': player_id % 2, 'assists': player_id % 3, 'points': player_id % 4,
+                 'plusMinus': 0, 'pim': 0, 'hits': 1, 'powerPlayGoals': 0, 'shots': 2, 'faceoffWinningPctg': 0.5,
+                 'toi': '15:30'} for player_id in _roster(team)[1:]]
+    payload['playerByGameStats'] = {
+        'awayTeam': {'forwards': skaters(away)[:12], 'defense': skaters(away)[12:], 'goalies': []},
+        'homeTeam': {'forwards': skaters(home)[:12], 'defense': skaters(home)[12:], 'goalies': []},
+    }
+    payload['summary'] = {'gameInfo': {'referees': [{'default': 'Ref'}]}}
+    return payload
+
+
+def game_meta(game_id):
+    away, home = _teams_for_game(game_id)
+    return {
+        'seasonStates': {'date': '2023-11-10', 'gameType': 2, 'season': SEASON},
+        'teams': [{'name': {'default': team['fullName']}, 'teamId': team['id'], 'tricode': team['triCode']} for team in (away, home)],
+    }
+
+
+def shift_charts(game_id, shifts_per_player=22):
+    rng = _rng('shifts', game_id)
+    away, home = _teams_for_game(game_id)
+    data = []
+    shift_id = game_id * 10000
+    for team in (away, home):
+        for player_id in _roster(team)[1:]:
+            start = rng.randint(0, 60)
+            for number in range(1, shifts_per_player + 1):
+                period = 1 + (number - 1) * 3 // shifts_per_player
+                if start >= 1200:
+                    start = rng.randint(0, 60)
+                duration = rng.randint(30, 60)
+                end = min(1200, start + duration)
+                shift_id += 1
+                data.append({
+                    'id': shift_id, 'detailCode': 0, 'duration': _mmss(end - start), 'endTime': _mmss(end),
+                    'eventDescription': None, 'eventDetails': None, 'eventNumber': number, 'firstName': 'First',
+                    'gameId': game_id, 'hexValue': '#041E42', 'lastName': 'Last', 'period': period,
+                    'playerId': player_id, 'shiftNumber': number, 'startTime': _mmss(start),
+                    'teamAbbrev': team['triCode'], 'teamId': team['id'], 'teamName': team['fullName'], 'typeCode': 517,
+                })
+                start = end + rng.randint(60, 120)
+    return {'data': data, 'total': len(data)}
+
+
+def game_rows(total, start=0, limit=None):
+    """One page of a `total`-game /{lang}/game response (cayenneExp filters are not applied)"""
+    stop = total if limit is None else min(total, start + limit)
+    rows = []
+    for i in range(start, stop):
+        row_season = 19171918 + (i * 106 // max(total, 1)) * 10001
+        rows.append({
+            'id': int(str(row_season)[:4]) * 1000000 + 20000 + i % 1312 + 1, 'easternStartTime': '2024-02-01T20:00:00',
+            'gameDate': '2024-02-01', 'gameNumber': i % 1312 + 1, 'gameScheduleStateId': 1, 'gameStateId': 7,
+            'gameType': 2, 'homeScore': i % 5, 'homeTeamId': i % 32 + 1, 'period': 3, 'season': row_season,
+            'visitingScore': i % 4, 'visitingTeamId': (i + 7) % 32 + 1,
+        })
+    return {'data': rows, 'total': total}
+
+
+def schedule_games(team_code):
+    team = next(team for team in TEAMS if team['triCode'] == team_code)
+    games = []
+    for n in range(82):
+        game_id = 2023020001 + (team['id'] * 41 + n * 16) % 1312
+        away, home = _teams_for_game(game_id)
+        games.append({
+            'id': game_id, 'season': SEASON, 'gameType': 2, 'gameDate': f"2023-{10 + n // 30:02d}-{1 + n % 28:02d}",
+            'gameState': 'OFF', 'gameScheduleState': 'OK',
+            'awayTeam': {'id': away['id'], 'abbrev': away['triCode'], 'score': 2},
+            'homeTeam': {'id': home['id'], 'abbrev': home['triCode'], 'score': 3},
+        })
+    return games
+
+
+def player_landing(player_id):
+    team = TEAMS[player_id // 1000 % 32]
+    return {
+        'playerId': player_id, 'isActive': True, 'currentTeamId': team['id'], 'currentTeamAbbrev': team['triCode'],
+        'firstName': {'default': 'First'}, 'lastName': {'default': 'Last'}, 'position': 'C', 'sweaterNumber': 97,
+        'currentTeamRoster': [{'playerId': p, 'lastName': {'default': 'Last'}, 'firstName': {'default': 'First'}}
+                              for p in _roster(team)],
+        'last5Games': [],
+    }
+
+
+def player_game_log(player_id, season=SEASON, game_type=2):
+    return {
+        'seasonId': season, 'gameTypeId': game_type, 'playerStatsSeasons': [{'season': season, 'gameTypes': [2, 3]}],
+        'gameLog': [{'gameId': 2023020001 + n, 'teamAbbrev': 'EDM', 'homeRoadFlag': 'H', 'gameDate': '2024-01-01',
+                     'goals': n % 2, 'assists': n % 3, 'points': n % 4, 'plusMinus': 0, 'powerPlayGoals': 0,
+                     'powerPlayPoints': 0, 'gameWinningGoals': 0, 'otGoals': 0, 'shots': 3, 'shifts': 21,
+                     'shorthandedGoals': 0, 'shorthandedPoints': 0, 'opponentAbbrev': 'BUF', 'pim': 0, 'toi': '21:30'}
+                    for n in range(82)],
+    }
+
+
+def standings(date='2024-03-21'):
+    return {
+        'wildCardIndicator': True,
+        'standings': [{'date': date, 'teamAbbrev': {'default': team['triCode']}, 'gamesPlayed': 70, 'points': 80 + i,
+                       'goalDifferential': i - 16, 'leagueSequence': 32 - i, 'wins': 40, 'losses': 25, 'otLosses': 5,
+                       'seasonId': SEASON} for i, team in enumerate(TEAMS[:32])],
+    }
+
+
+ROUTES = [
+    (r'^/v1/gamecenter/(\d+)/play-by-play$', lambda m, q: play_by_play(int(m[1]))),
+    (r'^/v1/gamecenter/(\d+)/landing$', lambda m, q: landing(int(m[1]))),
+    (r'^/v1/gamecenter/(\d+)/boxscore$', lambda m, q: boxscore(int(m[1]))),
+    (r'^/v1/meta/game/(\d+)$', lambda m, q: game_meta(int(m[1]))),
+    (r'^/stats/rest/\w+/shiftcharts$', lambda m, q: shift_charts(int(q.get('cayenneExp', 'gameId=0').split('=')[-1]))),
+    (r'^/stats/rest/\w+/team$', lambda m, q: {'data': TEAMS, 'total': len(TEAMS)}),
+    (r'^/stats/rest/\w+/glossary$', lambda m, q: {'data': [{'id': i, 'abbreviation': f"T{i}", 'definition': 'x' * 80} for i in range(300)], 'total': 300}),
+    (r'^/v1/season$', lambda m, q: [19171918 + 10001 * i for i in range(107)]),
+    (r'^/v1/schedule-calendar/([\d-]+)$', lambda m, q: {'startDate': m[1], 'endDate': m[1], 'teams': [
+        {'abbrev': team['triCode'], 'id': team['id'], 'seasonId': SEASON} for team in TEAMS[:32]]}),
+    (r'^/v1/schedule/([\w-]+)$', lambda m, q: {'gameWeek': [{'date': '2024-03-21', 'numberOfGames': 16, 'games': [
+        {'id': 2023021100 + n, 'gameState': 'FUT'} for n in range(16)]}]}),
+    (r'^/v1/standings/([\w-]+)$', lambda m, q: standings(m[1])),
+    (r'^/v1/standings-season$', lambda m, q: {'seasons': [{'id': SEASON, 'standingsStart': '2023-10-10', 'standingsEnd': '2024-04-18'}]}),
+    (r'^/v1/player/(\d+)/landing$', lambda m, q: player_landing(int(m[1]))),
+    (r'^/v1/player/(\d+)/game-log/(\d{8})/(\d)$', lambda m, q: player_game_log(int(m[1]), int(m[2]), int(m[3]))),
+    (r'^/v1/player/(\d+)/game-log/now$', lambda m, q: player_game_log(int(m[1]))),
+    (r'^/v1/(skater|goalie)-stats-leaders/', lambda m, q: {'goals': [{'id': i, 'value': 50 - i} for i in range(5)]}),
+    (r'^/v1/player-spotlight$', lambda m, q: [{'playerId': 8478402 + i} for i in range(10)]),
+    (r'^/v1/roster/(\w+)/(\w+)$', lambda m, q: {'forwards': [{'id': p} for p in range(14)], 'defensemen': [{'id': p} for p in range(14, 22)],
+                                                'goalies': [{'id': p} for p in range(22, 26)]}),
+    (r'^/v1/club-stats(-season)?/(\w+)', lambda m, q: {'season': SEASON, 'skaters': [{'playerId': p} for p in range(25)]}),
+    (r'^/v1/scoreboard/(\w+)/now$', lambda m, q: {'focusedDate': '2024-03-23', 'gamesByDate': [{'date': '2024-03-17', 'games': schedule_games(m[1])[:1]}]}),
+    (r'^/v1/club-schedule-season/(\w+)/', lambda m, q: {'currentSeason': SEASON, 'games': schedule_games(m[1])}),
+    (r'^/v1/club-schedule/(\w+)/', lambda m, q: {'games': schedule_games(m[1])[:7]}),
+]
+ROUTES = [(re.compile(pattern), build) for pattern, build in ROUTES]
+# list_games pages are built by the server, which knows the configured collection size (see game_rows)
+ROUTES_GAMES = re.compile(r'^/stats/rest/\w+/game$')
+
+
+def load_recorded(fixtures_dir, path):
+    """Return a recorded fixture's bytes for a URL path, or None"""
+    if not fixtures_dir:
+        return None
+    file_path = os.path.join(fixtures_dir, path.lstrip('/') + '.json')
+    if os.path.isfile(file_path):
+        with open(file_path, 'rb') as f:
+            return f.read()
+    return None
+
+
+def record(fixtures_dir, game_id=2023020204, player_id=8478402, team_code='STL'):
+    """Save live API responses for one game, player and team as recorded fixtures"""
+    from nhl_api.game import Game
+    from nhl_api.nhl import Nhl
+    from nhl_api.player import Player
+    from nhl_api.team import Team
+
+    client = Nhl()
+    game = Game(game_id, client=client)
+    team = Team.from_tricode(team_code, client=client)
+    player = Player(player_id, client=client)
+    calls = {
+        f"v1/gamecenter/{game_id}/play-by-play": game.get_play_by_play,
+        f"v1/gamecenter/{game_id}/landing": game.get_landing,
+        f"v1/gamecenter/{game_id}/boxscore": game.get_boxscore,
+        f"v1/meta/game/{game_id}": game.get_game_info,
+        "stats/rest/en/shiftcharts": game.get_shift_charts,
+        "stats/rest/en/team": client.list_team_info,
+        "v1/season": client.list_seasons,
+        f"v1/player/{player_id}/landing": player.get_info,
+        f"v1/club-schedule-season/{team_code}/now": team.get_schedule,
+    }
+    for path, call in calls.items():
+        file_path = os.path.join(fixtures_dir, path + '.json')
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w') as f:
+            json.dump(call(), f)
+        print(f"recorded {file_path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.fixtures')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    record_parser = subparsers.add_parser('record', help="Record live API responses as fixtures")
+    record_parser.add_argument('fixtures_dir')
+    record_parser.add_argument('--game-id', type=int, default=2023020204)
+    record_parser.add_argument('--player-id', type=int, default=8478402)
+    record_parser.add_argument('--team', default='STL')
+    args = parser.parse_args(argv)
+    record(args.fixtures_dir, game_id=args.game_id, player_id=args.player_id, team_code=args.team)
+
+
+if __name__ == '__main__':
+    main()
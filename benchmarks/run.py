@@ -0,0 +1,238 @@
+"""Benchmark scenarios run against the local stub server
+
+Each scenario runs in its own child process so peak RSS is per scenario. It runs once to
+warm the server's fixture cache, once timed, then once under tracemalloc to measure peak
+allocated memory (tracing slows Python down, so it is kept out of the timed pass). Results are printed as a table and
+written as JSON, which benchmarks/compare.py diffs between two runs (e.g. two commits).
+
+Usage:
+    python -m benchmarks.run                                  # all scenarios -> benchmarks/results.json
+    python -m benchmarks.run --quick --output before.json     # smaller workloads
+    python -m benchmarks.run pbp_parsing --latency 0.02 --error-rate-429 0.01
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks import fixtures
+from benchmarks.stub_server import CONTEXT, StubServer
+from nhl_api.columnar import plays_table
+from nhl_api.decoders import get_decoder
+from nhl_api.game import Game
+from nhl_api.memo import clear_memoized
+from nhl_api.nhl import Nhl
+from nhl_api.team import Team
+
+SCENARIOS = {}
+
+# Workload sizes: (full, --quick)
+SIZES = {
+    'single_endpoint': (500, 100),
+    'game_details_one': (50, 10),
+    'game_details_slate': (16, 16),
+    'team_construction': (10, 3),
+    'list_games_ingestion': (71032, 10000),
+    'pbp_parsing': (1312, 200),
+}
+
+
+def scenario(func):
+    """Register a scenario: func(client, size) -> list of per-operation latencies in seconds"""
+    SCENARIOS[func.__name__] = func
+    return func
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+@scenario
+def single_endpoint(client, size):
+    """Sequential Nhl.get_url calls to one gamecenter endpoint"""
+    return [_timed(client.get_url, '/v1/gamecenter/2023020204/landing') for _ in range(size)]
+
+
+@scenario
+def game_details_one(client, size):
+    """Game.get_all_details for one game (five endpoints), repeated"""
+    return [_timed(Game(2023020001 + n, client=client).get_all_details) for n in range(size)]
+
+
+@scenario
+def game_details_slate(client, size):
+    """Game.get_all_details_many over a night's slate; one sample per game, measured from the start"""
+    start = time.perf_counter()
+    latencies = []
+    for _game_id, _details in Game.get_all_details_many(range(2023021100, 2023021100 + size), client=client):
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+@scenario
+def team_construction(client, size):
+    """Team(...) for all 32 clubs from a cold memo cache; one sample per league-wide pass"""
+    latencies = []
+    for _ in range(size):
+        clear_memoized()
+        latencies.append(_timed(lambda: [Team(team['id'], client=client) for team in fixtures.TEAMS[:32]]))
+    return latencies
+
+
+@scenario
+def list_games_ingestion(client, size):
+    """Nhl.iter_games over the whole list_games collection; one sample per page"""
+    latencies = []
+    start = time.perf_counter()
+    for n, _row in enumerate(client.iter_games(), 1):
+        if n % 1000 == 0:
+            now = time.perf_counter()
+            latencies.append(now - start)
+            start = now
+    return latencies
+
+
+@scenario
+def pbp_parsing(client, size):
+    """Decode and flatten a season of play-by-play into a columnar table (no network)"""
+    decode = get_decoder()
+    bodies = [json.dumps(fixtures.play_by_play(2023020001 + n)).encode() for n in range(size)]
+    table = None
+    latencies = []
+    for body in bodies:
+        start = time.perf_counter()
+        payload = decode(body)
+        if table is None:
+            table = plays_table(payload)
+        else:
+            table.extend(plays_table(payload))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def _run_scenario(name, size, base_urls, request_counter, results):
+    func = SCENARIOS[name]
+
+    client = Nhl(base_urls=base_urls)
+    clear_memoized()
+    func(client, size)  # warm-up
+    client.transport.close()
+
+    client = Nhl(base_urls=base_urls)
+    clear_memoized()
+    requests_before = request_counter.value
+    start = time.perf_counter()
+    latencies = func(client, size)
+    wall = time.perf_counter() - start
+    requests = request_counter.value - requests_before
+    client.transport.close()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        peak_rss *= 1024  # Linux reports KiB, macOS bytes
+
+    client = Nhl(base_urls=base_urls)
+    clear_memoized()
+    tracemalloc.start()
+    func(client, size)
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    client.transport.close()
+
+    results.put({
+        'size': size,
+        'operations': len(latencies),
+        'requests': requests,
+        'requests_per_s': requests / wall if wall else None,
+        'wall_s': wall,
+        'p50_ms': _percentile(latencies, 50) * 1000 if latencies else None,
+        'p99_ms': _percentile(latencies, 99) * 1000 if latencies else None,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else None,
+        'peak_rss_bytes': peak_rss,
+        'peak_alloc_bytes': peak_alloc,
+    })
+
+
+def run(names, server, quick=False):
+    """Run scenarios in child processes against a started StubServer; returns {name: metrics}"""
+    results = {}
+    for name in names:
+        size = SIZES[name][1 if quick else 0]
+        queue = CONTEXT.Queue()
+        process = CONTEXT.Process(target=_run_scenario, args=(name, size, server.base_urls, server.counter, queue))
+        process.start()
+        results[name] = queue.get()
+        process.join()
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _format(value, spec):
+    return '-' if value is None else format(value, spec)
+
+
+def print_results(results):
+    print(f"{'scenario':<22}{'ops':>7}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'rss MiB':>10}{'alloc MiB':>11}")
+    for name, m in results.items():
+        print(f"{name:<22}{m['operations']:>7}{_format(m['p50_ms'], '10.2f')}{_format(m['p99_ms'], '10.2f')}"
+              f"{_format(m['requests_per_s'], '10.1f')}{m['peak_rss_bytes'] / 2**20:>10.1f}{m['peak_alloc_bytes'] / 2**20:>11.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run')
+    parser.add_argument('scenarios', nargs='*', help=f"Scenarios to run (default: all): {', '.join(SCENARIOS)}")
+    parser.add_argument('--quick', action='store_true', help="Smaller workloads")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds of server latency per request")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random server latency, uniform in [0, jitter]")
+    parser.add_argument('--error-rate-429', type=float, default=0.0)
+    parser.add_argument('--error-rate-500', type=float, default=0.0)
+    parser.add_argument('--fixtures', help="Directory of recorded fixtures (see benchmarks/fixtures.py)")
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'results.json'))
+    args = parser.parse_args(argv)
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    names = args.scenarios or list(SCENARIOS)
+    config = {
+        'latency': args.latency, 'jitter': args.jitter, 'error_rate_429': args.error_rate_429,
+        'error_rate_500': args.error_rate_500, 'fixtures_dir': args.fixtures,
+        'total_games': SIZES['list_games_ingestion'][1 if args.quick else 0],
+    }
+    with StubServer(**config) as server:
+        results = run(names, server, quick=args.quick)
+
+    print_results(results)
+    report = {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': dict(config, quick=args.quick),
+        'scenarios': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
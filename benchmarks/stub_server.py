@@ -0,0 +1,168 @@
+"""Local stand-in for api-web.nhle.com and api.nhle.com/stats/rest
+
+Runs in a child process (so it does not compete with the client for the GIL) and serves
+the fixtures from benchmarks.fixtures over HTTP/1.1 keep-alive, gzip-encoded when the
+client asks for it. Latency and error injection are configurable.
+
+Example:
+    with StubServer(latency=0.02, error_rate_429=0.01) as server:
+        client = Nhl(base_urls=server.base_urls)
+        client.list_seasons()
+        print(server.request_count)
+"""
+import gzip
+import json
+import multiprocessing
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from benchmarks import fixtures
+
+# spawn everywhere, so the request counter can be shared with spawned benchmark processes
+CONTEXT = multiprocessing.get_context('spawn')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body are separate writes; avoid delayed-ACK stalls
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        config = self.server.config
+        with self.server.counter.get_lock():
+            self.server.counter.value += 1
+        if config['latency'] or config['jitter']:
+            time.sleep(config['latency'] + random.uniform(0, config['jitter']))
+
+        roll = random.random()
+        if roll < config['error_rate_429']:
+            return self._send(429, b'{"message": "Too Many Requests"}', {'Retry-After': str(config['retry_after'])})
+        if roll < config['error_rate_429'] + config['error_rate_500']:
+            return self._send(500, b'{"message": "Internal Server Error"}')
+
+        body = self.server.body(self.path)
+        if body is None:
+            return self._send(404, b'{"message": "Not Found"}')
+        headers = {}
+        if len(body) > 1024 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = self.server.compressed(self.path, body)
+            headers['Content-Encoding'] = 'gzip'
+        self._send(200, body, headers)
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, config, counter):
+        super().__init__(('127.0.0.1', config['port']), _Handler)
+        self.config = config
+        self.counter = counter
+        self._bodies = {}
+        self._compressed = {}
+
+    def body(self, path):
+        if path in self._bodies:
+            return self._bodies[path]
+        url = urlsplit(path)
+        query = dict(parse_qsl(url.query))
+        body = fixtures.load_recorded(self.config['fixtures_dir'], url.path)
+        if body is None:
+            payload = self._build(url.path, query)
+            body = None if payload is None else json.dumps(payload, separators=(',', ':')).encode()
+        if body is not None and len(self._bodies) < 20000:
+            self._bodies[path] = body
+        return body
+
+    def _build(self, path, query):
+        if fixtures.ROUTES_GAMES.match(path):
+            return fixtures.game_rows(self.config['total_games'], int(query.get('start', 0)),
+                                      int(query['limit']) if 'limit' in query else None)
+        for pattern, build in fixtures.ROUTES:
+            match = pattern.match(path)
+            if match:
+                return build(match, query)
+        return None
+
+    def compressed(self, path, body):
+        data = self._compressed.get(path)
+        if data is None:
+            data = gzip.compress(body, compresslevel=5)
+            if len(self._compressed) < 20000:
+                self._compressed[path] = data
+        return data
+
+
+def _serve(config, counter, ready):
+    server = _Server(config, counter)
+    ready.send(server.server_address[1])
+    server.serve_forever()
+
+
+class StubServer:
+    """Child-process HTTP server serving benchmark fixtures
+
+    Args:
+        latency (float, optional): Seconds added to every response. Defaults to 0.
+        jitter (float, optional): Extra random latency, uniform in [0, jitter]. Defaults to 0.
+        error_rate_429 (float, optional): Fraction of requests answered 429 with Retry-After. Defaults to 0.
+        error_rate_500 (float, optional): Fraction of requests answered 500. Defaults to 0.
+        retry_after (float, optional): Retry-After value sent with 429s, in seconds. Defaults to 0.
+        total_games (int, optional): Size of the /{lang}/game (list_games) collection. Defaults to 71032.
+        fixtures_dir (str, optional): Directory of recorded fixtures, preferred over synthetic ones
+        port (int, optional): Port to listen on; 0 picks a free one. Defaults to 0.
+    """
+    def __init__(self, latency=0.0, jitter=0.0, error_rate_429=0.0, error_rate_500=0.0, retry_after=0,
+                 total_games=71032, fixtures_dir=None, port=0):
+        self.config = {
+            'latency': latency, 'jitter': jitter, 'error_rate_429': error_rate_429, 'error_rate_500': error_rate_500,
+            'retry_after': retry_after, 'total_games': total_games, 'fixtures_dir': fixtures_dir, 'port': port,
+        }
+        self.counter = CONTEXT.Value('q', 0)  # requests received, shareable with child processes
+        self._process = None
+        self.port = None
+
+    def start(self):
+        receiver, sender = CONTEXT.Pipe(duplex=False)
+        self._process = CONTEXT.Process(target=_serve, args=(self.config, self.counter, sender), daemon=True)
+        self._process.start()
+        self.port = receiver.recv()
+        return self
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def base_urls(self):
+        """base_urls mapping for Nhl(base_urls=...) / AsyncNhl(base_urls=...)"""
+        return {'default': self.url, 'stats': self.url + '/stats/rest'}
+
+    @property
+    def request_count(self):
+        return self.counter.value
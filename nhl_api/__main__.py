@@ -0,0 +1,33 @@
+"""Command line entry point: python -m nhl_api <command> [args]
+
+Commands:
+    export      Export seasons to partitioned Parquet / CSV (nhl_api.export)
+    backfill    Backfill gamecenter responses to a directory (nhl_api.backfill)
+    archive     Archive gamecenter responses per season (nhl_api.archive)
+    store       Incrementally sync a local SQLite game store (nhl_api.store)
+    gamelogs    Load a season of player game logs (nhl_api.gamelogs)
+
+Run `python -m nhl_api <command> -h` for the options of a command.
+"""
+import argparse
+import importlib
+
+COMMANDS = {
+    'export': 'nhl_api.export',
+    'backfill': 'nhl_api.backfill',
+    'archive': 'nhl_api.archive',
+    'store': 'nhl_api.store',
+    'gamelogs': 'nhl_api.gamelogs',
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m nhl_api', description="NHL API data tools")
+    parser.add_argument('command', choices=list(COMMANDS))
+    parser.add_argument('args', nargs=argparse.REMAINDER, help="Arguments of the command")
+    args = parser.parse_args(argv)
+    return importlib.import_module(COMMANDS[args.command]).main(args.args)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
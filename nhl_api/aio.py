@@ -0,0 +1,316 @@
+"""asyncio variants of Nhl, Game, Player and Team (requires aiohttp)
+
+The async classes subclass their blocking counterparts: every endpoint method that just
+builds an endpoint and calls `nhl_client.get_url` returns an awaitable instead of a result,
+so the endpoint catalogue lives in one place.
+
+Example:
+    async with AsyncNhl() as client:
+        games = [AsyncGame(game_id, client=client) for game_id in game_ids]
+        boxscores = await asyncio.gather(*(game.get_boxscore() for game in games))
+"""
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from nhl_api.decoders import get_decoder
+from nhl_api.errors import NhlConnectionError, NhlDecodeError, http_error
+from nhl_api.game import DETAIL_METHODS, DETAIL_SOURCES, Game, detail_sources
+from nhl_api.instrumentation import RequestRecord
+from nhl_api.memo import memoize
+from nhl_api.nhl import Nhl, games_page_params, index_teams
+from nhl_api.player import Player
+from nhl_api.scheduler import THROTTLE_STATUSES, RetryPolicy, parse_retry_after
+from nhl_api.singleflight import SingleFlight
+from nhl_api.team import Team
+from nhl_api.transport import BASE_URLS, DEFAULT_HEADERS, resolve_base_url
+
+
+class AsyncNhl(Nhl):
+    """asyncio client for the NHL web and stats APIs
+
+    All requests share one aiohttp connection pool. A semaphore per host caps the number of
+    in-flight requests, so thousands of calls can be gathered at once without opening
+    thousands of sockets. The session is created lazily inside the running event loop.
+
+    Args:
+        base_urls (dict, optional): Overrides for the 'default' / 'stats' base URLs
+        pool_size (int, optional): Total connection pool size. Defaults to 100.
+        per_host_limit (int, optional): Maximum concurrent requests per host. Defaults to 20.
+        timeout (float, optional): Total timeout per request in seconds. Defaults to 30.
+        headers (dict, optional): Extra headers sent with every request
+        retry (RetryPolicy, optional): Retry rules for connection errors, 429 and 5xx. Defaults to RetryPolicy().
+        decoder (str or callable, optional): JSON decoder, as for Nhl. Defaults to 'auto'.
+        instrumentation (Instrumentation, optional): As for Nhl; connect time is not measured
+            (ttfb includes it)
+        coalesce (bool or SingleFlight, optional): Let identical concurrent get_url calls share
+            one request. Defaults to True (a SingleFlight per client).
+
+    Conditional requests and the response cache of Nhl are sync-only: every request is sent
+    in full and `last_changed` is always True.
+    """
+    # Shadows the Nhl.base_urls property (which reads the Transport); set per instance below
+    base_urls = None
+
+    def __init__(self, base_urls=None, pool_size=100, per_host_limit=20, timeout=30, headers=None, retry=None,
+                 decoder='auto', instrumentation=None, coalesce=True):
+        if aiohttp is None:
+            raise ImportError("AsyncNhl requires aiohttp: pip install aiohttp")
+        self.base_urls = dict(BASE_URLS, **(base_urls or {}))
+        self.pool_size = pool_size
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.decode = get_decoder(decoder)
+        self.instrumentation = instrumentation
+        self.inflight = SingleFlight() if coalesce is True else (coalesce or None)
+        self.cache = None
+        self.conditional = None
+        self._local = threading.local()
+        self._session = None
+        self._loop = None
+        self._semaphores = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # A session is bound to the loop it was created in, so start over under a new loop
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.per_host_limit)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._loop = loop
+            self._semaphores = {}
+        return self._session
+
+    def _semaphore(self, base_url):
+        host = urlsplit(base_url).netloc
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphore
+
+    async def get_url(self, endpoint, response_type='json', base_url_type='default', params=None):
+        if response_type not in ('text', 'json'):
+            raise ValueError(f"response_type must be one of 'text', 'json'. You provided: {response_type}")
+
+        record = RequestRecord(endpoint, base_url_type, params)
+        if self.instrumentation is None:
+            return await self._coalesced_get(record, response_type)
+        self.instrumentation.start(record)
+        try:
+            return await self._coalesced_get(record, response_type)
+        except Exception as e:
+            record.error = type(e).__name__
+            record.status = getattr(e, 'status_code', record.status)
+            raise
+        finally:
+            self.instrumentation.finish(record)
+
+    async def _coalesced_get(self, record, response_type):
+        if self.inflight is None:
+            return await self._get(record, response_type)
+        key = (resolve_base_url(self.base_urls, record.base_url_type), record.endpoint,
+               tuple(sorted((record.params or {}).items())), response_type, self.decode)
+        result, record.coalesced = await self.inflight.do_async(key, lambda: self._get(record, response_type))
+        return result
+
+    async def _get(self, record, response_type):
+        base_url = resolve_base_url(self.base_urls, record.base_url_type)
+        url = base_url + record.endpoint
+
+        session = self._get_session()
+        attempt = 0
+        while True:
+            retry_after = None
+            record.attempts += 1
+            try:
+                async with self._semaphore(base_url):
+                    start = time.perf_counter()
+                    async with session.get(url, params=record.params or None) as r:
+                        headers_received = time.perf_counter()
+                        content = await r.read()
+                        record.url = str(r.url)
+                        record.status = r.status
+                        record.bytes = len(content)
+                        record.ttfb = headers_received - start
+                        record.download = time.perf_counter() - headers_received
+                        if r.status < 400:
+                            if response_type == 'text':
+                                return content.decode(r.get_encoding())
+                            start = time.perf_counter()
+                            try:
+                                return self.decode(content)
+                            except ValueError as e:
+                                raise NhlDecodeError(f"Invalid JSON from {r.url}: {e}") from e
+                            finally:
+                                record.decode = time.perf_counter() - start
+                        if r.status in THROTTLE_STATUSES:
+                            retry_after = parse_retry_after(r.headers.get('Retry-After'))
+                        error = http_error(r.status, str(r.url), content.decode('utf-8', 'replace'), retry_after=retry_after)
+                        if r.status not in self.retry.retry_statuses:
+                            raise error
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = NhlConnectionError(f"GET {url} failed: {e!r}")
+                error.__cause__ = e
+            if attempt >= self.retry.max_retries:
+                raise error
+            await asyncio.sleep(self.retry.delay(attempt, retry_after))
+            attempt += 1
+
+    async def iter_games(self, lang='en', season=None, game_type=None, start_date=None, end_date=None, page_size=1000,
+                         prefetch=True):
+        """Stream games from the stats API one page at a time, as Nhl.iter_games
+
+        With prefetch, the next page is requested as a task while the caller consumes the current one.
+
+        Yields:
+            dict: One game (same shape as the elements of list_games()['data']), ordered by game id
+        """
+        endpoint = f"/{lang}/game"
+        def fetch_page(start):
+            params = games_page_params(start, page_size, season, game_type, start_date, end_date)
+            return self.get_url(endpoint=endpoint, base_url_type='stats', params=params)
+
+        start = 0
+        page = asyncio.ensure_future(fetch_page(start)) if prefetch else None
+        try:
+            while True:
+                response = await (page if prefetch else fetch_page(start))
+                games = response['data']
+                start += len(games)
+                more = len(games) == page_size and start < response.get('total', float('inf'))
+                if more and prefetch:
+                    page = asyncio.ensure_future(fetch_page(start))
+                del response
+                for game in games:
+                    yield game
+                if not more:
+                    break
+        finally:
+            if page is not None:
+                page.cancel()
+
+    @memoize(ttl=24 * 3600)
+    async def get_team_index(self, lang='en'):
+        return index_teams(await self.list_team_info(lang))
+
+    async def close(self):
+        """Close the underlying aiohttp session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_default_client = None
+
+def get_default_async_client():
+    """Return the process-wide AsyncNhl used by async entities built without a client"""
+    global _default_client
+    if _default_client is None:
+        _default_client = AsyncNhl()
+    return _default_client
+
+
+class AsyncGame(Game):
+    """asyncio variant of Game - every endpoint method returns an awaitable"""
+    def __init__(self, game_id, client=None):
+        super().__init__(game_id, client=client if client is not None else get_default_async_client())
+
+    async def get_all_details(self):
+        """Get superset of play-by-play, landing, and boxscore details (requests run concurrently)"""
+        results = await asyncio.gather(*(getattr(self, method)() for method in DETAIL_METHODS))
+        return self._merge_details(results)
+
+    async def get_details(self, sections, lean=True):
+        """Get only the sections needed, as Game.get_details (requests run concurrently)"""
+        plan = detail_sources(sections)
+        results = await asyncio.gather(*(getattr(self, DETAIL_SOURCES[endpoint])() for endpoint in plan))
+        return self._project(plan, results, lean)
+
+    @classmethod
+    async def get_all_details_many(cls, game_ids, max_concurrency=10, client=None, sections=None, lean=True):
+        """Get all details for many games, at most `max_concurrency` games in flight
+
+        With sections, each game is projected like get_details instead (see Game.get_all_details_many).
+
+        Yields:
+            tuple: (game_id, all_details dictionary) - or (game_id, get_details dictionary) with sections - in completion order
+        """
+        client = client if client is not None else get_default_async_client()
+        if sections is not None:
+            sections = list(sections)
+            detail_sources(sections)  # reject unknown sections before any request
+
+        async def fetch(game_id):
+            game = cls(game_id, client=client)
+            return game_id, await (game.get_all_details() if sections is None else game.get_details(sections, lean))
+
+        game_ids = iter(game_ids)
+        pending = set()
+        for game_id in game_ids:
+            pending.add(asyncio.ensure_future(fetch(game_id)))
+            if len(pending) >= max_concurrency:
+                break
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+                    game_id = next(game_ids, None)
+                    if game_id is not None:
+                        pending.add(asyncio.ensure_future(fetch(game_id)))
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def follow(self, **kwargs):
+        """Not supported: LiveGame polls with blocking requests, so follow games with Game.follow()"""
+        raise NotImplementedError("AsyncGame cannot follow a game - LiveGame polls with blocking requests. "
+                                  "Use Game(game_id).follow() (e.g. on a thread with asyncio.to_thread).")
+
+
+class AsyncPlayer(Player):
+    """asyncio variant of Player - every endpoint method returns an awaitable"""
+    def __init__(self, player_id, client=None):
+        super().__init__(player_id, client=client if client is not None else get_default_async_client())
+
+
+class AsyncTeam(Team):
+    """asyncio variant of Team - every endpoint method returns an awaitable
+
+    Team looks up its triCode when constructed, which needs a request, so build
+    instances with `await AsyncTeam.create(team_id)`.
+    """
+    def __init__(self, team_id, client=None):
+        self.nhl_client = client if client is not None else get_default_async_client()
+        self.team_id = team_id
+        self.team_info = None
+        self.team_code = None
+
+    @classmethod
+    async def create(cls, team_id, client=None):
+        team = cls(team_id, client=client)
+        team.team_info = await team.get_team_info()
+        team.team_code = team.team_info['triCode']
+        return team
+
+    async def get_team_info(self, lang='en'):
+        team = (await self.nhl_client.get_team_index(lang))['id'].get(self.team_id)
+        assert team is not None, f"No team from Nhl.list_team_info with id: {self.team_id}"
+        return team
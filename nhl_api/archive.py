@@ -0,0 +1,390 @@
+"""Compressed, indexed archive of raw gamecenter responses
+
+One archive file per season (`<root>/<season>.nhla`) holds every archived response as an
+independently compressed frame - zstd when the zstandard package is installed, gzip
+otherwise - so a season is two files instead of one small file per (game, endpoint). Next
+to it, `<season>.nhli` records (game id, endpoint, offset, length) of every frame in 21
+bytes. The archive is read through a memory map: loading one game bisects the index and
+decompresses only that game's frames, and iter_season streams frames in file order.
+
+Frames are written before their index entry, so an interrupted write leaves at worst an
+unindexed frame at the end of the file, plus a partial index entry that is cut off when the
+season is next opened. Archiving a response again appends a new frame,
+and the index keeps the latest.
+
+Example:
+    with Archive('data/archive') as archive:
+        stored, errors = archive.fetch(season_game_ids(20232024), max_workers=8)
+        pbp = archive.get(2023020204, 'play-by-play')
+        for game_id, endpoint, payload in archive.iter_season(20232024, endpoints=['boxscore']):
+            ...
+
+Command line:
+    python -m nhl_api.archive data/archive 20232024 20222023 --workers 8
+    python -m nhl_api.archive data/archive --from-backfill data/raw
+"""
+import argparse
+import bisect
+import gzip
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+
+from nhl_api.backfill import game_season, season_game_ids
+from nhl_api.decoders import get_decoder
+from nhl_api.game import DETAIL_SOURCES, Game
+from nhl_api.nhl import Nhl
+from nhl_api.pool import map_bounded
+
+# Endpoint -> code stored in the index; part of the file format, never renumber
+ENDPOINT_CODES = {'play-by-play': 0, 'landing': 1, 'boxscore': 2, 'meta': 3, 'shiftcharts': 4}
+_ENDPOINT_NAMES = {code: endpoint for endpoint, code in ENDPOINT_CODES.items()}
+
+# Index keys are game_id * _KEY_SPAN + endpoint code, so one game's entries are contiguous
+_KEY_SPAN = 16
+
+_DATA_HEADER = struct.Struct('<4sBB2x')     # magic, version, codec id
+_INDEX_HEADER = struct.Struct('<4sB3x')     # magic, version
+_INDEX_ENTRY = struct.Struct('<qBQI')       # game id, endpoint code, offset, length
+_DATA_MAGIC, _INDEX_MAGIC, _VERSION = b'NHLA', b'NHLI', 1
+
+
+def _zstd_codec(level):
+    import zstandard
+    local = threading.local()  # zstandard (de)compressors must not be shared between threads
+
+    def compress(data):
+        if not hasattr(local, 'compressor'):
+            local.compressor = zstandard.ZstdCompressor(level=10 if level is None else level)
+        return local.compressor.compress(data)
+
+    def decompress(frame):
+        if not hasattr(local, 'decompressor'):
+            local.decompressor = zstandard.ZstdDecompressor()
+        return local.decompressor.decompress(frame)
+    return compress, decompress
+
+
+def _gzip_codec(level):
+    level = 6 if level is None else level
+    return (lambda data: gzip.compress(data, compresslevel=level, mtime=0)), gzip.decompress
+
+
+# name -> (id stored in the archive header, factory(level) -> (compress, decompress))
+CODECS = {
+    'zstd': (1, _zstd_codec),
+    'gzip': (2, _gzip_codec),
+}
+
+
+def get_codec(name='auto'):
+    """Return the codec name to use: 'auto' picks zstd if zstandard is installed, else gzip
+
+    Raises:
+        ImportError if 'zstd' is requested and zstandard is not installed
+    """
+    if name == 'auto':
+        try:
+            import zstandard  # noqa: F401
+            return 'zstd'
+        except ImportError:
+            return 'gzip'
+    if name not in CODECS:
+        raise ValueError(f"codec must be one of 'auto', {', '.join(repr(k) for k in CODECS)}. You provided: {name}")
+    if name == 'zstd':
+        import zstandard  # noqa: F401
+    return name
+
+
+class _SeasonArchive:
+    """The archive and index files of one season, with the index held as sorted arrays"""
+    def __init__(self, path, index_path, codec, level):
+        self.path = path
+        self._data = open(path, 'a+b')
+        self.size = os.fstat(self._data.fileno()).st_size
+        if self.size == 0:
+            self._data.write(_DATA_HEADER.pack(_DATA_MAGIC, _VERSION, CODECS[codec][0]))
+            self._data.flush()
+            self.size = _DATA_HEADER.size
+        else:
+            self._data.seek(0)
+            magic, version, codec_id = _DATA_HEADER.unpack(self._data.read(_DATA_HEADER.size))
+            if magic != _DATA_MAGIC or version != _VERSION:
+                raise ValueError(f"{path} is not an nhl_api archive (version {_VERSION})")
+            codec = next(name for name, (id_, _factory) in CODECS.items() if id_ == codec_id)
+        self.codec = codec
+        self.compress, self.decompress = CODECS[codec][1](level)
+        self._map = None
+
+        self.keys, self.offsets, self.lengths = array('q'), array('Q'), array('L')
+        self._index = open(index_path, 'a+b')
+        self._index.seek(0)
+        raw = self._index.read()
+        if not raw:
+            self._index.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _VERSION))
+            self._index.flush()
+        else:
+            if _INDEX_HEADER.unpack_from(raw)[0] != _INDEX_MAGIC:
+                raise ValueError(f"{index_path} is not an nhl_api archive index")
+            body = raw[_INDEX_HEADER.size:]
+            partial = len(body) % _INDEX_ENTRY.size
+            if partial:
+                # an interrupted write: cut it off, or the next entry appended would be misaligned
+                body = body[:-partial]
+                self._index.truncate(len(raw) - partial)
+            latest = {}
+            for game_id, code, offset, length in _INDEX_ENTRY.iter_unpack(body):
+                latest[game_id * _KEY_SPAN + code] = (offset, length)
+            for key in sorted(latest):
+                self.keys.append(key)
+                self.offsets.append(latest[key][0])
+                self.lengths.append(latest[key][1])
+
+    def append(self, game_id, code, frame):
+        offset = self.size
+        self._data.write(frame)
+        self._data.flush()
+        self.size += len(frame)
+        self._index.write(_INDEX_ENTRY.pack(game_id, code, offset, len(frame)))
+        self._index.flush()
+        key = game_id * _KEY_SPAN + code
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            self.offsets[i], self.lengths[i] = offset, len(frame)
+        else:
+            self.keys.insert(i, key)
+            self.offsets.insert(i, offset)
+            self.lengths.insert(i, len(frame))
+
+    def find(self, game_id, code):
+        key = game_id * _KEY_SPAN + code
+        i = bisect.bisect_left(self.keys, key)
+        return i if i < len(self.keys) and self.keys[i] == key else None
+
+    def game_rows(self, game_id):
+        return range(bisect.bisect_left(self.keys, game_id * _KEY_SPAN),
+                     bisect.bisect_left(self.keys, (game_id + 1) * _KEY_SPAN))
+
+    def frame(self, row):
+        """Compressed frame of an index row, read from the memory map"""
+        offset, length = self.offsets[row], self.lengths[row]
+        if self._map is None or len(self._map) < offset + length:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[offset:offset + length]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._data.close()
+        self._index.close()
+
+
+class Archive:
+    """Per-season compressed archives of gamecenter responses with a (game id, endpoint) index
+
+    Args:
+        root (str): Directory holding `<season>.nhla` / `<season>.nhli` pairs
+        codec (str, optional): 'auto', 'zstd' or 'gzip' for new seasons; existing archives keep
+            the codec they were written with. Defaults to 'auto'.
+        level (int, optional): Compression level. Defaults to 10 for zstd, 6 for gzip.
+        decoder (str or callable, optional): JSON decoder, see decoders.get_decoder. Defaults to 'auto'.
+    """
+    def __init__(self, root, codec='auto', level=None, decoder='auto'):
+        self.root = root
+        self.codec = get_codec(codec)
+        self.level = level
+        self.decode = get_decoder(decoder)
+        self._seasons = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            for season in self._seasons.values():
+                season.close()
+            self._seasons.clear()
+
+    def path(self, season):
+        return os.path.join(self.root, f"{season}.nhla")
+
+    def seasons(self):
+        """Seasons with an archive under root, sorted"""
+        return sorted(int(name[:-5]) for name in os.listdir(self.root) if name.endswith('.nhla') and name[:-5].isdigit())
+
+    def _season(self, season, create=False):
+        # callers hold self._lock
+        archive = self._seasons.get(season)
+        if archive is None:
+            path = self.path(season)
+            if not create and not os.path.exists(path):
+                return None
+            archive = self._seasons[season] = _SeasonArchive(path, path[:-1] + 'i', self.codec, self.level)
+        return archive
+
+    @staticmethod
+    def _code(endpoint):
+        if endpoint not in ENDPOINT_CODES:
+            raise ValueError(f"Unknown endpoint: {endpoint}. Choose from {list(ENDPOINT_CODES)}")
+        return ENDPOINT_CODES[endpoint]
+
+    def add(self, game_id, endpoint, payload):
+        """Archive a decoded response; returns the compressed size"""
+        return self.add_raw(game_id, endpoint, json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+
+    def add_raw(self, game_id, endpoint, data):
+        """Archive a response given as JSON bytes; returns the compressed size"""
+        code = self._code(endpoint)
+        season = game_season(game_id)
+        with self._lock:
+            compress = self._season(season, create=True).compress
+        frame = compress(data)  # outside the lock, so concurrent writers compress in parallel
+        with self._lock:
+            self._season(season, create=True).append(game_id, code, frame)
+        return len(frame)
+
+    def __contains__(self, key):
+        game_id, endpoint = key
+        with self._lock:
+            archive = self._season(game_season(game_id))
+            return archive is not None and archive.find(game_id, self._code(endpoint)) is not None
+
+    def get_raw(self, game_id, endpoint):
+        """JSON bytes of an archived response, or None"""
+        with self._lock:
+            archive = self._season(game_season(game_id))
+            row = None if archive is None else archive.find(game_id, self._code(endpoint))
+            if row is None:
+                return None
+            frame = archive.frame(row)
+        return archive.decompress(frame)
+
+    def get(self, game_id, endpoint):
+        """Decoded archived response, or None"""
+        data = self.get_raw(game_id, endpoint)
+        return None if data is None else self.decode(data)
+
+    def get_game(self, game_id):
+        """Every archived response of a game: {endpoint: payload}"""
+        with self._lock:
+            archive = self._season(game_season(game_id))
+            if archive is None:
+                return {}
+            frames = [(_ENDPOINT_NAMES[archive.keys[row] % _KEY_SPAN], archive.frame(row)) for row in archive.game_rows(game_id)]
+        return {endpoint: self.decode(archive.decompress(frame)) for endpoint, frame in frames}
+
+    def games(self, season):
+        """Game ids with at least one archived response in a season, sorted"""
+        with self._lock:
+            archive = self._season(season)
+            return [] if archive is None else sorted({key // _KEY_SPAN for key in archive.keys})
+
+    def iter_season(self, season, endpoints=None, raw=False):
+        """Stream a season's archived responses in file order - one sequential pass over the archive
+
+        Args:
+            season (int): Season ID in YYYYYYYY format
+            endpoints (iterable of str, optional): Only these endpoints. Defaults to all.
+            raw (bool, optional): Yield JSON bytes instead of decoded payloads. Defaults to False.
+
+        Yields:
+            (game_id, endpoint, payload)
+        """
+        codes = None if endpoints is None else {self._code(endpoint) for endpoint in endpoints}
+        with self._lock:
+            archive = self._season(season)
+            if archive is None:
+                return
+            rows = [row for row in range(len(archive.keys)) if codes is None or archive.keys[row] % _KEY_SPAN in codes]
+            rows.sort(key=archive.offsets.__getitem__)
+            keys = [archive.keys[row] for row in rows]
+        for key, row in zip(keys, rows):
+            with self._lock:
+                frame = archive.frame(row)
+            data = archive.decompress(frame)
+            yield key // _KEY_SPAN, _ENDPOINT_NAMES[key % _KEY_SPAN], data if raw else self.decode(data)
+
+    def fetch(self, game_ids, client=None, endpoints=None, max_workers=8, overwrite=False):
+        """Fetch and archive gamecenter responses of many games concurrently
+
+        Args:
+            game_ids (iterable of int): Games to archive
+            client (Nhl, optional): Client to fetch with. Defaults to Nhl().
+            endpoints (iterable of str, optional): Keys of game.DETAIL_SOURCES. Defaults to all.
+            max_workers (int, optional): Concurrent requests. Defaults to 8.
+            overwrite (bool, optional): Re-fetch responses already archived. Defaults to False.
+
+        Returns:
+            (responses stored, [(game_id, endpoint, exception)])
+        """
+        client = client if client is not None else Nhl()
+        endpoints = list(endpoints) if endpoints is not None else list(DETAIL_SOURCES)
+        for endpoint in endpoints:
+            self._code(endpoint)
+        tasks = [(game_id, endpoint) for game_id in game_ids for endpoint in endpoints
+                 if overwrite or (game_id, endpoint) not in self]
+
+        def fetch_one(task):
+            game_id, endpoint = task
+            return self.add(game_id, endpoint, getattr(Game(game_id, client=client), DETAIL_SOURCES[endpoint])())
+
+        errors = []
+        stored = 0
+        for _ in map_bounded(fetch_one, tasks, max_workers, on_error=lambda task, e: errors.append((*task, e))):
+            stored += 1
+        return stored, errors
+
+    def import_backfill(self, root):
+        """Archive the `<root>/<season>/<game_id>/<endpoint>.json.gz` files written by Backfill;
+        returns the number of responses imported"""
+        count = 0
+        for season in sorted(os.listdir(root)):
+            season_dir = os.path.join(root, season)
+            if not (season.isdigit() and os.path.isdir(season_dir)):
+                continue
+            for game_id in sorted(os.listdir(season_dir)):
+                for name in sorted(os.listdir(os.path.join(season_dir, game_id))):
+                    endpoint = name[:-len('.json.gz')]
+                    if name.endswith('.json.gz') and endpoint in ENDPOINT_CODES:
+                        with gzip.open(os.path.join(season_dir, game_id, name), 'rb') as f:
+                            self.add_raw(int(game_id), endpoint, f.read())
+                        count += 1
+        return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m nhl_api.archive', description="Archive gamecenter responses per season")
+    parser.add_argument('root', help="Archive directory")
+    parser.add_argument('seasons', nargs='*', type=int, help="Season IDs in YYYYYYYY format")
+    parser.add_argument('--game-types', nargs='+', type=int, default=[2, 3])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--endpoints', nargs='+', choices=list(DETAIL_SOURCES), help="Endpoints to archive (default: all)")
+    parser.add_argument('--codec', choices=['auto'] + list(CODECS), default='auto')
+    parser.add_argument('--from-backfill', metavar='DIR', help="Import a Backfill output directory instead of fetching")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    with Archive(args.root, codec=args.codec) as archive:
+        if args.from_backfill:
+            print(f"{archive.import_backfill(args.from_backfill)} responses imported in {time.monotonic() - started:.1f}s")
+        client = Nhl()
+        for season in args.seasons:
+            game_ids = season_game_ids(season, game_types=tuple(args.game_types), client=client)
+            stored, errors = archive.fetch(game_ids, client=client, endpoints=args.endpoints, max_workers=args.workers)
+            print(f"{season}: {len(game_ids)} games, {stored} responses archived, {len(errors)} failed "
+                  f"({os.path.getsize(archive.path(season)) / 2 ** 20:.1f} MiB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""Bulk season backfill with per-(game, endpoint) checkpointing
+
+Fetches every gamecenter endpoint for a set of games with bounded concurrency and writes
+each response to `<root>/<season>/<game_id>/<endpoint>.json.gz`. Every completed
+(game, endpoint) pair is appended to `<root>/checkpoint.jsonl` with the game's gameState, so
+a re-run after a crash or rate-limit skips work that is already done. Only games that were
+final (OFF/FINAL) when fetched count as done: games not yet played or still live are
+fetched again on every run until they are over.
+
+Example:
+    backfill = Backfill('data/raw', max_workers=8)
+    stats = backfill.run(season_game_ids(20232024))
+
+Command line:
+    python -m nhl_api.backfill 20232024 20222023 --root data/raw --workers 8
+"""
+import argparse
+import gzip
+import json
+import os
+import threading
+import time
+
+from nhl_api.cache import FINAL_GAME_STATES
+from nhl_api.game import DETAIL_SOURCES, Game
+from nhl_api.nhl import Nhl
+from nhl_api.pool import map_bounded
+from nhl_api.schedule import ScheduleIndex
+
+def game_season(game_id):
+    """Season ID (YYYYYYYY) of a game ID - the first four digits are the season's start year"""
+    start_year = int(str(game_id)[:4])
+    return start_year * 10000 + start_year + 1
+
+
+def season_game_ids(season, game_types=(2, 3), client=None, source='games'):
+    """Enumerate the game IDs of a season
+
+    Args:
+        season (int): Season ID in YYYYYYYY format
+        game_types (tuple, optional): Game types to keep. Defaults to (2, 3) - regular season and playoffs.
+        client (Nhl, optional): Client to use. Defaults to Nhl().
+        source (str, optional): 'games' to use Nhl.iter_games (completed games), or 'schedule' to merge
+            every club's season schedule (includes games not yet played). Defaults to 'games'.
+
+    Returns:
+        list[int]: Sorted, de-duplicated game IDs
+    """
+    client = client if client is not None else Nhl()
+    if source == 'games':
+        game_ids = {game['id'] for game in client.iter_games(season=season) if game['gameType'] in game_types}
+    elif source == 'schedule':
+        index = ScheduleIndex.build([season], client=client)
+        game_ids = {game_id for game_type in game_types for game_id in index.for_season(season, game_type)}
+    else:
+        raise ValueError(f"source must be one of 'games', 'schedule'. You provided: {source}")
+    return sorted(game_ids)
+
+
+class BackfillStats:
+    """Progress counters for a Backfill run (`games` counts games processed in this run)"""
+    def __init__(self, total):
+        self.total = total
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes = 0
+        self.games = 0
+        self.started_at = time.monotonic()
+        self.errors = []
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    def __str__(self):
+        elapsed = max(self.elapsed, 1e-9)
+        done = self.completed + self.skipped + self.failed
+        return (f"{done}/{self.total} requests ({self.skipped} skipped, {self.failed} failed) | "
+                f"{self.games} games | {self.games / elapsed:.2f} games/s | "
+                f"{self.bytes / elapsed / 1024:.1f} KiB/s | {elapsed:.1f}s")
+
+
+class Backfill:
+    """Fetch gamecenter endpoints for many games into a local directory, resumably
+
+    Args:
+        root (str): Output directory
+        client (Nhl, optional): Client shared by every request. Defaults to Nhl().
+        max_workers (int, optional): Maximum number of concurrent requests. Defaults to 8.
+        endpoints (iterable of str, optional): Keys of game.DETAIL_SOURCES to fetch. Defaults to all.
+        progress (callable, optional): Called with BackfillStats every `progress_interval` seconds
+            and once at the end. Defaults to printing the stats.
+        progress_interval (float, optional): Seconds between progress reports. Defaults to 5.
+    """
+    def __init__(self, root, client=None, max_workers=8, endpoints=None, progress=print, progress_interval=5):
+        self.root = root
+        self.client = client if client is not None else Nhl()
+        self.max_workers = max_workers
+        self.endpoints = list(endpoints) if endpoints is not None else list(DETAIL_SOURCES)
+        unknown = set(self.endpoints) - set(DETAIL_SOURCES)
+        if unknown:
+            raise ValueError(f"Unknown endpoints: {sorted(unknown)}. Choose from {list(DETAIL_SOURCES)}")
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.checkpoint_path = os.path.join(root, 'checkpoint.jsonl')
+        self._checkpoint_lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, game_id, endpoint):
+        return os.path.join(self.root, str(game_season(game_id)), str(game_id), f"{endpoint}.json.gz")
+
+    def load_checkpoint(self):
+        """Return the set of (game_id, endpoint) pairs already completed for a final game
+
+        A pair counts when its latest checkpoint recorded a final gameState. Responses without
+        a gameState (meta, shiftcharts) take the state of their game's other endpoints, and
+        count as done when none of the game's checkpointed endpoints carries a state.
+        """
+        states = {}  # (game_id, endpoint) -> gameState of its latest checkpoint, or None
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # partial line from an interrupted write
+                    # Lines written before states were recorded came from completed runs
+                    states[(entry['game_id'], entry['endpoint'])] = entry.get('state', FINAL_GAME_STATES[0])
+        final_games = {game_id for (game_id, _endpoint), state in states.items() if state in FINAL_GAME_STATES}
+        stated_games = {game_id for (game_id, _endpoint), state in states.items() if state is not None}
+        return {(game_id, endpoint) for (game_id, endpoint), state in states.items()
+                if state in FINAL_GAME_STATES or (state is None and (game_id in final_games or game_id not in stated_games))}
+
+    def _checkpoint(self, game_id, endpoint, size, state):
+        line = json.dumps({'game_id': game_id, 'endpoint': endpoint, 'state': state, 'bytes': size, 'at': time.time()})
+        with self._checkpoint_lock:
+            with open(self.checkpoint_path, 'a') as f:
+                f.write(line + '\n')
+
+    def fetch(self, game_id, endpoint):
+        """Fetch one endpoint for one game, write it, record the checkpoint; returns bytes written"""
+        payload = getattr(Game(game_id, client=self.client), DETAIL_SOURCES[endpoint])()
+        data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        path = self.path(game_id, endpoint)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        state = payload.get('gameState') if isinstance(payload, dict) else None
+        self._checkpoint(game_id, endpoint, len(data), state)
+        return len(data)
+
+    def run(self, game_ids):
+        """Backfill every endpoint of every game, skipping work checkpointed for final games
+
+        Failed requests are counted and kept in stats.errors (as (game_id, endpoint, exception))
+        but do not stop the run; re-running retries them.
+
+        Returns:
+            BackfillStats
+        """
+        game_ids = list(game_ids)
+        done = self.load_checkpoint()
+        stats = BackfillStats(total=len(game_ids) * len(self.endpoints))
+        remaining = {}
+        tasks = []
+        for game_id in game_ids:
+            todo = [endpoint for endpoint in self.endpoints if (game_id, endpoint) not in done]
+            stats.skipped += len(self.endpoints) - len(todo)
+            if todo:
+                remaining[game_id] = len(todo)
+                tasks.extend((game_id, endpoint) for endpoint in todo)
+
+        last_report = time.monotonic()
+
+        def finished(game_id):
+            nonlocal last_report
+            remaining[game_id] -= 1
+            if remaining[game_id] == 0:
+                stats.games += 1
+            if self.progress and time.monotonic() - last_report >= self.progress_interval:
+                self.progress(stats)
+                last_report = time.monotonic()
+
+        def failed(task, e):
+            stats.failed += 1
+            stats.errors.append((*task, e))
+            finished(task[0])
+
+        for (game_id, _endpoint), size in map_bounded(lambda task: self.fetch(*task), tasks, self.max_workers, on_error=failed):
+            stats.bytes += size
+            stats.completed += 1
+            finished(game_id)
+
+        if self.progress:
+            self.progress(stats)
+        return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m nhl_api.backfill', description="Backfill gamecenter data for whole seasons")
+    parser.add_argument('seasons', nargs='+', type=int, help="Season IDs in YYYYYYYY format")
+    parser.add_argument('--root', default='nhl_backfill', help="Output directory")
+    parser.add_argument('--workers', type=int, default=8, help="Maximum concurrent requests")
+    parser.add_argument('--game-types', type=int, nargs='+', default=[2, 3], help="Game types to include")
+    parser.add_argument('--source', choices=['games', 'schedule'], default='games', help="Where to enumerate games from")
+    parser.add_argument('--endpoints', nargs='+', choices=list(DETAIL_SOURCES), help="Endpoints to fetch (default: all)")
+    args = parser.parse_args(argv)
+
+    client = Nhl(pool_size=args.workers)
+    backfill = Backfill(args.root, client=client, max_workers=args.workers, endpoints=args.endpoints)
+    failed = 0
+    for season in args.seasons:
+        game_ids = season_game_ids(season, game_types=tuple(args.game_types), client=client, source=args.source)
+        print(f"Season {season}: {len(game_ids)} games")
+        failed += backfill.run(game_ids).failed
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,302 @@
+"""Persistent on-disk response cache for Nhl.get_url
+
+Responses are stored compressed, keyed on base URL + endpoint + params, and expire
+according to a CachePolicy. Two backends are provided: SqliteBackend (one database file)
+and DirectoryBackend (one gzip file per response). Both evict least-recently-used entries
+once the cache grows past max_bytes.
+
+Example:
+    client = Nhl(cache=ResponseCache.sqlite('~/.cache/nhl_api.sqlite'))
+"""
+import datetime
+import gzip
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from urllib.parse import urlencode
+
+# TTL meaning "never expires"
+FOREVER = math.inf
+
+FINAL_GAME_STATES = ('OFF', 'FINAL')
+
+
+def current_season(today=None):
+    """Return the season ID (YYYYYYYY) in progress on `today` - seasons roll over on July 1st"""
+    today = today or datetime.date.today()
+    start_year = today.year if today.month >= 7 else today.year - 1
+    return start_year * 10000 + start_year + 1
+
+
+def gamecenter_ttl(cache, match, payload):
+    game_id = int(match.group(1))
+    if isinstance(payload, dict) and payload.get('gameState') in FINAL_GAME_STATES:
+        cache.mark_final(game_id)
+    return FOREVER if cache.is_final(game_id) else 15
+
+
+def known_final_ttl(cache, match, payload):
+    return FOREVER if cache.is_final(int(match.group(1))) else 60
+
+
+def past_season_ttl(cache, match, payload):
+    return FOREVER if int(match.group(1)) < current_season() else 3600
+
+
+def past_date_ttl(cache, match, payload):
+    return FOREVER if match.group(1) < str(datetime.date.today() - datetime.timedelta(days=1)) else 300
+
+
+class CachePolicy:
+    """Decides how long a response may be cached, per endpoint family
+
+    Rules are (regex, ttl) pairs checked in order against the endpoint path; the first match wins.
+    A ttl is a number of seconds, FOREVER, None (never cache), or a callable
+    `ttl(cache, match, payload)` returning one of those. Endpoints matching no rule use `default_ttl`.
+    """
+    def __init__(self, rules=None, default_ttl=300):
+        self.rules = [(re.compile(pattern), ttl) for pattern, ttl in (rules if rules is not None else self.default_rules())]
+        self.default_ttl = default_ttl
+
+    @staticmethod
+    def default_rules():
+        return [
+            (r'/now$|/current$|^/v1/scoreboard/', 30),
+            (r'^/v1/gamecenter/(\d+)/', gamecenter_ttl),
+            (r'^/v1/meta/game/(\d+)', known_final_ttl),
+            (r'^/\w+/shiftcharts\?cayenneExp=gameId=(\d+)', known_final_ttl),
+            (r'^/v1/player/\d+/game-log/(\d{8})/\d', past_season_ttl),
+            (r'^/v1/club-stats/\w+/(\d{8})/\d', past_season_ttl),
+            (r'^/v1/standings/(\d{4}-\d{2}-\d{2})', past_date_ttl),
+            (r'^/v1/season$|^/\w+/team$|^/\w+/glossary$|^/v1/standings-season$', 24 * 3600),
+            (r'^/v1/schedule-calendar/|^/v1/club-schedule|^/\w+/game$', 3600),
+        ]
+
+    def ttl(self, cache, endpoint, payload=None):
+        """Return the TTL in seconds (or FOREVER / None) for a response to `endpoint`"""
+        for pattern, ttl in self.rules:
+            match = pattern.search(endpoint)
+            if match:
+                return ttl(cache, match, payload) if callable(ttl) else ttl
+        return self.default_ttl
+
+
+class SqliteBackend:
+    """Cache backend storing zlib-compressed responses in a single SQLite database"""
+    def __init__(self, path, max_bytes=2 * 1024 ** 3):
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body BLOB, size INTEGER, expires_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT body, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._delete(key)
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return zlib.decompress(row[0])
+
+    def set(self, key, body, expires_at):
+        data = zlib.compress(body)
+        with self._lock:
+            self._delete(key)
+            self._conn.execute(
+                "INSERT INTO responses (key, body, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), expires_at, time.time()),
+            )
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _delete(self, key):
+        row = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._size -= row[0]
+
+    def _evict(self):
+        self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        target = self.max_bytes * 0.9
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if self._size <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._size -= size
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._size = 0
+
+    def close(self):
+        self._conn.close()
+
+
+class DirectoryBackend:
+    """Cache backend storing each response as a gzip file under a directory
+
+    Each file starts with the expiry timestamp (8-byte double) followed by the gzip body.
+    File mtimes are bumped on every hit and serve as the LRU order for eviction.
+    """
+    _header = struct.Struct('<d')
+
+    def __init__(self, path, max_bytes=2 * 1024 ** 3):
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        self._size = sum(os.path.getsize(file_path) for file_path in self._files())
+
+    def _files(self):
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if name.endswith('.gz'):
+                    yield os.path.join(root, name)
+
+    def _file_path(self, key):
+        return os.path.join(self.path, key[:2], key + '.gz')
+
+    def get(self, key):
+        file_path = self._file_path(key)
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        (expires_at,) = self._header.unpack_from(data)
+        if expires_at < time.time():
+            self._remove(file_path)
+            return None
+        try:
+            os.utime(file_path)
+        except FileNotFoundError:
+            pass
+        return gzip.decompress(data[self._header.size:])
+
+    def set(self, key, body, expires_at):
+        data = self._header.pack(expires_at) + gzip.compress(body, compresslevel=6)
+        file_path = self._file_path(key)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        with self._lock:
+            self._remove(file_path)
+            os.replace(tmp_path, file_path)
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _remove(self, file_path):
+        try:
+            size = os.path.getsize(file_path)
+            os.remove(file_path)
+        except FileNotFoundError:
+            return
+        self._size -= size
+
+    def _evict(self):
+        entries = []
+        for file_path in self._files():
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file_path))
+        self._size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, _, file_path in sorted(entries):
+            if self._size <= target:
+                break
+            self._remove(file_path)
+
+    def clear(self):
+        with self._lock:
+            for file_path in list(self._files()):
+                self._remove(file_path)
+            self._size = 0
+
+    def close(self):
+        pass
+
+
+class ResponseCache:
+    """Response cache used by Nhl.get_url
+
+    Games seen in a final state (OFF/FINAL) are recorded in the backend, so endpoints whose
+    payload carries no gameState (shift charts, game meta) can also be cached forever once
+    the game is known to be over.
+
+    Args:
+        backend: SqliteBackend, DirectoryBackend, or any object with get(key) / set(key, body, expires_at)
+        policy (CachePolicy, optional): TTL rules. Defaults to CachePolicy().
+    """
+    def __init__(self, backend, policy=None):
+        self.backend = backend
+        self.policy = policy if policy is not None else CachePolicy()
+        self._final_games = set()
+
+    @classmethod
+    def sqlite(cls, path, max_bytes=2 * 1024 ** 3, policy=None):
+        return cls(SqliteBackend(path, max_bytes=max_bytes), policy=policy)
+
+    @classmethod
+    def directory(cls, path, max_bytes=2 * 1024 ** 3, policy=None):
+        return cls(DirectoryBackend(path, max_bytes=max_bytes), policy=policy)
+
+    @staticmethod
+    def key(base_url, endpoint, params=None):
+        url = base_url + endpoint
+        if params:
+            url += ('&' if '?' in endpoint else '?') + urlencode(sorted(params.items()))
+        return hashlib.sha1(url.encode()).hexdigest()
+
+    def get(self, base_url, endpoint, params=None):
+        """Return the cached response body (bytes), or None on a miss"""
+        return self.backend.get(self.key(base_url, endpoint, params))
+
+    def set(self, base_url, endpoint, params, body, payload=None):
+        """Store a response body if the policy allows it; `payload` is the parsed JSON, if any"""
+        ttl = self.policy.ttl(self, endpoint, payload)
+        if not ttl:
+            return
+        self.backend.set(self.key(base_url, endpoint, params), body, time.time() + ttl)
+
+    def mark_final(self, game_id):
+        """Record that a game has reached a final state"""
+        if game_id not in self._final_games:
+            self._final_games.add(game_id)
+            self.backend.set(f"final-game-{game_id}", b'', FOREVER)
+
+    def is_final(self, game_id):
+        """Return True if the game is known to have reached a final state"""
+        if game_id in self._final_games:
+            return True
+        if self.backend.get(f"final-game-{game_id}") is not None:
+            self._final_games.add(game_id)
+            return True
+        return False
+
+    def clear(self):
+        self.backend.clear()
+
+    def close(self):
+        self.backend.close()
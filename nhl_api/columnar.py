@@ -0,0 +1,571 @@
+"""Columnar extraction of play-by-play, shift-chart, boxscore and game-log payloads
+
+Turns the nested dicts returned by Game.get_play_by_play, Game.get_shift_charts and friends into
+typed column arrays - one pass over the payload, one compact array per field - so queries
+over a season of events can be vectorized instead of re-walking dicts in Python loops.
+
+Columns are built as stdlib `array.array`s (no extra dependencies). String fields are
+dictionary-encoded: the column holds int16 codes and `Table.categories[name]` holds the
+strings. A missing value is appended as None: its slot holds MISSING (-128, the smallest
+int8, so it fits every column) and its row is listed in `Table.missing[name]`, so a real -128
+is still a value. Missing coordinates and percentages are NaN. Use Table.to_numpy() or Table.to_arrow()
+(nullable columns) when numpy / pyarrow are installed.
+
+Example:
+    plays = plays_table(Game(2023020204).get_play_by_play())
+    shots = plays.to_numpy()
+    on_goal = shots['type_desc_key'] == plays.code('type_desc_key', 'shot-on-goal')  # all False without shots
+"""
+from array import array
+
+MISSING = -128
+NAN = float('nan')
+
+# Length of a regulation period, in seconds
+PERIOD_SECONDS = 20 * 60
+
+# typeCode of a player shift in shift charts (other rows are goal / penalty markers)
+SHIFT_TYPE_CODE = 517
+
+# details keys naming the player primarily / secondarily involved in a play, by precedence
+PRIMARY_PLAYER_KEYS = (
+    'scoringPlayerId', 'shootingPlayerId', 'hittingPlayerId', 'winningPlayerId',
+    'committedByPlayerId', 'blockingPlayerId', 'playerId',
+)
+SECONDARY_PLAYER_KEYS = (
+    'assist1PlayerId', 'hitteePlayerId', 'losingPlayerId', 'drawnByPlayerId', 'servedByPlayerId',
+)
+
+PLAY_COLUMNS = {
+    'game_id': 'q',
+    'event_id': 'l',
+    'sort_order': 'l',
+    'period': 'b',
+    'period_type': 'h',
+    'seconds_in_period': 'h',
+    'seconds_elapsed': 'l',
+    'type_code': 'h',
+    'type_desc_key': 'h',
+    'situation_code': 'h',
+    'team_id': 'l',
+    'player1_id': 'l',
+    'player2_id': 'l',
+    'assist2_id': 'l',
+    'goalie_id': 'l',
+    'x_coord': 'd',
+    'y_coord': 'd',
+    'zone_code': 'h',
+    'shot_type': 'h',
+    'home_score': 'h',
+    'away_score': 'h',
+}
+PLAY_CATEGORICAL = ('period_type', 'type_desc_key', 'situation_code', 'zone_code', 'shot_type')
+
+SHIFT_COLUMNS = {
+    'game_id': 'q',
+    'player_id': 'l',
+    'team_id': 'l',
+    'period': 'b',
+    'shift_number': 'h',
+    'start_seconds': 'h',
+    'end_seconds': 'h',
+    'duration': 'h',
+    'start_elapsed': 'l',
+    'end_elapsed': 'l',
+    'type_code': 'h',
+}
+SHIFT_CATEGORICAL = ()
+
+# Skater and goalie rows share one table; fields a row does not report are missing / NaN
+GAME_LOG_COLUMNS = {
+    'player_id': 'l',
+    'season': 'l',
+    'game_type': 'b',
+    'game_id': 'q',
+    'game_date': 'h',
+    'team_abbrev': 'h',
+    'opponent_abbrev': 'h',
+    'home_road_flag': 'h',
+    'goals': 'h',
+    'assists': 'h',
+    'points': 'h',
+    'plus_minus': 'h',
+    'pim': 'h',
+    'shots': 'h',
+    'shifts': 'h',
+    'power_play_goals': 'h',
+    'power_play_points': 'h',
+    'shorthanded_goals': 'h',
+    'game_winning_goals': 'h',
+    'ot_goals': 'h',
+    'toi': 'l',
+    'games_started': 'h',
+    'decision': 'h',
+    'shots_against': 'h',
+    'goals_against': 'h',
+    'save_pctg': 'd',
+    'shutouts': 'h',
+}
+GAME_LOG_CATEGORICAL = ('game_date', 'team_abbrev', 'opponent_abbrev', 'home_road_flag', 'decision')
+
+# One row per game, from the header of Game.get_play_by_play()
+GAME_COLUMNS = {
+    'game_id': 'q',
+    'season': 'l',
+    'game_type': 'b',
+    'game_date': 'h',
+    'venue': 'h',
+    'game_state': 'h',
+    'home_team_id': 'l',
+    'away_team_id': 'l',
+    'home_abbrev': 'h',
+    'away_abbrev': 'h',
+    'home_score': 'h',
+    'away_score': 'h',
+    'home_sog': 'h',
+    'away_sog': 'h',
+    'periods': 'b',
+    'last_period_type': 'h',
+}
+GAME_CATEGORICAL = ('game_date', 'venue', 'game_state', 'home_abbrev', 'away_abbrev', 'last_period_type')
+
+# Skaters and goalies of Game.get_boxscore()['playerByGameStats'] share one table
+BOXSCORE_PLAYER_COLUMNS = {
+    'game_id': 'q',
+    'team_id': 'l',
+    'player_id': 'l',
+    'home_road_flag': 'h',
+    'position': 'h',
+    'sweater_number': 'h',
+    'goals': 'h',
+    'assists': 'h',
+    'points': 'h',
+    'plus_minus': 'h',
+    'pim': 'h',
+    'hits': 'h',
+    'shots': 'h',
+    'power_play_goals': 'h',
+    'blocked_shots': 'h',
+    'shifts': 'h',
+    'giveaways': 'h',
+    'takeaways': 'h',
+    'toi': 'l',
+    'faceoff_winning_pctg': 'd',
+    'shots_against': 'h',
+    'saves': 'h',
+    'goals_against': 'h',
+    'save_pctg': 'd',
+    'starter': 'b',
+    'decision': 'h',
+}
+BOXSCORE_PLAYER_CATEGORICAL = ('home_road_flag', 'position', 'decision')
+
+
+def mmss_to_seconds(value):
+    """Convert an 'MM:SS' string to integer seconds (None for None / empty)"""
+    if not value:
+        return None
+    minutes, _, seconds = value.partition(':')
+    return int(minutes) * 60 + int(seconds)
+
+
+def elapsed_seconds(period, seconds_in_period):
+    """Seconds since the start of the game for a time within a period"""
+    if seconds_in_period is None:
+        return None
+    return (period - 1) * PERIOD_SECONDS + seconds_in_period
+
+
+class Table:
+    """A set of equal-length typed columns
+
+    Attributes:
+        columns (dict): Column name -> array.array
+        categories (dict): Column name -> list of strings, for dictionary-encoded columns
+    """
+    def __init__(self, typecodes, categorical=()):
+        self.columns = {name: array(typecode) for name, typecode in typecodes.items()}
+        self.categories = {name: [] for name in categorical}
+        self._codes = {name: {} for name in categorical}
+        self._missing = {name: array('q') for name in typecodes}
+        self._slots = list(zip(self.columns.values(), self._missing.values()))
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __repr__(self):
+        return f"<Table {len(self)} rows x {len(self.columns)} columns>"
+
+    @property
+    def missing(self):
+        """Column name -> array.array of the (ascending) rows without a value, for the columns that have some"""
+        return {name: self._missing[name] for name in self.columns if self._missing[name]}
+
+    def append_row(self, values):
+        """Append one row: a tuple of values in column order, None for a missing value"""
+        if len(values) != len(self._slots):
+            raise ValueError(f"Expected {len(self._slots)} values, got {len(values)}")
+        row = len(self._slots[0][0]) if self._slots else 0
+        for (column, missing), value in zip(self._slots, values):
+            if value is None:
+                missing.append(row)
+                column.append(MISSING)
+            else:
+                column.append(value)
+
+    def encode(self, name, value):
+        """Return the code for a string in a dictionary-encoded column, adding it if new (None for None)"""
+        if value is None:
+            return None
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.categories[name])
+            self.categories[name].append(value)
+        return code
+
+    def code(self, name, value):
+        """Return the code of an existing category (None if it never occurs), for filtering"""
+        return self._codes[name].get(value)
+
+    def to_list(self, name):
+        """Return a column as a list, None where missing (strings for a dictionary-encoded column)"""
+        values = list(self.columns[name])
+        if name in self.categories:
+            categories = self.categories[name]
+            missing = set(self._missing[name])
+            values = [None if row in missing else categories[code] for row, code in enumerate(values)]
+        else:
+            for row in self._missing[name]:
+                values[row] = None
+        return values
+
+    def decode(self, name):
+        """Return a dictionary-encoded column as a list of strings (None where missing)"""
+        if name not in self.categories:
+            raise KeyError(f"{name} is not a dictionary-encoded column")
+        return self.to_list(name)
+
+    def extend(self, other):
+        """Append the rows of another Table with the same columns"""
+        for name, column in other.columns.items():
+            offset = len(self.columns[name])
+            missing = other._missing[name]
+            if name in self.categories:
+                recode = [self.encode(name, value) for value in other.categories[name]]
+                skip = set(missing)
+                column = array(column.typecode, (code if row in skip else recode[code] for row, code in enumerate(column)))
+            self._missing[name].extend(offset + row for row in missing)
+            self.columns[name].extend(column)
+        return self
+
+    def to_numpy(self):
+        """Return a dict of column name -> numpy array (zero-copy views of the columns; missing
+        rows hold MISSING, see `missing`)"""
+        import numpy as np
+        return {name: np.frombuffer(column, dtype=column.typecode) if len(column) else np.array([], dtype=column.typecode)
+                for name, column in self.columns.items()}
+
+    def to_arrow(self):
+        """Return a pyarrow.Table with missing rows as nulls; dictionary-encoded columns become
+        pyarrow DictionaryArrays"""
+        import numpy as np
+        import pyarrow as pa
+        arrays = {}
+        for name, values in self.to_numpy().items():
+            mask = None
+            if self._missing[name]:
+                mask = np.zeros(len(values), dtype=bool)
+                mask[np.frombuffer(self._missing[name], dtype=np.int64)] = True
+            if name in self.categories:
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(values, mask=mask), pa.array(self.categories[name], type=pa.string()))
+            else:
+                arrays[name] = pa.array(values, mask=mask, from_pandas=values.dtype.kind == 'f')
+        return pa.table(arrays)
+
+
+def _as_payloads(payloads):
+    return [payloads] if isinstance(payloads, dict) else payloads
+
+
+def _first(details, keys):
+    for key in keys:
+        value = details.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def plays_table(play_by_plays):
+    """Extract the plays of one or more games into a Table
+
+    Args:
+        play_by_plays (dict or iterable of dict): Game.get_play_by_play() response(s)
+
+    Returns:
+        Table with one row per play and columns PLAY_COLUMNS
+    """
+    table = Table(PLAY_COLUMNS, PLAY_CATEGORICAL)
+    for payload in _as_payloads(play_by_plays):
+        game_id = payload['id']
+        for play in payload.get('plays', ()):
+            details = play.get('details') or {}
+            period_descriptor = play.get('periodDescriptor') or {}
+            period = period_descriptor.get('number', 0)
+            seconds_in_period = mmss_to_seconds(play.get('timeInPeriod'))
+            x, y = details.get('xCoord'), details.get('yCoord')
+
+            table.append_row((  # PLAY_COLUMNS order
+                game_id,
+                play.get('eventId'),
+                play.get('sortOrder'),
+                period,
+                table.encode('period_type', period_descriptor.get('periodType')),
+                seconds_in_period,
+                elapsed_seconds(period, seconds_in_period),
+                play.get('typeCode'),
+                table.encode('type_desc_key', play.get('typeDescKey')),
+                table.encode('situation_code', play.get('situationCode')),
+                details.get('eventOwnerTeamId'),
+                _first(details, PRIMARY_PLAYER_KEYS),
+                _first(details, SECONDARY_PLAYER_KEYS),
+                details.get('assist2PlayerId'),
+                details.get('goalieInNetId'),
+                NAN if x is None else x,
+                NAN if y is None else y,
+                table.encode('zone_code', details.get('zoneCode')),
+                table.encode('shot_type', details.get('shotType')),
+                details.get('homeScore'),
+                details.get('awayScore'),
+            ))
+    return table
+
+
+def shifts_table(shift_charts, shifts_only=True):
+    """Extract the shifts of one or more games into a Table
+
+    Args:
+        shift_charts (dict or iterable of dict): Game.get_shift_charts() response(s)
+        shifts_only (bool, optional): Keep only player shifts (typeCode 517), dropping goal
+            and penalty marker rows. Defaults to True.
+
+    Returns:
+        Table with one row per shift and columns SHIFT_COLUMNS; times are integer seconds,
+        `*_seconds` within the period and `*_elapsed` since the start of the game
+    """
+    table = Table(SHIFT_COLUMNS, SHIFT_CATEGORICAL)
+    for payload in _as_payloads(shift_charts):
+        for shift in payload.get('data', ()):
+            type_code = shift.get('typeCode')
+            if shifts_only and type_code != SHIFT_TYPE_CODE:
+                continue
+            period = shift.get('period', 0)
+            start = mmss_to_seconds(shift.get('startTime'))
+            end = mmss_to_seconds(shift.get('endTime'))
+
+            table.append_row((  # SHIFT_COLUMNS order
+                shift['gameId'],
+                shift.get('playerId'),
+                shift.get('teamId'),
+                period,
+                shift.get('shiftNumber'),
+                start,
+                end,
+                mmss_to_seconds(shift.get('duration')),
+                elapsed_seconds(period, start),
+                elapsed_seconds(period, end),
+                type_code,
+            ))
+    return table
+
+
+def games_table(play_by_plays):
+    """Extract the game header of one or more play-by-play responses into a Table
+
+    Args:
+        play_by_plays (dict or iterable of dict): Game.get_play_by_play() response(s)
+
+    Returns:
+        Table with one row per game and columns GAME_COLUMNS
+    """
+    table = Table(GAME_COLUMNS, GAME_CATEGORICAL)
+    for payload in _as_payloads(play_by_plays):
+        home, away = payload.get('homeTeam') or {}, payload.get('awayTeam') or {}
+        table.append_row((  # GAME_COLUMNS order
+            payload['id'],
+            payload.get('season'),
+            payload.get('gameType'),
+            table.encode('game_date', payload.get('gameDate')),
+            table.encode('venue', (payload.get('venue') or {}).get('default')),
+            table.encode('game_state', payload.get('gameState')),
+            home.get('id'),
+            away.get('id'),
+            table.encode('home_abbrev', home.get('abbrev')),
+            table.encode('away_abbrev', away.get('abbrev')),
+            home.get('score'),
+            away.get('score'),
+            home.get('sog'),
+            away.get('sog'),
+            (payload.get('periodDescriptor') or {}).get('number'),
+            table.encode('last_period_type', (payload.get('gameOutcome') or {}).get('lastPeriodType')),
+        ))
+    return table
+
+
+def boxscore_players_table(boxscores):
+    """Extract the player stats of one or more boxscores into a Table
+
+    Args:
+        boxscores (dict or iterable of dict): Game.get_boxscore() response(s)
+
+    Returns:
+        Table with one row per player and game and columns BOXSCORE_PLAYER_COLUMNS; toi is in
+        seconds, fields a skater / goalie row does not report are missing / NaN
+    """
+    table = Table(BOXSCORE_PLAYER_COLUMNS, BOXSCORE_PLAYER_CATEGORICAL)
+    for payload in _as_payloads(boxscores):
+        for side, flag in (('awayTeam', 'R'), ('homeTeam', 'H')):
+            team_id = (payload.get(side) or {}).get('id')
+            for group in ((payload.get('playerByGameStats') or {}).get(side) or {}).values():
+                for row in group:
+                    faceoffs, save_pctg, starter = row.get('faceoffWinningPctg'), row.get('savePctg'), row.get('starter')
+                    table.append_row((  # BOXSCORE_PLAYER_COLUMNS order
+                        payload['id'],
+                        team_id,
+                        row['playerId'],
+                        table.encode('home_road_flag', flag),
+                        table.encode('position', row.get('position')),
+                        row.get('sweaterNumber'),
+                        row.get('goals'),
+                        row.get('assists'),
+                        row.get('points'),
+                        row.get('plusMinus'),
+                        row.get('pim'),
+                        row.get('hits'),
+                        row.get('shots'),
+                        row.get('powerPlayGoals'),
+                        row.get('blockedShots'),
+                        row.get('shifts'),
+                        row.get('giveaways'),
+                        row.get('takeaways'),
+                        mmss_to_seconds(row.get('toi')),
+                        NAN if faceoffs is None else faceoffs,
+                        row.get('shotsAgainst'),
+                        row.get('saves'),
+                        row.get('goalsAgainst'),
+                        NAN if save_pctg is None else save_pctg,
+                        None if starter is None else int(starter),
+                        table.encode('decision', row.get('decision')),
+                    ))
+    return table
+
+
+def game_log_table(game_log, player_id):
+    """Extract a Player.get_game_log() response into a Table
+
+    Args:
+        game_log (dict): Player.get_game_log() response
+        player_id (int): The player (the response does not name them)
+
+    Returns:
+        Table with one row per game and columns GAME_LOG_COLUMNS; toi is in seconds
+    """
+    table = Table(GAME_LOG_COLUMNS, GAME_LOG_CATEGORICAL)
+    season = game_log.get('seasonId')
+    game_type = game_log.get('gameTypeId')
+    for row in game_log.get('gameLog', ()):
+        save_pctg = row.get('savePctg')
+        table.append_row((  # GAME_LOG_COLUMNS order
+            player_id,
+            season,
+            game_type,
+            row.get('gameId'),
+            table.encode('game_date', row.get('gameDate')),
+            table.encode('team_abbrev', row.get('teamAbbrev')),
+            table.encode('opponent_abbrev', row.get('opponentAbbrev')),
+            table.encode('home_road_flag', row.get('homeRoadFlag')),
+            row.get('goals'),
+            row.get('assists'),
+            row.get('points'),
+            row.get('plusMinus'),
+            row.get('pim'),
+            row.get('shots'),
+            row.get('shifts'),
+            row.get('powerPlayGoals'),
+            row.get('powerPlayPoints'),
+            row.get('shorthandedGoals'),
+            row.get('gameWinningGoals'),
+            row.get('otGoals'),
+            mmss_to_seconds(row.get('toi')),
+            row.get('gamesStarted'),
+            table.encode('decision', row.get('decision')),
+            row.get('shotsAgainst'),
+            row.get('goalsAgainst'),
+            NAN if save_pctg is None else save_pctg,
+            row.get('shutouts'),
+        ))
+    return table
+
+
+class TableWriter:
+    """Streams Tables with the same columns to one file, batch by batch
+
+    Writes Parquet (one row group per write, needs pyarrow) when the path ends in .parquet,
+    CSV otherwise - dictionary-encoded columns as their strings, missing values / NaN as empty fields.
+
+    Example:
+        with TableWriter('game_logs.parquet') as writer:
+            for table in tables:
+                writer.write(table)
+    """
+    def __init__(self, path):
+        self.path = path
+        self.format = 'parquet' if path.endswith('.parquet') else 'csv'
+        self.rows = 0
+        self._writer = None
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, table):
+        if not len(table):
+            return
+        if self.format == 'parquet':
+            self._write_parquet(table)
+        else:
+            self._write_csv(table)
+        self.rows += len(table)
+
+    def _write_parquet(self, table):
+        import pyarrow.parquet as pq
+        arrow_table = table.to_arrow()
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, arrow_table.schema)
+        elif arrow_table.schema != self._writer.schema:
+            arrow_table = arrow_table.cast(self._writer.schema)
+        self._writer.write_table(arrow_table)
+
+    def _write_csv(self, table):
+        import csv
+        if self._file is None:
+            self._file = open(self.path, 'w', newline='')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(table.columns)
+        columns = [['' if value is None or value != value else value for value in table.to_list(name)]
+                   for name in table.columns]
+        self._writer.writerows(zip(*columns))
+
+    def close(self):
+        if self.format == 'parquet' and self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = self._file = None
@@ -0,0 +1,96 @@
+"""Conditional requests (ETag / If-Modified-Since) for polled endpoints
+
+Nhl(conditional=True) keeps, per URL, the validators of the last response together with
+its parsed body. Later requests for that URL send If-None-Match / If-Modified-Since; a 304
+answer returns the previous parsed object without downloading or parsing it again. A 200
+whose body is byte-identical to the previous one also reuses the previous parsed object.
+
+After each call, `client.last_changed` (tracked per thread) says whether the data differs
+from the previous response, so downstream recomputation can be skipped:
+
+    client = Nhl(conditional=True)
+    team = Team(19, client=client)
+    scoreboard = team.get_team_scoreboard_now()
+    if client.last_changed:
+        recompute(scoreboard)
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+# Endpoints that are polled while games are in progress
+DEFAULT_PATTERNS = (
+    r'/now$',
+    r'^/v1/scoreboard/',
+    r'^/v1/gamecenter/\d+/(play-by-play|landing|boxscore)$',
+)
+
+
+class Validated:
+    """Last response seen for one URL"""
+    __slots__ = ('etag', 'last_modified', 'digest', 'parsed')
+
+    def __init__(self, etag, last_modified, digest, parsed):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.parsed = parsed
+
+    def headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ConditionalCache:
+    """Bounded, thread-safe store of validators + parsed bodies for conditional requests
+
+    Args:
+        patterns (iterable of str, optional): Regexes selecting the endpoints to request conditionally.
+            Defaults to DEFAULT_PATTERNS.
+        maxsize (int, optional): Maximum number of URLs remembered (least recently used are dropped). Defaults to 256.
+    """
+    def __init__(self, patterns=DEFAULT_PATTERNS, maxsize=256):
+        self.pattern = re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+        self.maxsize = maxsize
+        self.not_modified = 0
+        self.unchanged = 0
+        self.changed = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def applies(self, endpoint):
+        return self.pattern.search(endpoint) is not None
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def update(self, key, response, parse):
+        """Record a 200 response; returns (parsed, changed), reusing the previous parsed body when unchanged"""
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        previous = self.get(key)
+        if previous is not None and previous.digest == digest:
+            parsed, changed = previous.parsed, False
+            self.unchanged += 1
+        else:
+            parsed, changed = parse(), True
+            self.changed += 1
+        entry = Validated(response.headers.get('ETag'), response.headers.get('Last-Modified'), digest, parsed)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return parsed, changed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
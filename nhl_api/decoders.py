@@ -0,0 +1,60 @@
+"""Pluggable JSON decoders for Nhl.get_url
+
+'auto' (the default) picks the fastest installed backend: orjson, then msgspec, then the
+standard library's json module. Every decoder takes the raw response bytes and raises
+ValueError on invalid JSON.
+"""
+import functools
+import json
+
+
+def _stdlib_decoder():
+    return json.loads
+
+
+def _orjson_decoder():
+    import orjson
+    return orjson.loads
+
+
+@functools.lru_cache(maxsize=None)  # one decoder per process, so clients using it coalesce their calls
+def _msgspec_decoder():
+    import msgspec
+    decode = msgspec.json.Decoder().decode
+
+    def loads(data):
+        try:
+            return decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e  # match json / orjson, which raise ValueError subclasses
+    return loads
+
+
+DECODERS = {
+    'orjson': _orjson_decoder,
+    'msgspec': _msgspec_decoder,
+    'json': _stdlib_decoder,
+}
+
+
+def get_decoder(name='auto'):
+    """Return a callable decoding JSON bytes into Python objects
+
+    Args:
+        name (str or callable, optional): 'auto', 'json', 'orjson', 'msgspec', or a callable
+            taking bytes. Defaults to 'auto'.
+
+    Raises:
+        ImportError if a specifically requested backend is not installed
+    """
+    if callable(name):
+        return name
+    if name == 'auto':
+        for factory in DECODERS.values():
+            try:
+                return factory()
+            except ImportError:
+                continue
+    if name not in DECODERS:
+        raise ValueError(f"decoder must be one of 'auto', {', '.join(repr(k) for k in DECODERS)} or a callable. You provided: {name}")
+    return DECODERS[name]()
@@ -0,0 +1,58 @@
+"""Exceptions raised by the NHL API clients"""
+
+
+class NhlApiError(Exception):
+    """Base class for every error raised by the clients"""
+
+
+class NhlConnectionError(NhlApiError):
+    """The request could not be completed (DNS, connect, read timeout, reset connection)"""
+
+
+class NhlDecodeError(NhlApiError):
+    """A successful response did not contain valid JSON"""
+
+
+class NhlHTTPError(NhlApiError):
+    """The API answered with an error status
+
+    Attributes:
+        status_code (int): HTTP status code
+        url (str): Requested URL
+        body (str): Start of the response body, for diagnostics
+    """
+    def __init__(self, status_code, url, body=''):
+        super().__init__(f"HTTP {status_code} for {url}: {body[:200]}")
+        self.status_code = status_code
+        self.url = url
+        self.body = body
+
+
+class NhlNotFoundError(NhlHTTPError):
+    """404 - unknown game, player, team or endpoint"""
+
+
+class NhlRateLimitError(NhlHTTPError):
+    """429 - too many requests
+
+    Attributes:
+        retry_after (float or None): Seconds the server asked us to wait, if it said
+    """
+    def __init__(self, status_code, url, body='', retry_after=None):
+        super().__init__(status_code, url, body)
+        self.retry_after = retry_after
+
+
+class NhlServerError(NhlHTTPError):
+    """5xx - the API failed to answer"""
+
+
+def http_error(status_code, url, body='', retry_after=None):
+    """Build the NhlHTTPError subclass matching a status code"""
+    if status_code == 404:
+        return NhlNotFoundError(status_code, url, body)
+    if status_code == 429:
+        return NhlRateLimitError(status_code, url, body, retry_after=retry_after)
+    if status_code >= 500:
+        return NhlServerError(status_code, url, body)
+    return NhlHTTPError(status_code, url, body)
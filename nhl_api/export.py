@@ -0,0 +1,360 @@
+"""Multi-process export of whole seasons to partitioned Parquet / CSV
+
+Every dataset of a season is written Hive-style, one part file per task:
+    <out>/<dataset>/season=<season>/part-<n>.parquet (or .csv)
+The datasets are
+    games, plays, shifts, boxscore_players - flattened from the gamecenter endpoints of every game
+    game_logs - every player who dressed in one of the season's boxscores
+    standings - the season's daily standings (standings.StandingsHistory)
+The season is carried by the partition directory, not by a column of the files.
+
+Games (and later players) are split into chunks handed to a process pool. Inside a worker,
+fetch threads download the next games while the worker's main thread flattens the ones
+already received into columnar Tables, so network waits and CPU-bound flattening overlap.
+Each task streams its tables to its own part file and only small stats travel back to the
+parent. Memory per worker is bounded by the fetch window (games buffered ahead of the
+flattener) and by flushing tables every `batch_rows` rows, or every tenth of that while the
+worker's RSS exceeds `memory_limit_mb`.
+
+Example:
+    stats = export([20232024], 'export', datasets=['games', 'plays', 'shifts'], processes=8)
+    print(stats)
+
+Command line:
+    python -m nhl_api export 20232024 20222023 --out export --format parquet --processes 8
+"""
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from nhl_api.backfill import season_game_ids
+from nhl_api.columnar import TableWriter, boxscore_players_table, game_log_table, games_table, plays_table, shifts_table
+from nhl_api.game import Game
+from nhl_api.instrumentation import Instrumentation
+from nhl_api.nhl import Nhl
+from nhl_api.player import Player
+from nhl_api.pool import map_bounded
+from nhl_api.standings import StandingsHistory
+from nhl_api.transport import Transport
+
+DATASETS = ('games', 'plays', 'shifts', 'boxscore_players', 'game_logs', 'standings')
+
+# Per-game dataset -> (Game method providing it, flattener)
+GAME_DATASETS = {
+    'games': ('get_play_by_play', games_table),
+    'plays': ('get_play_by_play', plays_table),
+    'shifts': ('get_shift_charts', shifts_table),
+    'boxscore_players': ('get_boxscore', boxscore_players_table),
+}
+
+FORMATS = ('parquet', 'csv')
+
+
+def partition_path(out, dataset, season, part, file_format='parquet'):
+    """Path of one part file: <out>/<dataset>/season=<season>/part-<part>.<file_format>"""
+    return os.path.join(out, dataset, f"season={season}", f"part-{part:05d}.{file_format}")
+
+
+def _rss_bytes():
+    """Current resident set size of this process (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ExportStats:
+    """Totals of an export run, merged from the stats of every task"""
+    def __init__(self):
+        self.tasks = 0
+        self.games = 0
+        self.players = 0
+        self.rows = {}
+        self.files = 0
+        self.requests = 0
+        self.bytes = 0
+        self.fetch_seconds = 0.0
+        self.flatten_seconds = 0.0
+        self.write_seconds = 0.0
+        self.peak_rss = 0
+        self.errors = []
+        self.started_at = time.monotonic()
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    def add(self, task):
+        self.tasks += 1
+        self.games += task['games']
+        self.players += task['players']
+        for dataset, rows in task['rows'].items():
+            self.rows[dataset] = self.rows.get(dataset, 0) + rows
+        self.files += task['files']
+        self.requests += task['requests']
+        self.bytes += task['bytes']
+        self.fetch_seconds += task['fetch_seconds']
+        self.flatten_seconds += task['flatten_seconds']
+        self.write_seconds += task['write_seconds']
+        self.peak_rss = max(self.peak_rss, task['peak_rss'])
+        self.errors.extend(task['errors'])
+
+    def __str__(self):
+        elapsed = max(self.elapsed, 1e-9)
+        rows = sum(self.rows.values())
+        lines = [
+            f"{self.tasks} tasks | {self.games} games | {self.players} players | {self.files} files | {elapsed:.1f}s",
+            f"{self.games / elapsed:.1f} games/s | {rows / elapsed:,.0f} rows/s | {self.requests / elapsed:.1f} req/s | "
+            f"{self.bytes / elapsed / 2 ** 20:.2f} MiB/s downloaded ({self.requests} requests, {self.bytes / 2 ** 20:.1f} MiB)",
+            f"worker time: fetch {self.fetch_seconds:.1f}s (summed over fetch threads) | flatten {self.flatten_seconds:.1f}s | "
+            f"write {self.write_seconds:.1f}s | peak worker RSS {self.peak_rss / 2 ** 20:.0f} MiB",
+        ]
+        lines += [f"  {dataset}: {count:,} rows" for dataset, count in self.rows.items()]
+        if self.errors:
+            lines.append(f"{len(self.errors)} failed: " + ', '.join(f"{item} ({error})" for item, error in self.errors[:5]))
+        return '\n'.join(lines)
+
+
+_worker = {}
+
+
+def _init_worker(out, file_format, fetch_threads, batch_rows, memory_limit_mb, base_urls):
+    instrumentation = Instrumentation()
+    _worker.update(
+        out=out, file_format=file_format, fetch_threads=fetch_threads, batch_rows=batch_rows,
+        memory_limit=memory_limit_mb * 2 ** 20 if memory_limit_mb else None, instrumentation=instrumentation,
+        # A Transport of its own: a forked worker must not read from the parent's pooled sockets
+        client=Nhl(transport=Transport(base_urls=base_urls), instrumentation=instrumentation),
+    )
+
+
+class _Task:
+    """Stats and part-file writers of one worker task"""
+    def __init__(self, season, part, datasets):
+        self.writers = {}
+        for dataset in datasets:
+            path = partition_path(_worker['out'], dataset, season, part, _worker['file_format'])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.writers[dataset] = TableWriter(path)
+        self.tables = {}
+        self.stats = {'games': 0, 'players': 0, 'rows': {}, 'files': 0, 'requests': 0, 'bytes': 0, 'fetch_seconds': 0.0,
+                      'flatten_seconds': 0.0, 'write_seconds': 0.0, 'peak_rss': 0, 'errors': [], 'player_ids': []}
+        counters = _worker['instrumentation'].metrics.counters
+        self._requests, self._bytes = sum(counters['requests'].values()), sum(counters['response_bytes'].values())
+
+    def add(self, dataset, table):
+        table.columns.pop('season', None)  # carried by the season=<season> partition
+        if dataset in self.tables:
+            self.tables[dataset].extend(table)
+        else:
+            self.tables[dataset] = table
+        rss = _rss_bytes()
+        self.stats['peak_rss'] = max(self.stats['peak_rss'], rss)
+        if len(self.tables[dataset]) >= _worker['batch_rows']:
+            self.flush()
+        elif _worker['memory_limit'] and rss > _worker['memory_limit']:
+            # RSS rarely drops back after a flush: over the limit, flush once a tenth of a batch is buffered again
+            if sum(len(table) for table in self.tables.values()) >= max(_worker['batch_rows'] // 10, 1):
+                self.flush()
+
+    def flush(self):
+        started = time.perf_counter()
+        for dataset, table in self.tables.items():
+            self.writers[dataset].write(table)
+        self.tables = {}
+        self.stats['write_seconds'] += time.perf_counter() - started
+
+    def close(self):
+        self.flush()
+        for dataset, writer in self.writers.items():
+            writer.close()
+            if writer.rows:
+                self.stats['rows'][dataset] = writer.rows
+                self.stats['files'] += 1
+        counters = _worker['instrumentation'].metrics.counters
+        self.stats['requests'] = sum(counters['requests'].values()) - self._requests
+        self.stats['bytes'] = sum(counters['response_bytes'].values()) - self._bytes
+        return self.stats
+
+
+def _pipeline(fetch, items, task):
+    """Run fetch(item) on the worker's fetch threads, at most 2 per thread buffered ahead of the
+    caller; yields (item, result) as they complete and records failures in the task stats"""
+    def timed(item):
+        started = time.perf_counter()
+        result = fetch(item)
+        return result, time.perf_counter() - started
+
+    for item, (result, seconds) in map_bounded(timed, items, _worker['fetch_threads'],
+                                               on_error=lambda item, e: task.stats['errors'].append((item, repr(e)))):
+        task.stats['fetch_seconds'] += seconds
+        yield item, result
+
+
+def _export_games(season, part, game_ids, datasets, collect_players):
+    """Worker task: fetch and flatten a chunk of games into one part file per dataset"""
+    client = _worker['client']
+    methods = sorted({GAME_DATASETS[dataset][0] for dataset in datasets} | ({'get_boxscore'} if collect_players else set()))
+    task = _Task(season, part, datasets)
+    player_ids = set()
+
+    def fetch(game_id):
+        game = Game(game_id, client=client)
+        return {method: getattr(game, method)() for method in methods}
+
+    for _game_id, payloads in _pipeline(fetch, game_ids, task):
+        started = time.perf_counter()
+        for dataset in datasets:
+            method, flatten = GAME_DATASETS[dataset]
+            task.add(dataset, flatten(payloads[method]))
+        if collect_players:
+            for team in (payloads['get_boxscore'].get('playerByGameStats') or {}).values():
+                player_ids.update(player['playerId'] for group in team.values() for player in group)
+        del payloads
+        task.stats['games'] += 1
+        task.stats['flatten_seconds'] += time.perf_counter() - started
+    stats = task.close()
+    stats['player_ids'] = sorted(player_ids)
+    return stats
+
+
+def _export_game_logs(season, part, player_ids, game_types):
+    """Worker task: fetch and flatten the game logs of a chunk of players"""
+    client = _worker['client']
+    task = _Task(season, part, ['game_logs'])
+    tasks = [(player_id, game_type) for player_id in player_ids for game_type in game_types]
+    for (player_id, _game_type), game_log in _pipeline(lambda item: Player(item[0], client=client).get_game_log(season, item[1]), tasks, task):
+        started = time.perf_counter()
+        task.add('game_logs', game_log_table(game_log, player_id))
+        task.stats['flatten_seconds'] += time.perf_counter() - started
+    task.stats['players'] = len(player_ids)
+    return task.close()
+
+
+def _export_standings(season):
+    """Worker task: the season's daily standings as one part file"""
+    task = _Task(season, 0, ['standings'])
+    started = time.perf_counter()
+    try:
+        history = StandingsHistory.build(season=season, client=_worker['client'], max_workers=_worker['fetch_threads'])
+    except Exception as e:
+        task.stats['errors'].append((f"standings {season}", repr(e)))
+        return task.close()
+    task.stats['fetch_seconds'] += time.perf_counter() - started
+    started = time.perf_counter()
+    table = history.to_table()
+    task.stats['flatten_seconds'] += time.perf_counter() - started
+    task.add('standings', table)
+    return task.close()
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def export(seasons, out, datasets=DATASETS, file_format='parquet', game_types=(2, 3), processes=None, chunk_size=50,
+           fetch_threads=8, batch_rows=100000, memory_limit_mb=None, client=None, base_urls=None, progress=None,
+           progress_interval=5):
+    """Export seasons to partitioned Parquet / CSV on a process pool
+
+    Args:
+        seasons (iterable of int): Season IDs in YYYYYYYY format
+        out (str): Output directory
+        datasets (iterable of str, optional): Any of DATASETS. Defaults to all.
+        file_format (str, optional): 'parquet' (needs pyarrow) or 'csv'. Defaults to 'parquet'.
+        game_types (tuple, optional): Game types to export. Defaults to (2, 3).
+        processes (int, optional): Worker processes. Defaults to os.cpu_count().
+        chunk_size (int, optional): Games (or players) per task and part file. Defaults to 50.
+        fetch_threads (int, optional): Concurrent requests per worker. Defaults to 8.
+        batch_rows (int, optional): Rows a worker buffers per dataset before writing. Defaults to 100000.
+        memory_limit_mb (int, optional): Write buffered rows out every batch_rows / 10 rows while a
+            worker's RSS exceeds this
+        client (Nhl, optional): Client used to enumerate the games. Defaults to Nhl().
+        base_urls (dict, optional): base_urls for the workers' Nhl clients
+        progress (callable, optional): Called with the ExportStats every `progress_interval` seconds
+        progress_interval (float, optional): Seconds between progress reports. Defaults to 5.
+
+    Returns:
+        ExportStats
+    """
+    datasets = list(datasets)
+    unknown = set(datasets) - set(DATASETS)
+    if unknown:
+        raise ValueError(f"Unknown datasets: {sorted(unknown)}. Choose from {list(DATASETS)}")
+    if file_format not in FORMATS:
+        raise ValueError(f"file_format must be one of {', '.join(repr(f) for f in FORMATS)}. You provided: {file_format}")
+    client = client if client is not None else (Nhl(base_urls=base_urls) if base_urls else Nhl())
+    game_datasets = [dataset for dataset in datasets if dataset in GAME_DATASETS]
+    with_game_logs = 'game_logs' in datasets
+    stats = ExportStats()
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(out, file_format, fetch_threads, batch_rows, memory_limit_mb, base_urls)) as executor:
+        pending = {}
+        remaining = {}        # season -> game chunks not yet done
+        season_players = {}   # season -> player ids seen in its boxscores
+        for season in seasons:
+            if 'standings' in datasets:
+                pending[executor.submit(_export_standings, season)] = ('standings', season, 0)
+            if game_datasets or with_game_logs:
+                chunks = _chunks(season_game_ids(season, game_types=game_types, client=client), chunk_size)
+                remaining[season] = len(chunks)
+                season_players[season] = set()
+                for part, game_ids in enumerate(chunks):
+                    future = executor.submit(_export_games, season, part, game_ids, game_datasets, with_game_logs)
+                    pending[future] = ('games', season, part)
+
+        last_report = time.monotonic()
+        while pending:
+            finished, _ = wait(pending, timeout=progress_interval, return_when=FIRST_COMPLETED)
+            for future in finished:
+                kind, season, part = pending.pop(future)
+                try:
+                    task = future.result()
+                except Exception as e:  # the task raised, or its worker died
+                    stats.errors.append((f"{kind} {season} part {part}", repr(e)))
+                    task = None
+                else:
+                    stats.add(task)
+                if kind != 'games':
+                    continue
+                if task is not None:
+                    season_players[season].update(task['player_ids'])
+                remaining[season] -= 1
+                if remaining[season] == 0 and with_game_logs:
+                    # every boxscore of the season is in (or failed): fan the season's players out
+                    for part, player_ids in enumerate(_chunks(sorted(season_players.pop(season)), chunk_size)):
+                        try:
+                            future = executor.submit(_export_game_logs, season, part, player_ids, game_types)
+                        except BrokenProcessPool as e:
+                            stats.errors.append((f"game_logs {season} part {part}", repr(e)))
+                            continue
+                        pending[future] = ('game_logs', season, part)
+            if progress and time.monotonic() - last_report >= progress_interval:
+                progress(stats)
+                last_report = time.monotonic()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m nhl_api export', description="Export seasons to partitioned Parquet / CSV")
+    parser.add_argument('seasons', nargs='+', type=int, help="Season IDs in YYYYYYYY format")
+    parser.add_argument('--out', default='nhl_export', help="Output directory")
+    parser.add_argument('--format', choices=FORMATS, default='parquet')
+    parser.add_argument('--datasets', nargs='+', choices=DATASETS, default=list(DATASETS))
+    parser.add_argument('--game-types', nargs='+', type=int, default=[2, 3])
+    parser.add_argument('--processes', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=50, help="Games or players per task / part file")
+    parser.add_argument('--fetch-threads', type=int, default=8, help="Concurrent requests per worker")
+    parser.add_argument('--batch-rows', type=int, default=100000, help="Rows buffered per dataset before writing")
+    parser.add_argument('--memory-limit-mb', type=int, help="Per-worker RSS above which buffered rows are written out")
+    args = parser.parse_args(argv)
+
+    stats = export(args.seasons, args.out, datasets=args.datasets, file_format=args.format, game_types=tuple(args.game_types),
+                   processes=args.processes, chunk_size=args.chunk_size, fetch_threads=args.fetch_threads,
+                   batch_rows=args.batch_rows, memory_limit_mb=args.memory_limit_mb, progress=lambda stats: print(stats, '\n'))
+    print(stats)
+    return 1 if stats.errors else 0
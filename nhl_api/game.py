@@ -1,4 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from nhl_api.nhl import Nhl
+from nhl_api.pool import map_bounded
+
+# Endpoint name (the namespaces of get_details; file names and keys of backfill, store and
+# archive) -> Game method, in get_all_details merge order
+DETAIL_SOURCES = {
+    'play-by-play': 'get_play_by_play',
+    'landing': 'get_landing',
+    'boxscore': 'get_boxscore',
+    'meta': 'get_game_info',
+    'shiftcharts': 'get_shift_charts',
+}
+
+# Game methods whose responses make up get_all_details, in merge order
+DETAIL_METHODS = tuple(DETAIL_SOURCES.values())
+
+_GAMECENTER = ('play-by-play', 'landing', 'boxscore')
+
+# Section -> (endpoints providing it, preferred first; its key in their payloads)
+DETAIL_SECTIONS = {
+    'plays': (('play-by-play',), 'plays'),
+    'rosterSpots': (('play-by-play',), 'rosterSpots'),
+    'playerByGameStats': (('boxscore',), 'playerByGameStats'),
+    'shifts': (('shiftcharts',), 'data'),
+    'seasonStates': (('meta',), 'seasonStates'),
+    'teams': (('meta',), 'teams'),
+    'summary': (('landing', 'boxscore', 'play-by-play'), 'summary'),
+    'gameOutcome': (('play-by-play', 'boxscore'), 'gameOutcome'),
+    'venueTimezone': (('landing',), 'venueTimezone'),
+    **{key: (_GAMECENTER, key) for key in (
+        'id', 'season', 'gameType', 'gameDate', 'venue', 'venueLocation', 'startTimeUTC', 'gameState',
+        'gameScheduleState', 'periodDescriptor', 'awayTeam', 'homeTeam', 'clock', 'regPeriods')},
+}
+
+# Keys only used to render a page (images, video, broadcasts, links), dropped by lean projections
+DISPLAY_FIELDS = frozenset({
+    'logo', 'darkLogo', 'teamLogo', 'headshot', 'heroImage', 'tvBroadcasts', 'gameVideo', 'hexValue',
+    'threeMinRecap', 'threeMinRecapFr', 'condensedGame', 'condensedGameFr',
+})
+DISPLAY_SUFFIXES = ('Link', 'LinkFr', 'Url', 'UrlFr', 'Clip', 'ClipFr', 'ClipId', 'ClipIdFr')
+
+
+def detail_sources(sections):
+    """Plan the fewest endpoints providing `sections`
+
+    Args:
+        sections (iterable of str): Keys of DETAIL_SECTIONS, optionally prefixed with the
+            endpoint to take them from (e.g. 'boxscore.summary')
+
+    Returns:
+        {endpoint: {section: payload key}}
+    """
+    requested = []
+    for section in sections:
+        endpoint, _, name = section.rpartition('.')
+        if name not in DETAIL_SECTIONS:
+            raise ValueError(f"Unknown section: {name}. Choose from {list(DETAIL_SECTIONS)}")
+        sources, key = DETAIL_SECTIONS[name]
+        if endpoint:
+            if endpoint not in sources:
+                raise ValueError(f"{name} is provided by {list(sources)}, not {endpoint}")
+            sources = (endpoint,)
+        requested.append((name, sources, key))
+    plan = {}
+    # Sections with a single source first, so shared sections reuse an endpoint that is fetched anyway
+    for name, sources, key in sorted(requested, key=lambda section: len(section[1])):
+        endpoint = next((source for source in sources if source in plan), sources[0])
+        plan.setdefault(endpoint, {})[name] = key
+    return plan
+
+
+def strip_display_fields(value):
+    """Copy of a payload without DISPLAY_FIELDS / DISPLAY_SUFFIXES keys, at any depth"""
+    if isinstance(value, dict):
+        return {key: strip_display_fields(item) for key, item in value.items()
+                if key not in DISPLAY_FIELDS and not key.endswith(DISPLAY_SUFFIXES)}
+    if isinstance(value, list):
+        return [strip_display_fields(item) for item in value]
+    return value
+
 
 class Game:
     """Represents an NHL game.
@@ -6,6 +87,7 @@ class Game:
     Attributes:
         game_id (int): The ID of the game (example: 2023020204)
         nhl_client (Nhl): An instance of the Nhl class used for making API requests.
+            Pass one in as `client` to share its pooled connections across many Game objects.
 
     Methods:
         get_play_by_play(): Retrieve play-by-play information
@@ -13,28 +95,109 @@ class Game:
         get_boxscore(): Retrieve boxscore information
         get_game_info(): Retrieve high level info (season info & teams)
         get_all_details(): Get superset of play-by-play, landing, and boxscore details
+        get_details(): Get only some sections, namespaced by endpoint
+        get_all_details_many(): Get all details for many games concurrently
+        follow(): Follow the game live, yielding only what changed
     """
-    def __init__(self, game_id):
+    def __init__(self, game_id, client=None):
         self.game_id = game_id
-        self.nhl_client = Nhl()
+        self.nhl_client = client if client is not None else Nhl()
 
-    def get_all_details(self):
+    def get_all_details(self, max_workers=5):
         """Get superset of play-by-play, landing, and boxscore details
+
+        The underlying requests are independent, so they run concurrently on a thread pool.
+
+        Args:
+            max_workers (int, optional): Maximum number of concurrent requests. Defaults to 5.
         """
-        play_by_play = self.get_play_by_play()
-        landing = self.get_landing()
-        boxscore = self.get_boxscore()
-        game_info = self.get_game_info()
-        shift_charts = self.get_shift_charts()
-        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(getattr(self, method)) for method in DETAIL_METHODS]
+            return self._merge_details([future.result() for future in futures])
+
+    def get_details(self, sections, lean=True, max_workers=5):
+        """Get only the sections needed, fetching only the endpoints that provide them
+
+        Unlike get_all_details nothing is merged: each section is kept under the endpoint it
+        came from, so e.g. the landing and boxscore summaries never overwrite each other.
+
+        Args:
+            sections (iterable of str): Keys of DETAIL_SECTIONS (e.g. 'plays', 'rosterSpots',
+                'playerByGameStats', 'shifts'), optionally as 'endpoint.section'
+            lean (bool, optional): Drop display-only fields (logos, broadcasts, links). Defaults to True.
+            max_workers (int, optional): Maximum number of concurrent requests. Defaults to 5.
+
+        Returns:
+            {endpoint: {section: value}}, e.g. {'play-by-play': {'plays': [...]}, 'shiftcharts': {'shifts': [...]}}
+        """
+        plan = detail_sources(sections)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(getattr(self, DETAIL_SOURCES[endpoint])) for endpoint in plan]
+            return self._project(plan, [future.result() for future in futures], lean)
+
+    @classmethod
+    def get_all_details_many(cls, game_ids, max_workers=10, client=None, sections=None, lean=True):
+        """Get all details (see get_all_details) for many games through one shared thread pool
+
+        Every (game, endpoint) request is a task of its own, so at most `max_workers` requests
+        are in flight at once, spread over the endpoints of the next few games. A game is
+        yielded as soon as its last endpoint arrives, so the order may differ from `game_ids`.
+        For best connection reuse, give `client` a Transport with pool_size >= max_workers.
+
+        Args:
+            game_ids (iterable of int): Game IDs
+            max_workers (int, optional): Maximum number of concurrent requests. Defaults to 10.
+            client (Nhl, optional): Client shared by every game. Defaults to Nhl().
+            sections (iterable of str, optional): Project each game like get_details instead of
+                merging every endpoint
+            lean (bool, optional): With sections, drop display-only fields. Defaults to True.
+
+        Yields:
+            tuple: (game_id, all_details dictionary) - or (game_id, get_details dictionary) with sections
+        """
+        client = client if client is not None else Nhl()
+        plan = detail_sources(sections) if sections is not None else None
+        methods = DETAIL_METHODS if plan is None else [DETAIL_SOURCES[endpoint] for endpoint in plan]
+
+        def fetch(request):
+            _position, game_id, index = request
+            return getattr(cls(game_id, client=client), methods[index])()
+
+        requests = ((position, game_id, index) for position, game_id in enumerate(game_ids) for index in range(len(methods)))
+        partial = {}  # position in game_ids -> [results in methods order, endpoints still pending]
+        for (position, game_id, index), result in map_bounded(fetch, requests, max_workers, queued=1):
+            parts = partial.setdefault(position, [[None] * len(methods), len(methods)])
+            parts[0][index] = result
+            parts[1] -= 1
+            if parts[1] == 0:
+                results = partial.pop(position)[0]
+                yield game_id, cls._merge_details(results) if plan is None else cls._project(plan, results, lean)
+
+    def follow(self, **kwargs):
+        """Follow the game live, yielding only new/corrected plays and clock, score and state changes
+
+        Polls adaptively and stops once the game is final. See nhl_api.live.LiveGame for options.
+
+        Returns:
+            LiveGame - iterate it to receive LiveEvent(kind, game_id, data) tuples
+        """
+        from nhl_api.live import LiveGame
+        return LiveGame(self.game_id, client=self.nhl_client, **kwargs)
+
+    @staticmethod
+    def _merge_details(results):
         all_details = dict()
-        all_details.update(play_by_play)
-        all_details.update(landing)
-        all_details.update(boxscore)
-        all_details.update(game_info)
-        all_details.update(shift_charts)
-        
+        for result in results:
+            all_details.update(result)
         return all_details
+
+    @staticmethod
+    def _project(plan, results, lean):
+        details = {}
+        for (endpoint, keys), payload in zip(plan.items(), results):
+            details[endpoint] = {section: strip_display_fields(payload[key]) if lean else payload[key]
+                                 for section, key in keys.items() if key in payload}
+        return details
     
     def get_play_by_play(self):
         """Retrieve play-by-play information
@@ -0,0 +1,131 @@
+"""League-wide player game logs for a season, fetched concurrently and streamed to disk
+
+Player ids come either from each club's rosters - the season roster (Team.get_roster) plus
+the players of Team.get_team_stats - or from the boxscores of every game of the season
+(exact for past seasons, one request per game). Every (player,
+game type) game log is then fetched once on a thread pool and appended to a columnar
+table (columnar.GAME_LOG_COLUMNS) that is flushed to Parquet or CSV in batches, so memory
+stays flat however many players are loaded. Give the client a ResponseCache to make
+re-runs cheap.
+
+Example:
+    stats = load_game_logs(20232024, 'game_logs_20232024.parquet', teams=['EDM', 'STL'])
+
+Command line:
+    python -m nhl_api.gamelogs 20232024 --output game_logs_20232024.parquet --source boxscore
+"""
+import argparse
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from nhl_api.backfill import season_game_ids
+from nhl_api.columnar import GAME_LOG_CATEGORICAL, GAME_LOG_COLUMNS, Table, TableWriter, game_log_table
+from nhl_api.game import Game
+from nhl_api.nhl import Nhl
+from nhl_api.player import Player
+from nhl_api.pool import map_bounded
+from nhl_api.schedule import season_teams
+from nhl_api.team import Team
+
+GameLogStats = namedtuple('GameLogStats', ['players', 'requests', 'rows', 'seconds', 'errors'])
+
+
+def roster_player_ids(season, teams=None, game_types=(2, 3), client=None, max_workers=8):
+    """Player ids of the clubs' rosters: everyone on each club's season roster (Team.get_roster)
+    or in its season club stats, fetched concurrently"""
+    client = client if client is not None else Nhl()
+    teams = teams if teams is not None else season_teams(season, client)
+
+    def team_players(tri_code):
+        team = Team.from_tricode(tri_code, client=client)
+        roster = team.get_roster(season)
+        players = {player['id'] for key in ('forwards', 'defensemen', 'goalies') for player in roster.get(key, ())}
+        for game_type in game_types:
+            stats = team.get_team_stats(season=season, game_type=game_type)
+            players.update(player['playerId'] for key in ('skaters', 'goalies') for player in stats.get(key, ()))
+        return players
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return sorted(set().union(*executor.map(team_players, teams)))
+
+
+def boxscore_player_ids(season, teams=None, game_types=(2, 3), client=None, max_workers=8):
+    """Player ids of everyone who dressed in a game of the season (optionally only for some teams)"""
+    client = client if client is not None else Nhl()
+    game_ids = season_game_ids(season, game_types=game_types, client=client)
+    players = set()
+    for _game_id, boxscore in map_bounded(lambda game_id: Game(game_id, client=client).get_boxscore(), game_ids, max_workers):
+        for side in ('awayTeam', 'homeTeam'):
+            if teams is not None and (boxscore.get(side) or {}).get('abbrev') not in teams:
+                continue
+            for group in ((boxscore.get('playerByGameStats') or {}).get(side) or {}).values():
+                players.update(player['playerId'] for player in group)
+    return sorted(players)
+
+
+def load_game_logs(season, path, teams=None, game_types=(2, 3), source='roster', player_ids=None,
+                   client=None, max_workers=16, batch_rows=50000):
+    """Fetch the game logs of every player of a season into one Parquet / CSV file
+
+    Args:
+        season (int): Season ID in YYYYYYYY format
+        path (str): Output file; .parquet (needs pyarrow) or anything else for CSV
+        teams (list of str, optional): Only players of these clubs (tri-codes). Defaults to all.
+        game_types (tuple, optional): Game types to load. Defaults to (2, 3).
+        source (str, optional): Where player ids come from - 'roster' or 'boxscore'. Defaults to 'roster'.
+        player_ids (iterable of int, optional): Use these players instead of deriving them
+        client (Nhl, optional): Client to use. Defaults to Nhl().
+        max_workers (int, optional): Concurrent requests. Defaults to 16.
+        batch_rows (int, optional): Rows buffered before each write. Defaults to 50000.
+
+    Returns:
+        GameLogStats(players, requests, rows, seconds, errors) - errors as [((player_id, game_type), exception)]
+    """
+    client = client if client is not None else Nhl()
+    started = time.monotonic()
+    if player_ids is None:
+        if source == 'roster':
+            player_ids = roster_player_ids(season, teams, game_types, client=client)
+        elif source == 'boxscore':
+            player_ids = boxscore_player_ids(season, teams, game_types, client=client)
+        else:
+            raise ValueError(f"source must be one of 'roster', 'boxscore'. You provided: {source}")
+    player_ids = sorted(set(player_ids))
+    tasks = [(player_id, game_type) for player_id in player_ids for game_type in game_types]
+
+    def fetch(task):
+        player_id, game_type = task
+        return Player(player_id, client=client).get_game_log(season, game_type)
+
+    errors = []
+    with TableWriter(path) as writer:
+        table = Table(GAME_LOG_COLUMNS, GAME_LOG_CATEGORICAL)
+        for (player_id, _game_type), game_log in map_bounded(fetch, tasks, max_workers,
+                                                             on_error=lambda task, e: errors.append((task, e))):
+            table.extend(game_log_table(game_log, player_id))
+            if len(table) >= batch_rows:
+                writer.write(table)
+                table = Table(GAME_LOG_COLUMNS, GAME_LOG_CATEGORICAL)
+        writer.write(table)
+    return GameLogStats(len(player_ids), len(tasks), writer.rows, time.monotonic() - started, errors)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m nhl_api.gamelogs', description="Load a season of player game logs")
+    parser.add_argument('season', type=int, help="Season ID in YYYYYYYY format")
+    parser.add_argument('--output', help="Output file, .parquet or .csv (default: game_logs_<season>.csv)")
+    parser.add_argument('--teams', nargs='+', help="Only these clubs (tri-codes)")
+    parser.add_argument('--game-types', nargs='+', type=int, default=[2, 3])
+    parser.add_argument('--source', choices=['roster', 'boxscore'], default='roster')
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args(argv)
+
+    stats = load_game_logs(args.season, args.output or f"game_logs_{args.season}.csv", teams=args.teams,
+                           game_types=tuple(args.game_types), source=args.source, max_workers=args.workers)
+    print(f"{stats.players} players, {stats.requests} requests, {stats.rows} rows in {stats.seconds:.1f}s"
+          f" ({stats.requests / max(stats.seconds, 1e-9):.0f} req/s), {len(stats.errors)} failed")
+
+
+if __name__ == '__main__':
+    main()
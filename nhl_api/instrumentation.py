@@ -0,0 +1,313 @@
+"""Request instrumentation: hooks, timing spans, per-endpoint-family metrics and sinks
+
+Every Nhl.get_url call produces a RequestRecord with its outcome and timings, split into
+connect (DNS + TCP + TLS, zero on a reused connection), ttfb (request sent -> response
+headers, i.e. server time plus a round trip), download (body) and decode (JSON parsing).
+With an Instrumentation attached to the client, each record
+    - is passed to `before_request` hooks before anything is sent, and to `after_request`
+      hooks once it completes,
+    - updates Metrics: counters (calls, bytes, cache hits, coalesced calls, 304s, retries, errors) and latency
+      histograms per endpoint family - the endpoint with ids, seasons, dates and team codes
+      replaced by placeholders, e.g. /v1/gamecenter/{id}/play-by-play,
+    - is emitted to every sink. LoggingSink logs one line per request; PrometheusSink writes
+      the metrics in Prometheus text format for node_exporter's textfile collector.
+      A sink is any object with emit(record, metrics); an optional flush(metrics) is called by
+      Instrumentation.flush().
+
+Example:
+    instrumentation = Instrumentation(sinks=[LoggingSink(), PrometheusSink('/var/lib/node_exporter/nhl_api.prom')])
+    instrumentation.after_request.append(lambda record: record.total > 2 and print('slow:', record.url))
+    client = Nhl(instrumentation=instrumentation)
+    ...
+    print(instrumentation.prometheus())
+"""
+import bisect
+import functools
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PHASES = ('total', 'connect', 'ttfb', 'download', 'decode')
+
+# Counter name -> help text; values are per endpoint family
+COUNTERS = {
+    'requests': "get_url calls",
+    'response_bytes': "Response body bytes received from the network",
+    'cache_hits': "Calls answered by the ResponseCache",
+    'coalesced': "Calls that shared an identical in-flight request",
+    'not_modified': "Conditional requests answered 304 Not Modified",
+    'retries': "Retried attempts",
+    'errors': "Calls that raised",
+}
+
+_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_SEASON = re.compile(r'^\d{8}$')
+_TEAM = re.compile(r'^[A-Z]{3}$')
+
+
+@functools.lru_cache(maxsize=4096)
+def endpoint_family(endpoint):
+    """Collapse the variable parts of an endpoint ('/v1/player/8478402/game-log/20232024/2'
+    -> '/v1/player/{id}/game-log/{season}/{id}') so metrics aggregate over the same API call"""
+    segments = endpoint.split('?', 1)[0].strip('/').split('/')
+    for i, segment in enumerate(segments):
+        if _SEASON.match(segment) and segment.startswith(('19', '20')):
+            segments[i] = '{season}'
+        elif segment.isdigit():
+            segments[i] = '{id}'
+        elif _DATE.match(segment):
+            segments[i] = '{date}'
+        elif _TEAM.match(segment):
+            segments[i] = '{team}'
+        elif i == 0 and segment in ('en', 'fr'):
+            segments[i] = '{lang}'  # stats API language prefix
+    return '/' + '/'.join(segments)
+
+
+class RequestRecord:
+    """Outcome and timings of one get_url call (timings in seconds; None when not measured)"""
+    __slots__ = (
+        'endpoint', 'base_url_type', 'params', 'url', 'status', 'bytes', 'cache_hit', 'coalesced', 'not_modified',
+        'attempts', 'error', 'started', 'connect', 'ttfb', 'download', 'decode', 'total',
+    )
+
+    def __init__(self, endpoint, base_url_type='default', params=None):
+        self.endpoint = endpoint
+        self.base_url_type = base_url_type
+        self.params = params
+        self.url = None
+        self.status = None
+        self.bytes = 0
+        self.cache_hit = False
+        self.coalesced = False
+        self.not_modified = False
+        self.attempts = 0
+        self.error = None
+        self.started = time.perf_counter()
+        self.connect = self.ttfb = self.download = self.decode = self.total = None
+
+    @property
+    def family(self):
+        return endpoint_family(self.endpoint)
+
+    @property
+    def retries(self):
+        return max(0, self.attempts - 1)
+
+    def __repr__(self):
+        fields = ', '.join(f"{attr}={getattr(self, attr)!r}" for attr in self.__slots__)
+        return f"RequestRecord({fields})"
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)"""
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """[(upper bound, cumulative count)], ending with (inf, count)"""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """Estimate a quantile (0-1) as the upper bound of the bucket holding it"""
+        if not self.count:
+            return None
+        for bound, total in self.cumulative():
+            if total >= q * self.count:
+                return bound
+
+
+class Metrics:
+    """Thread-safe counters and per-phase latency histograms, keyed by endpoint family"""
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counters = {name: defaultdict(int) for name in COUNTERS}
+        self.histograms = {}  # (family, phase) -> Histogram
+        self._lock = threading.Lock()
+
+    def observe(self, record):
+        family = record.family
+        with self._lock:
+            self.counters['requests'][family] += 1
+            self.counters['response_bytes'][family] += record.bytes
+            self.counters['cache_hits'][family] += record.cache_hit
+            self.counters['coalesced'][family] += record.coalesced
+            self.counters['not_modified'][family] += record.not_modified
+            self.counters['retries'][family] += record.retries
+            self.counters['errors'][family] += record.error is not None
+            for phase in PHASES:
+                value = getattr(record, phase)
+                if value is not None:
+                    histogram = self.histograms.get((family, phase))
+                    if histogram is None:
+                        histogram = self.histograms[family, phase] = Histogram(self.buckets)
+                    histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self.counters = {name: defaultdict(int) for name in COUNTERS}
+            self.histograms = {}
+
+    def summary(self):
+        """{family: {counter: value, ..., 'p50': s, 'p99': s}} - quick look without a sink"""
+        with self._lock:
+            result = defaultdict(dict)
+            for name, values in self.counters.items():
+                for family, value in values.items():
+                    result[family][name] = value
+            for (family, phase), histogram in self.histograms.items():
+                if phase == 'total':
+                    result[family]['p50'] = histogram.quantile(0.5)
+                    result[family]['p99'] = histogram.quantile(0.99)
+            return dict(result)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _bound(value):
+    return '+Inf' if value == float('inf') else repr(value)
+
+
+def prometheus_text(metrics, prefix='nhl_api'):
+    """Render Metrics in the Prometheus text exposition format"""
+    lines = []
+    with metrics._lock:
+        for name, help_text in COUNTERS.items():
+            lines.append(f"# HELP {prefix}_{name}_total {help_text}")
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            for family, value in sorted(metrics.counters[name].items()):
+                lines.append(f'{prefix}_{name}_total{{family="{_label(family)}"}} {value}')
+        name = f"{prefix}_request_duration_seconds"
+        lines.append(f"# HELP {name} get_url latency by phase (total, connect, ttfb, download, decode)")
+        lines.append(f"# TYPE {name} histogram")
+        for (family, phase), histogram in sorted(metrics.histograms.items()):
+            labels = f'family="{_label(family)}",phase="{phase}"'
+            for bound, count in histogram.cumulative():
+                lines.append(f'{name}_bucket{{{labels},le="{_bound(bound)}"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return '\n'.join(lines) + '\n'
+
+
+class LoggingSink:
+    """Logs one line per request - errors at WARNING, everything else at `level`
+
+    Args:
+        logger (logging.Logger, optional): Defaults to the 'nhl_api' logger.
+        level (int, optional): Level for successful requests. Defaults to logging.DEBUG.
+    """
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger if logger is not None else logging.getLogger('nhl_api')
+        self.level = level
+
+    def emit(self, record, metrics=None):
+        level = logging.WARNING if record.error is not None else self.level
+        if not self.logger.isEnabledFor(level):
+            return
+        spans = ' '.join(f"{phase}={getattr(record, phase) * 1000:.1f}ms" for phase in PHASES
+                         if getattr(record, phase) is not None)
+        if record.cache_hit:
+            source = 'cache'
+        elif record.coalesced:
+            source = 'coalesced'
+        else:
+            source = '304' if record.not_modified else record.status
+        self.logger.log(level, "GET %s %s %dB retries=%d %s%s", record.url or record.endpoint, source, record.bytes,
+                        record.retries, spans, f" error={record.error}" if record.error else '')
+
+
+class PrometheusSink:
+    """Writes the metrics to a file in Prometheus text format, at most every `interval` seconds
+
+    The file is replaced atomically, as node_exporter's textfile collector expects.
+
+    Args:
+        path (str): Output file, conventionally ending in .prom
+        interval (float, optional): Minimum seconds between writes. Defaults to 15.
+        prefix (str, optional): Metric name prefix. Defaults to 'nhl_api'.
+    """
+    def __init__(self, path, interval=15, prefix='nhl_api'):
+        self.path = path
+        self.interval = interval
+        self.prefix = prefix
+        self._written = 0.0
+        self._lock = threading.Lock()
+
+    def emit(self, record, metrics):
+        if time.monotonic() - self._written >= self.interval:
+            self.flush(metrics)
+
+    def flush(self, metrics):
+        with self._lock:
+            self._written = time.monotonic()
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                f.write(prometheus_text(metrics, self.prefix))
+            os.replace(tmp_path, self.path)
+
+
+class Instrumentation:
+    """Hooks, metrics and sinks for the requests of one or more clients
+
+    Args:
+        sinks (list, optional): Objects with emit(record, metrics), called after every request
+        buckets (tuple, optional): Histogram bucket bounds in seconds. Defaults to DEFAULT_BUCKETS.
+
+    Attributes:
+        before_request (list): Callables taking a RequestRecord, called before each request
+        after_request (list): Callables taking the completed RequestRecord
+        metrics (Metrics): Aggregated counters and histograms
+    """
+    def __init__(self, sinks=None, buckets=DEFAULT_BUCKETS):
+        self.sinks = list(sinks or ())
+        self.before_request = []
+        self.after_request = []
+        self.metrics = Metrics(buckets)
+
+    def start(self, record):
+        for hook in self.before_request:
+            hook(record)
+
+    def finish(self, record):
+        record.total = time.perf_counter() - record.started
+        self.metrics.observe(record)
+        for hook in self.after_request:
+            hook(record)
+        for sink in self.sinks:
+            sink.emit(record, self.metrics)
+
+    def flush(self):
+        """Flush sinks that buffer (e.g. write the PrometheusSink file now)"""
+        for sink in self.sinks:
+            flush = getattr(sink, 'flush', None)
+            if flush is not None:
+                flush(self.metrics)
+
+    def prometheus(self, prefix='nhl_api'):
+        """Current metrics in Prometheus text format (e.g. to serve from a /metrics handler)"""
+        return prometheus_text(self.metrics, prefix)
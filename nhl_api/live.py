@@ -0,0 +1,195 @@
+"""Live play-by-play tracking that emits only what changed
+
+LiveGame polls one game's play-by-play and turns each response into LiveEvents: new plays,
+corrected plays, clock, score and gameState changes. It polls faster while the clock runs,
+slower during stoppages and intermissions, and stops once the game is final.
+LivePoller multiplexes many LiveGames (e.g. tonight's slate) over one polling loop.
+
+Use a client built with Nhl(conditional=True) so unchanged polls cost a 304 and no parsing.
+
+Example:
+    client = Nhl(conditional=True)
+    for event in Game(2023021104, client=client).follow():
+        print(event.kind, event.data)
+
+    for event in LivePoller.for_date('2024-03-21', client=client):
+        ...
+"""
+import bisect
+import heapq
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from nhl_api.cache import FINAL_GAME_STATES
+from nhl_api.game import Game
+from nhl_api.nhl import Nhl
+from nhl_api.scheduler import RetryPolicy
+
+# kind is one of 'play', 'correction', 'clock', 'score', 'state', and for LivePoller 'error'
+# (data is the exception a poll raised)
+LiveEvent = namedtuple('LiveEvent', ['kind', 'game_id', 'data'])
+
+PREGAME_STATES = ('FUT', 'PRE')
+
+# Seconds between polls, by game situation
+POLL_INTERVALS = {
+    'running': 5,
+    'stoppage': 10,
+    'intermission': 30,
+    'pregame': 60,
+}
+
+
+class LiveGame:
+    """Follows one game, yielding only new or changed information
+
+    Args:
+        game_id (int): Game ID
+        client (Nhl, optional): Client to poll with. Defaults to Nhl().
+        intervals (dict, optional): Overrides for POLL_INTERVALS
+        correction_window (int, optional): How many of the most recent known plays are re-compared
+            on each poll to detect corrections; None compares all of them. Defaults to 50.
+    """
+    def __init__(self, game_id, client=None, intervals=None, correction_window=50):
+        self.game = Game(game_id, client=client)
+        self.game_id = game_id
+        self.intervals = dict(POLL_INTERVALS, **(intervals or {}))
+        self.correction_window = correction_window
+        self.plays = []  # known plays, ordered by sortOrder
+        self.sort_orders = []
+        self.game_state = None
+        self.clock = None
+        self.score = None
+
+    @property
+    def done(self):
+        return self.game_state in FINAL_GAME_STATES
+
+    def next_delay(self):
+        """Seconds to wait before the next poll"""
+        if self.game_state is None:
+            return 0
+        if self.game_state in PREGAME_STATES:
+            return self.intervals['pregame']
+        clock = self.clock or {}
+        if clock.get('inIntermission'):
+            return self.intervals['intermission']
+        if clock.get('running'):
+            return self.intervals['running']
+        return self.intervals['stoppage']
+
+    def poll(self):
+        """Fetch the play-by-play once and return the list of LiveEvents since the previous poll"""
+        payload = self.game.get_play_by_play()
+        if not self.game.nhl_client.last_changed and self.game_state is not None:
+            return []
+        return self.update(payload)
+
+    def update(self, payload):
+        """Diff a play-by-play payload against what is already known; returns LiveEvents"""
+        events = []
+        plays = sorted(payload.get('plays', ()), key=lambda play: play['sortOrder'])
+        last_sort_order = self.sort_orders[-1] if self.sort_orders else None
+
+        if self.plays:
+            window_start = 0 if self.correction_window is None else max(0, len(self.plays) - self.correction_window)
+            known = {play['eventId']: play for play in self.plays[window_start:]}
+            first_new = bisect.bisect_right(plays, last_sort_order, key=lambda play: play['sortOrder'])
+            lookback = bisect.bisect_left(plays, self.sort_orders[window_start], key=lambda play: play['sortOrder'])
+            for play in plays[lookback:first_new]:
+                previous = known.get(play['eventId'])
+                if previous is not None and previous != play:
+                    events.append(LiveEvent('correction', self.game_id, play))
+        else:
+            first_new = 0
+        events.extend(LiveEvent('play', self.game_id, play) for play in plays[first_new:])
+        self.plays = plays
+        self.sort_orders = [play['sortOrder'] for play in plays]
+
+        clock = payload.get('clock')
+        if clock is not None and clock != self.clock:
+            self.clock = clock
+            events.append(LiveEvent('clock', self.game_id, clock))
+        score = {
+            'away': (payload.get('awayTeam') or {}).get('score'),
+            'home': (payload.get('homeTeam') or {}).get('score'),
+        }
+        if score != self.score:
+            self.score = score
+            events.append(LiveEvent('score', self.game_id, score))
+        game_state = payload.get('gameState')
+        if game_state != self.game_state:
+            self.game_state = game_state
+            events.append(LiveEvent('state', self.game_id, game_state))
+        return events
+
+    def __iter__(self):
+        while True:
+            yield from self.poll()
+            if self.done:
+                return
+            time.sleep(self.next_delay())
+
+
+class LivePoller:
+    """Polls many games from one loop, each on its own adaptive schedule
+
+    Games are kept in a heap ordered by when they are next due; due games are polled
+    concurrently on a small thread pool. Iterating yields LiveEvents from every game until
+    all of them are final. A failed poll does not stop the others: it is yielded as an
+    'error' event and that game is polled again after a backoff that grows with each
+    consecutive failure, until it has failed `max_failures` times in a row.
+
+    Args:
+        game_ids (iterable of int): Games to follow
+        client (Nhl, optional): Client shared by every game. Defaults to Nhl(conditional=True).
+        max_workers (int, optional): Maximum concurrent polls. Defaults to 4.
+        retry (RetryPolicy, optional): Backoff between the polls of a failing game. Defaults to RetryPolicy().
+        max_failures (int, optional): Consecutive failed polls after which a game is dropped;
+            None never drops it. Defaults to 10.
+        **live_game_kwargs: Passed to each LiveGame (intervals, correction_window)
+    """
+    def __init__(self, game_ids, client=None, max_workers=4, retry=None, max_failures=10, **live_game_kwargs):
+        self.client = client if client is not None else Nhl(conditional=True)
+        self.games = [LiveGame(game_id, client=self.client, **live_game_kwargs) for game_id in game_ids]
+        self.max_workers = max_workers
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.max_failures = max_failures
+
+    @classmethod
+    def for_date(cls, date=None, client=None, **kwargs):
+        """Follow every game scheduled on a date (YYYY-MM-DD, defaults to today)"""
+        client = client if client is not None else Nhl(conditional=True)
+        game_week = client.get_schedule(date)['gameWeek']
+        day = next((day for day in game_week if date is None or day['date'] == date), {'games': []})
+        return cls([game['id'] for game in day['games']], client=client, **kwargs)
+
+    def __iter__(self):
+        due = [(time.monotonic(), index) for index in range(len(self.games))]
+        heapq.heapify(due)
+        failures = {}  # game index -> consecutive failed polls
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while due:
+                wait = due[0][0] - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                now = time.monotonic()
+                batch = []
+                while due and due[0][0] <= now:
+                    batch.append(heapq.heappop(due)[1])
+                polls = [(index, executor.submit(self.games[index].poll)) for index in batch]
+                for index, poll in polls:
+                    game = self.games[index]
+                    try:
+                        events = poll.result()
+                    except Exception as e:
+                        failures[index] = failures.get(index, 0) + 1
+                        yield LiveEvent('error', game.game_id, e)
+                        if self.max_failures is None or failures[index] < self.max_failures:
+                            heapq.heappush(due, (time.monotonic() + self.retry.delay(failures[index] - 1), index))
+                        continue
+                    failures.pop(index, None)
+                    yield from events
+                    if not game.done:
+                        heapq.heappush(due, (time.monotonic() + game.next_delay(), index))
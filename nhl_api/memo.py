@@ -0,0 +1,95 @@
+"""Process-wide, thread-safe memoization for slow-changing reference endpoints
+
+Memoized values are shared by every client pointing at the same base URLs, so treat
+them as read-only.
+"""
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+_caches = []
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries also expire `ttl` seconds after being set"""
+    def __init__(self, maxsize=128, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+async def _resolved(value):
+    return value
+
+
+def memoize(ttl, maxsize=128):
+    """Memoize an Nhl method across all instances sharing the same base URLs
+
+    Works for methods of both Nhl and AsyncNhl: when the method returns an awaitable,
+    the awaited value is what gets memoized, and hits are returned as awaitables.
+
+    Args:
+        ttl (float): Seconds before an entry expires
+        maxsize (int, optional): Maximum number of entries kept (least recently used are dropped). Defaults to 128.
+    """
+    def decorator(method):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        _caches.append(cache)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (tuple(sorted(self.base_urls.items())), args, tuple(sorted(kwargs.items())))
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return _resolved(value) if asyncio.iscoroutinefunction(self.get_url) else value
+
+            result = method(self, *args, **kwargs)
+            if inspect.isawaitable(result):
+                async def store():
+                    value = await result
+                    cache.set(key, value)
+                    return value
+                return store()
+            cache.set(key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def clear_memoized():
+    """Drop every memoized value in the process"""
+    for cache in _caches:
+        cache.clear()
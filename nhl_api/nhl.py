@@ -1,30 +1,179 @@
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from nhl_api.conditional import ConditionalCache
+from nhl_api.decoders import get_decoder
+from nhl_api.errors import NhlDecodeError
+from nhl_api.instrumentation import RequestRecord
+from nhl_api.memo import memoize
+from nhl_api.transport import Transport, get_default_transport
+
+def index_teams(all_teams):
+    """Build the get_team_index mapping from a list_team_info response"""
+    by_id = {}
+    by_tricode = {}
+    for team in sorted(all_teams['data'], key=lambda team: team['id']):
+        by_id[team['id']] = team
+        by_tricode[team['triCode']] = team
+    return {'id': by_id, 'triCode': by_tricode}
+
+
+def games_page_params(start, page_size, season=None, game_type=None, start_date=None, end_date=None):
+    """Query parameters of one page of Nhl.iter_games, filtered server-side with cayenneExp"""
+    conditions = []
+    if season is not None:
+        conditions.append(f"season={int(season)}")
+    if game_type is not None:
+        conditions.append(f"gameType={int(game_type)}")
+    if start_date is not None:
+        conditions.append(f'gameDate>="{start_date}"')
+    if end_date is not None:
+        conditions.append(f'gameDate<="{end_date}"')
+    params = {'start': start, 'limit': page_size, 'sort': 'id'}
+    if conditions:
+        params['cayenneExp'] = ' and '.join(conditions)
+    return params
+
 
 class Nhl:
-    def __init__(self):
-        pass
-    
-    def get_url(self, endpoint, response_type='json', base_url_type='default'):
-        if base_url_type == 'default':
-            base_url = "http://api-web.nhle.com"
-        elif base_url_type == 'stats':
-            base_url = "https://api.nhle.com/stats/rest"
-        else:
-            raise ValueError(f"base_url_type must be one of 'default' or 'stats'. You provided: {base_url_type}")
-        
+    """Client for the NHL web API (api-web.nhle.com) and stats API (api.nhle.com/stats/rest).
+
+    Every Nhl instance sends its requests through a Transport, which pools keep-alive
+    connections per base URL. By default all instances share one process-wide Transport;
+    pass `transport` (or transport options) to use a dedicated one.
+
+    Args:
+        transport (Transport, optional): Transport to send requests through
+        cache (ResponseCache, optional): On-disk response cache consulted before every request
+        conditional (bool or ConditionalCache, optional): Send conditional requests (ETag /
+            If-Modified-Since) for polled endpoints; True uses a default ConditionalCache
+        decoder (str or callable, optional): JSON decoder - 'auto' (orjson or msgspec when
+            installed, else json), 'json', 'orjson', 'msgspec' or a callable taking bytes. Defaults to 'auto'.
+        instrumentation (Instrumentation, optional): Receives a RequestRecord (timings, bytes,
+            retries, cache hits, errors) for every get_url call; see nhl_api.instrumentation
+        coalesce (bool or SingleFlight, optional): Let identical concurrent get_url calls share one
+            request and its parsed result. True (the default) shares in-flight calls with every
+            client on the same Transport; pass a SingleFlight to choose the scope, False to disable.
+        **transport_kwargs: Options for a new dedicated Transport (base_urls, pool_size, timeout, headers, scheduler)
+    """
+    def __init__(self, transport=None, cache=None, conditional=None, decoder='auto', instrumentation=None, coalesce=True,
+                 **transport_kwargs):
+        if transport is not None and transport_kwargs:
+            raise ValueError("Pass either transport or transport options, not both")
+        if transport is None:
+            transport = Transport(**transport_kwargs) if transport_kwargs else get_default_transport()
+        self.transport = transport
+        self.cache = cache
+        self.conditional = ConditionalCache() if conditional is True else (conditional or None)
+        self.decode = get_decoder(decoder)
+        self.instrumentation = instrumentation
+        self.inflight = transport.inflight if coalesce is True else (coalesce or None)
+        self._local = threading.local()
+
+    @property
+    def base_urls(self):
+        return self.transport.base_urls
+
+    @property
+    def last_changed(self):
+        """Whether the last get_url call on this thread returned data that differs from the previous
+        response for the same URL (always True unless the endpoint is requested conditionally)"""
+        return getattr(self._local, 'changed', True)
+
+    def get_url(self, endpoint, response_type='json', base_url_type='default', params=None):
+        """Send a GET request to an endpoint and return the parsed response
+
+        Args:
+            endpoint (str): Path appended to the base URL (example: '/v1/season')
+            response_type (str, optional): Either 'json' or 'text'. Defaults to 'json'.
+            base_url_type (str, optional): Either 'default' (api-web.nhle.com) or 'stats' (api.nhle.com/stats/rest). Defaults to 'default'.
+            params (dict, optional): Query string parameters
+
+        Raises:
+            NhlHTTPError (NhlNotFoundError, NhlRateLimitError, NhlServerError) for error statuses,
+            NhlConnectionError for network failures, NhlDecodeError for invalid JSON
+        """
+        if response_type not in ('text', 'json'):
+            raise ValueError(f"response_type must be one of 'text', 'json'. You provided: {response_type}")
+
+        record = RequestRecord(endpoint, base_url_type, params)
+        if self.instrumentation is None:
+            return self._coalesced_get(record, response_type)
+        self.instrumentation.start(record)
         try:
-            r = requests.get(base_url + endpoint)
-            if response_type == 'text':
-                r_parsed = r.text
-            elif response_type == 'json':
-                r_parsed = r.json()
-            else:
-                raise ValueError(f"response_type must be one of 'text', 'json'. You provided: {response_type}")
-            return r_parsed
+            return self._coalesced_get(record, response_type)
         except Exception as e:
-            print(e)
+            record.error = type(e).__name__
+            record.status = getattr(e, 'status_code', record.status)
             raise
+        finally:
+            self.instrumentation.finish(record)
+
+    def _coalesced_get(self, record, response_type):
+        if self.inflight is None:
+            return self._get(record, response_type)
+        # Only clients that parse alike and validate against the same ConditionalCache may share a call
+        key = (self.transport.resolve(record.base_url_type), record.endpoint,
+               tuple(sorted((record.params or {}).items())), response_type, self.decode, self.conditional)
+
+        def lead():
+            result = self._get(record, response_type)
+            return result, self._local.changed
+
+        (result, changed), record.coalesced = self.inflight.do(key, lead)
+        self._local.changed = changed  # a follower saw what the leader saw
+        return result
+
+    def _get(self, record, response_type):
+        endpoint, base_url_type, params = record.endpoint, record.base_url_type, record.params
+
+        def decode(body):
+            start = time.perf_counter()
+            try:
+                return self.decode(body)
+            finally:
+                record.decode = time.perf_counter() - start
+
+        self._local.changed = True
+        if self.cache is not None:
+            base_url = self.transport.resolve(base_url_type)
+            body = self.cache.get(base_url, endpoint, params)
+            if body is not None:
+                record.cache_hit = True
+                return body.decode('utf-8') if response_type == 'text' else decode(body)
+
+        conditional_key = validated = headers = None
+        if self.conditional is not None and self.conditional.applies(endpoint):
+            conditional_key = (base_url_type, endpoint, tuple(sorted((params or {}).items())), response_type)
+            validated = self.conditional.get(conditional_key)
+            headers = validated.headers() if validated is not None else None
+
+        r = self.transport.get(endpoint, base_url_type=base_url_type, params=params, headers=headers, record=record)
+        if r.status_code == 304 and validated is not None:
+            self.conditional.not_modified += 1
+            self._local.changed = False
+            record.not_modified = True
+            return validated.parsed
+
+        def parse():
+            if response_type == 'text':
+                return r.text
+            try:
+                return decode(r.content)
+            except ValueError as e:
+                raise NhlDecodeError(f"Invalid JSON from {r.url}: {e}") from e
+
+        if conditional_key is not None:
+            r_parsed, self._local.changed = self.conditional.update(conditional_key, r, parse)
+        else:
+            r_parsed = parse()
+
+        if self.cache is not None and r.status_code == 200:
+            self.cache.set(base_url, endpoint, params, r.content, r_parsed if response_type == 'json' else None)
+        return r_parsed
     
+    @memoize(ttl=3600)
     def get_schedule_calendar(self, date):
         """Get schedule calendar
         Parameters:
@@ -53,6 +202,21 @@ class Nhl:
         endpoint = "/v1/schedule-calendar/" + date
         return self.get_url(endpoint=endpoint)
 
+    def get_schedule(self, date=None):
+        """Get the league schedule for the week starting on a date
+
+        Parameters:
+            date (str, optional): Date in YYYY-MM-DD format. Defaults to the current week.
+
+        Returns:
+            {'gameWeek': [{'date': '2024-03-21', 'numberOfGames': 11, 'games': [{'id': 2023021104, ...}, ...]}, ...], ...}
+
+        Example URL: https://api-web.nhle.com/v1/schedule/2024-03-21
+        """
+        endpoint = f"/v1/schedule/{date if date is not None else 'now'}"
+        return self.get_url(endpoint=endpoint)
+
+    @memoize(ttl=24 * 3600)
     def list_team_info(self, lang='en'):
         """
         Retrieve a list of all teams in the specified language.
@@ -79,6 +243,20 @@ class Nhl:
         endpoint = f"/{lang}/team"
         return self.get_url(endpoint=endpoint, base_url_type='stats')
 
+    @memoize(ttl=24 * 3600)
+    def get_team_index(self, lang='en'):
+        """Index list_team_info by team id and by triCode (memoized, so lookups cost one dict access)
+
+        Parameters:
+            lang (str, optional): Language code (either 'en' or 'fr'). Defaults to 'en'.
+
+        Returns:
+            {'id': {19: {<team>}, ...}, 'triCode': {'STL': {<team>}, ...}}
+            A triCode shared by several historical teams maps to the one with the highest id.
+        """
+        return index_teams(self.list_team_info(lang))
+
+    @memoize(ttl=24 * 3600)
     def list_seasons(self):
         """Retrieve a list of all season IDs past & present in the NHL.
 
@@ -117,11 +295,53 @@ class Nhl:
                 ],
                 'total': 71032
             }
+
+        See iter_games to stream games page by page (optionally filtered) instead.
         """
         
         endpoint = f"/{lang}/game"
         return self.get_url(endpoint=endpoint, base_url_type='stats')
 
+    def iter_games(self, lang='en', season=None, game_type=None, start_date=None, end_date=None, page_size=1000, prefetch=True):
+        """Stream games from the stats API one page at a time
+
+        Pages through /{lang}/game with start/limit, filtered server-side with cayenneExp, so
+        memory stays flat however many seasons are scanned. With prefetch, the next page is
+        requested on a background thread while the caller consumes the current one.
+
+        Args:
+            lang (str, optional): Language code (either 'en' or 'fr'). Defaults to 'en'.
+            season (int, optional): Season ID in YYYYYYYY format (example: 20232024)
+            game_type (int, optional): Game type (1 preseason, 2 regular season, 3 playoffs)
+            start_date (str, optional): Earliest gameDate, YYYY-MM-DD format (inclusive)
+            end_date (str, optional): Latest gameDate, YYYY-MM-DD format (inclusive)
+            page_size (int, optional): Games per request. Defaults to 1000.
+            prefetch (bool, optional): Fetch the next page while the current one is consumed. Defaults to True.
+
+        Yields:
+            dict: One game (same shape as the elements of list_games()['data']), ordered by game id
+        """
+        endpoint = f"/{lang}/game"
+        def fetch_page(start):
+            params = games_page_params(start, page_size, season, game_type, start_date, end_date)
+            return self.get_url(endpoint=endpoint, base_url_type='stats', params=params)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            start = 0
+            page = executor.submit(fetch_page, start) if prefetch else None
+            while True:
+                response = page.result() if prefetch else fetch_page(start)
+                games = response['data']
+                start += len(games)
+                more = len(games) == page_size and start < response.get('total', float('inf'))
+                if more and prefetch:
+                    page = executor.submit(fetch_page, start)
+                del response
+                yield from games
+                if not more:
+                    break
+
+    @memoize(ttl=24 * 3600)
     def get_glossary(self, lang='en'):
         """Get glossary of terms
 
@@ -158,4 +378,4 @@ class Nhl:
             endpoint = f"{base_url}/now"
         
         # Make the API call
-        return self.nhl_client.get_url(endpoint=endpoint)
+        return self.get_url(endpoint=endpoint)
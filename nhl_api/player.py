@@ -1,25 +1,29 @@
 from nhl_api.nhl import Nhl
 import re
 
+# game_type names accepted by get_game_log -> gameTypeId
+GAME_TYPES = {'regular': 2, 'playoffs': 3}
+
 class Player:
-    def __init__(self, player_id):
+    def __init__(self, player_id, client=None):
         self.player_id = player_id
-        self.nhl_client = Nhl()
+        self.nhl_client = client if client is not None else Nhl()
     
     def get_game_log(self, season_id, game_type):
         """
         Description: Retrieve the game log for a specific player, season, and game type.
 
         Parameters:
-            season_id (int) - Season in YYYYYYYY format, where the first four digits represent the start year of the season, and the last four digits represent the end year.
-            game_type (int) - Game type (guessing 2 for regular season, 3 for playoffs)
+            season_id (int or str) - Season in YYYYYYYY format, where the first four digits represent the start year of the season, and the last four digits represent the end year.
+            game_type (int or str) - Game type: 2 or 'regular' for regular season, 3 or 'playoffs' for playoffs
         
         Example URL: "https://api-web.nhle.com/v1/player/8478402/game-log/20232024/2"
         """
-        assert game_type in ['regular', 'playoffs'], f"game_type must be either 'regular' or 'playoffs'.  You provided {game_type}"
-        if re.match("((19|20)\d{2}){2}", season_id) is None:
+        game_type_id = GAME_TYPES.get(game_type, game_type)
+        if game_type_id not in GAME_TYPES.values():
+            raise ValueError(f"game_type must be one of 2, 3, 'regular', 'playoffs'.  You provided {game_type}")
+        if re.fullmatch(r"((19|20)\d{2}){2}", str(season_id)) is None:
             raise ValueError("season_id must be YYYYYYYY format")
-        game_type_id = 2 if game_type == 'regular' else 3
         endpoint = f"/v1/player/{self.player_id}/game-log/{season_id}/{game_type_id}"
         return self.nhl_client.get_url(endpoint=endpoint)
     
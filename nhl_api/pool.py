@@ -0,0 +1,56 @@
+"""Bounded concurrent map over a thread pool
+
+map_bounded runs a function over an iterable of items on a thread pool, keeping only a few
+calls queued ahead of the running ones, so memory stays flat however many items there are
+and results are consumed while the rest are still being fetched. Backfill, GameStore,
+Archive, the game-log loader, the exporter and Game.get_all_details_many all use it.
+
+Example:
+    errors = []
+    for game_id, boxscore in map_bounded(lambda game_id: Game(game_id).get_boxscore(), game_ids, 8,
+                                         on_error=lambda game_id, e: errors.append((game_id, e))):
+        ...
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+_END = object()
+
+
+def map_bounded(func, items, max_workers, on_error=None, queued=2):
+    """Yield (item, func(item)) as the calls complete, in completion order
+
+    Args:
+        func (callable): Called with one item, on a worker thread
+        items (iterable): Items, consumed lazily
+        max_workers (int): Threads of the pool
+        on_error (callable, optional): Called with (item, exception) for a failed call, which
+            is then skipped; failures are raised by default
+        queued (int, optional): Calls submitted per thread at most. Defaults to 2.
+    """
+    items = iter(items)
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def submit_next():
+            item = next(items, _END)
+            if item is not _END:
+                pending[executor.submit(func, item)] = item
+
+        for _ in range(max_workers * queued):
+            submit_next()
+        try:
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    item = pending.pop(future)
+                    submit_next()
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if on_error is None:
+                            raise
+                        on_error(item, e)
+                        continue
+                    yield item, result
+        finally:
+            for future in pending:
+                future.cancel()
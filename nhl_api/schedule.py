@@ -0,0 +1,244 @@
+"""League schedule index built from every club's season schedule
+
+Each game appears in two club schedules (home and away). ScheduleIndex fetches the
+club-schedule-season of every club concurrently, keeps each game once, and stores the
+league calendar as parallel typed arrays sorted by game id, with sorted secondary indexes:
+    - by date: row numbers ordered by (date, game id) next to the matching date keys
+    - by team: per team, row numbers ordered by date
+    - by gameState: per state, sorted game ids
+Season and gameType lookups bisect the game ids themselves (a game id is YYYYTTNNNN:
+season start year, game type, game number). Every lookup is a bisect - O(log n) plus the
+size of the answer - and needs no network.
+
+Example:
+    index = ScheduleIndex.build([20232024])
+    index.on_date('2024-03-21')              # game ids
+    index.for_team('STL', game_type=2)
+    index.unfinished()
+    index.get(2023021104)                   # {'id': ..., 'date': '2024-03-21', 'home': 'STL', ...}
+    index.save('schedule.json.gz'); index = ScheduleIndex.load('schedule.json.gz')
+"""
+import bisect
+import gzip
+import json
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from nhl_api.cache import FINAL_GAME_STATES
+from nhl_api.nhl import Nhl
+from nhl_api.team import Team
+
+# Columns stored per game, with their array typecodes
+COLUMNS = {
+    'id': 'q',
+    'season': 'l',
+    'game_type': 'b',
+    'date': 'l',            # YYYYMMDD
+    'home_team_id': 'l',
+    'away_team_id': 'l',
+    'state': 'b',           # index into ScheduleIndex.states
+}
+
+
+def season_teams(season, client=None):
+    """Tri-codes of the clubs playing in a season"""
+    client = client if client is not None else Nhl()
+    start_year = int(str(season)[:4])
+    return sorted(club['abbrev'] for club in client.get_schedule_calendar(f"{start_year}-12-01")['teams'])
+
+
+def date_key(date):
+    """'YYYY-MM-DD' (or a datetime.date) -> YYYYMMDD int"""
+    return int(str(date)[:10].replace('-', ''))
+
+
+def _date_str(key):
+    return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+
+
+class ScheduleIndex:
+    """Deduplicated, indexed league schedule
+
+    Attributes:
+        columns (dict): COLUMNS name -> array.array, one entry per game, sorted by game id
+        states (list): gameState strings referenced by the 'state' column
+        teams (dict): team id -> tri-code
+    """
+    def __init__(self, games=()):
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        self.states = []
+        self.teams = {}
+        self._add(games)
+
+    @classmethod
+    def build(cls, seasons, client=None, teams=None, max_workers=8):
+        """Fetch the season schedule of every club for each season, concurrently
+
+        Args:
+            seasons (iterable of int): Season IDs in YYYYYYYY format
+            client (Nhl, optional): Client to use. Defaults to Nhl().
+            teams (list of str, optional): Only these clubs' schedules (tri-codes). Defaults to every club of the season.
+            max_workers (int, optional): Concurrent requests. Defaults to 8.
+        """
+        client = client if client is not None else Nhl()
+        requests = [(season, tri_code) for season in seasons for tri_code in (teams or season_teams(season, client))]
+
+        def club_schedule(request):
+            season, tri_code = request
+            team = Team.from_tricode(tri_code, client=client)
+            return team.get_schedule(schedule_type='season', time='season', period=str(season))['games']
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            schedules = list(executor.map(club_schedule, requests))
+        return cls(game for games in schedules for game in games)
+
+    def _add(self, games):
+        by_id = {}
+        for game in games:
+            by_id[game['id']] = game  # every game is listed by both clubs; keep one
+        rows = {self.columns['id'][row]: row for row in range(len(self))}
+        new = sorted(game_id for game_id in by_id if game_id not in rows)
+        for game_id, row in rows.items():
+            if game_id in by_id:  # a postponed game moves to its new date, not just its new state
+                for name, value in zip(COLUMNS, self._record(by_id[game_id])):
+                    self.columns[name][row] = value
+        if new:
+            records = list(zip(*self.columns.values())) + [self._record(by_id[game_id]) for game_id in new]
+            records.sort(key=lambda record: record[0])
+            for name, values in zip(COLUMNS, zip(*records)):
+                self.columns[name] = array(COLUMNS[name], values)
+        self._reindex()
+
+    def _state_code(self, state):
+        if state not in self.states:
+            self.states.append(state)
+        return self.states.index(state)
+
+    def _record(self, game):
+        away, home = game.get('awayTeam') or {}, game.get('homeTeam') or {}
+        for team in (away, home):
+            if team.get('id') is not None:
+                self.teams[team['id']] = team.get('abbrev')
+        return (game['id'], game.get('season', -1), game.get('gameType', -1), date_key(game['gameDate']),
+                home.get('id', -1), away.get('id', -1), self._state_code(game.get('gameState')))
+
+    def _reindex(self):
+        ids, dates = self.columns['id'], self.columns['date']
+        self._by_date = sorted(range(len(ids)), key=lambda row: (dates[row], ids[row]))
+        self._date_keys = array('l', (dates[row] for row in self._by_date))
+        self._by_team = {}
+        for row in self._by_date:
+            for column in ('home_team_id', 'away_team_id'):
+                self._by_team.setdefault(self.columns[column][row], array('l')).append(row)
+        self._by_state = {}
+        for row, state in enumerate(self.columns['state']):
+            self._by_state.setdefault(state, array('q')).append(ids[row])
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def __contains__(self, game_id):
+        return self._row(game_id) is not None
+
+    def _row(self, game_id):
+        ids = self.columns['id']
+        row = bisect.bisect_left(ids, game_id)
+        return row if row < len(ids) and ids[row] == game_id else None
+
+    def get(self, game_id):
+        """One game as a dict, or None"""
+        row = self._row(game_id)
+        if row is None:
+            return None
+        c = self.columns
+        return {
+            'id': c['id'][row], 'season': c['season'][row], 'game_type': c['game_type'][row],
+            'date': _date_str(c['date'][row]), 'home_team_id': c['home_team_id'][row],
+            'away_team_id': c['away_team_id'][row], 'home': self.teams.get(c['home_team_id'][row]),
+            'away': self.teams.get(c['away_team_id'][row]), 'game_state': self.states[c['state'][row]],
+        }
+
+    def between(self, start_date, end_date):
+        """Game ids dated start_date..end_date (inclusive), ordered by date then id"""
+        lo = bisect.bisect_left(self._date_keys, date_key(start_date))
+        hi = bisect.bisect_right(self._date_keys, date_key(end_date))
+        return [self.columns['id'][row] for row in self._by_date[lo:hi]]
+
+    def on_date(self, date):
+        """Game ids scheduled on a date (YYYY-MM-DD)"""
+        return self.between(date, date)
+
+    def for_season(self, season, game_type=None):
+        """Game ids of a season (optionally one game type), in id order"""
+        start_year = int(str(season)[:4])
+        if game_type is None:
+            lo, hi = start_year * 1000000, (start_year + 1) * 1000000
+        else:
+            lo = start_year * 1000000 + int(game_type) * 10000
+            hi = lo + 10000
+        ids = self.columns['id']
+        return list(ids[bisect.bisect_left(ids, lo):bisect.bisect_left(ids, hi)])
+
+    def for_team(self, team, season=None, game_type=None):
+        """Game ids of a team (tri-code or team id), ordered by date"""
+        if isinstance(team, str):
+            team = next((team_id for team_id, tri_code in self.teams.items() if tri_code == team), None)
+        c = self.columns
+        game_ids = [c['id'][row] for row in self._by_team.get(team, ())]
+        if season is not None:
+            start_year = int(str(season)[:4])
+            game_ids = [game_id for game_id in game_ids if game_id // 1000000 == start_year]
+        if game_type is not None:
+            game_ids = [game_id for game_id in game_ids if game_id // 10000 % 100 == int(game_type)]
+        return game_ids
+
+    def with_state(self, *states):
+        """Game ids in any of the given gameStates, sorted"""
+        codes = [self.states.index(state) for state in states if state in self.states]
+        return sorted(game_id for code in codes for game_id in self._by_state.get(code, ()))
+
+    def unfinished(self):
+        """Game ids not yet OFF/FINAL, sorted"""
+        return self.with_state(*(state for state in self.states if state not in FINAL_GAME_STATES))
+
+    def update_state(self, game_id, game_state):
+        """Record a game's new gameState (e.g. from a live poll)"""
+        row = self._row(game_id)
+        if row is None:
+            raise KeyError(game_id)
+        old = self.columns['state'][row]
+        new = self._state_code(game_state)
+        if old == new:
+            return
+        old_ids = self._by_state[old]
+        del old_ids[bisect.bisect_left(old_ids, game_id)]
+        new_ids = self._by_state.setdefault(new, array('q'))
+        new_ids.insert(bisect.bisect_left(new_ids, game_id), game_id)
+        self.columns['state'][row] = new
+
+    def refresh(self, games):
+        """Merge club-schedule game dicts in (new games are added, known games are rewritten - a
+        postponed game moves to its new date)"""
+        self._add(games)
+
+    def to_dict(self):
+        return {'columns': {name: list(values) for name, values in self.columns.items()},
+                'states': self.states, 'teams': {str(k): v for k, v in self.teams.items()}}
+
+    @classmethod
+    def from_dict(cls, d):
+        index = cls()
+        index.columns = {name: array(typecode, d['columns'][name]) for name, typecode in COLUMNS.items()}
+        index.states = list(d['states'])
+        index.teams = {int(k): v for k, v in d['teams'].items()}
+        index._reindex()
+        return index
+
+    def save(self, path):
+        with gzip.open(path, 'wt') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, 'rt') as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,202 @@
+"""Request scheduling for Transport: per-host rate limiting, adaptive concurrency, retries
+
+Every request goes through the RequestScheduler of its Transport, which for each host
+    - waits for a token from a token bucket (optional fixed requests/second cap),
+    - waits for a slot under an adaptive concurrency limit, which grows additively while
+      requests succeed and halves when the API answers 429 or 503,
+    - pauses the whole host when the API sends Retry-After,
+    - retries failed idempotent GETs (connection and read errors, 429, 5xx) with jittered
+      exponential backoff, raising a typed error from nhl_api.errors once retries run out.
+"""
+import email.utils
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from nhl_api.errors import NhlConnectionError, http_error
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+THROTTLE_STATUSES = (429, 503)
+
+# Failures of the connection or of reading the body (cut off mid-stream, corrupt compression)
+NETWORK_ERRORS = (requests.ConnectionError, requests.Timeout,
+                  requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError)
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delay in seconds or an HTTP date) into seconds, or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a request
+
+    Args:
+        max_retries (int, optional): Retries after the first attempt. Defaults to 4.
+        backoff_base (float, optional): Backoff for the first retry, in seconds. Defaults to 0.5.
+        backoff_cap (float, optional): Maximum backoff, in seconds. Defaults to 30.
+        retry_statuses (tuple, optional): Statuses worth retrying. Defaults to RETRY_STATUSES.
+    """
+    def __init__(self, max_retries=4, backoff_base=0.5, backoff_cap=30, retry_statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_statuses = retry_statuses
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry number `attempt` (0-based) - "full jitter" exponential backoff"""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second with bursts of `burst`"""
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight requests to one host
+
+    The limit grows by 1/limit per success (about +1 per round of requests) up to `maximum`,
+    and halves - at most once per `cooldown` seconds - when the host throttles us.
+    """
+    def __init__(self, initial=8, minimum=1, maximum=64, cooldown=1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while True:
+                pause = self.paused_until - time.monotonic()
+                if pause > 0:
+                    self._condition.wait(pause)
+                elif self.in_flight >= int(self.limit):
+                    self._condition.wait()
+                else:
+                    self.in_flight += 1
+                    return
+
+    def release(self, throttled=False, retry_after=None):
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = now
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class RequestScheduler:
+    """Schedules and retries the requests of a Transport, per host
+
+    Args:
+        rate (float, optional): Maximum requests per second per host (None for no fixed cap). Defaults to None.
+        burst (float, optional): Token bucket size. Defaults to max(1, rate).
+        initial_concurrency (int, optional): Starting in-flight limit per host. Defaults to 8.
+        max_concurrency (int, optional): Largest in-flight limit per host. Defaults to 64.
+        retry (RetryPolicy, optional): Retry rules. Defaults to RetryPolicy().
+    """
+    def __init__(self, rate=None, burst=None, initial_concurrency=8, max_concurrency=64, retry=None):
+        self.rate = rate
+        self.burst = burst
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.retry = retry if retry is not None else RetryPolicy()
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url):
+        host = urlsplit(url).netloc
+        limits = self._hosts.get(host)
+        if limits is None:
+            with self._lock:
+                limits = self._hosts.get(host)
+                if limits is None:
+                    bucket = TokenBucket(self.rate, self.burst) if self.rate else None
+                    concurrency = AdaptiveConcurrency(self.initial_concurrency, maximum=self.max_concurrency)
+                    limits = self._hosts[host] = (bucket, concurrency)
+        return limits
+
+    def concurrency(self, url):
+        """Current in-flight limit for the host of `url`"""
+        return self._host(url)[1].limit
+
+    def send(self, url, send):
+        """Call `send()` (which performs one GET of `url` and returns a requests.Response) under the
+        host's limits, retrying as the RetryPolicy allows
+
+        Returns:
+            requests.Response with a 2xx or 304 status
+
+        Raises:
+            NhlHTTPError (or a subclass) for error statuses, NhlConnectionError for network failures
+        """
+        bucket, concurrency = self._host(url)
+        attempt = 0
+        while True:
+            if bucket is not None:
+                bucket.acquire()
+            concurrency.acquire()
+            response = error = retry_after = None
+            try:
+                response = send()
+            except NETWORK_ERRORS as e:
+                error = NhlConnectionError(f"GET {url} failed: {e}")
+                error.__cause__ = e
+            finally:
+                throttled = response is not None and response.status_code in THROTTLE_STATUSES
+                if throttled:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                concurrency.release(throttled=throttled, retry_after=retry_after)
+
+            if response is not None:
+                if response.status_code < 400:
+                    return response
+                error = http_error(response.status_code, response.url or url, response.text, retry_after=retry_after)
+                if response.status_code not in self.retry.retry_statuses:
+                    raise error
+            if attempt >= self.retry.max_retries:
+                raise error
+            time.sleep(self.retry.delay(attempt, retry_after))
+            attempt += 1
@@ -0,0 +1,105 @@
+"""Single-flight coalescing of identical concurrent calls
+
+While a call for a key is in flight, other callers asking for the same key wait for it and
+share its result (or exception) instead of starting their own. Nhl.get_url keys calls on
+(base URL, endpoint, params, response_type), so e.g. 32 threads constructing Team objects at
+once cause one list_team_info request, not 32. Once a call completes the key is forgotten;
+caching finished results is left to memoize / ResponseCache.
+
+Callers sharing a result receive the same object, so treat results as read-only.
+"""
+import asyncio
+import threading
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with equal keys, from threads (do) or coroutines (do_async)
+
+    Attributes:
+        leaders (int): Calls that actually ran
+        coalesced (int): Calls that joined a call already in flight
+    """
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Run func() unless a call for `key` is already in flight, in which case wait for it
+
+        Returns:
+            (result, shared) - shared is True when the result came from another caller's call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result, False
+
+    async def do_async(self, key, func):
+        """Await func() unless a call for `key` is already in flight on this event loop, in which
+        case await that call instead
+
+        Returns:
+            (result, shared) - shared is True when the result came from another caller's call
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None or future.get_loop() is not loop
+            if leader:
+                future = self._futures[key] = loop.create_future()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            # shield: a cancelled follower must not cancel the call the others are waiting on
+            return await asyncio.shield(future), True
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved, in case nobody else was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+
+    def reset_counters(self):
+        self.leaders = self.coalesced = 0
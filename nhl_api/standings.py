@@ -0,0 +1,205 @@
+"""Standings history: daily league standings of a season as a team x date x metric array
+
+StandingsHistory.build reads the season's standings window from
+Nhl.get_standings(season_info=True) and fetches the daily snapshots concurrently. With a
+ResponseCache on the client, past days are cached forever. The snapshots are kept in one
+int16 array indexed [team][date][metric] (METRICS), so standings on a date, a team's
+trajectory and points pace are array lookups with no further requests.
+
+Example:
+    history = StandingsHistory.build(season=20232024, client=Nhl(cache=ResponseCache.sqlite('nhl.sqlite')))
+    history.on('2024-01-15')['EDM']          # {'points': 48, 'games_played': 41, ...}
+    history.series('EDM', 'rank')            # [('2023-10-10', 17), ...]
+    history.points_pace('EDM', '2024-01-15')
+    history.save('standings_20232024.json.gz')
+"""
+import bisect
+import datetime
+import gzip
+import json
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from nhl_api.columnar import Table
+from nhl_api.nhl import Nhl
+from nhl_api.schedule import date_key
+
+# Metric -> key of a team row of Nhl.get_standings(date=...)['standings']
+METRICS = {
+    'points': 'points',
+    'games_played': 'gamesPlayed',
+    'goal_differential': 'goalDifferential',
+    'rank': 'leagueSequence',
+}
+
+# Columns of StandingsHistory.to_table()
+STANDINGS_COLUMNS = {
+    'date': 'h',
+    'team_abbrev': 'h',
+    'points': 'h',
+    'games_played': 'h',
+    'goal_differential': 'h',
+    'rank': 'h',
+}
+STANDINGS_CATEGORICAL = ('date', 'team_abbrev')
+
+# Stored for a team without a row on a date (goal differential can be negative, so not -1)
+NO_DATA = -32768
+
+
+def _metric_index(metric):
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {', '.join(repr(k) for k in METRICS)}. You provided: {metric}")
+    return list(METRICS).index(metric)
+
+
+def standings_dates(season=None, start_date=None, end_date=None, client=None, step=1, today=None):
+    """Dates (YYYY-MM-DD) with standings, bounded by the seasons' standingsStart / standingsEnd
+
+    Args:
+        season (int, optional): Season ID in YYYYYYYY format; its whole standings window by default
+        start_date (str, optional): First date, YYYY-MM-DD format (inclusive)
+        end_date (str, optional): Last date, YYYY-MM-DD format (inclusive)
+        client (Nhl, optional): Client to use. Defaults to Nhl().
+        step (int, optional): Days between snapshots. Defaults to 1.
+        today (datetime.date, optional): Dates after today are dropped. Defaults to today.
+    """
+    if season is None and (start_date is None or end_date is None):
+        raise ValueError("Give a season, or both start_date and end_date")
+    client = client if client is not None else Nhl()
+    windows = [(info['standingsStart'], info['standingsEnd']) for info in client.get_standings(season_info=True)['seasons']
+               if season is None or info['id'] == int(season)]
+    if not windows:
+        raise ValueError(f"No standings for season {season}")
+    first = max(start_date or min(start for start, _end in windows), min(start for start, _end in windows))
+    last = min(end_date or max(end for _start, end in windows), max(end for _start, end in windows),
+               str(today or datetime.date.today()))
+    dates = []
+    day = datetime.date.fromisoformat(first)
+    while str(day) <= last:
+        if any(start <= str(day) <= end for start, end in windows):  # skip the off-seasons of a date range
+            dates.append(str(day))
+        day += datetime.timedelta(days=step)
+    return dates
+
+
+class StandingsHistory:
+    """Daily standings snapshots as an int16 array [team][date][metric]
+
+    Attributes:
+        dates (list of str): Snapshot dates, YYYY-MM-DD, ascending
+        teams (list of str): Team tri-codes, sorted
+        values (array.array): len(teams) * len(dates) * len(METRICS) values, NO_DATA where a team has no row
+    """
+    def __init__(self, dates, teams, values=None):
+        self.dates = list(dates)
+        self.teams = list(teams)
+        self.values = values if values is not None else array('h', [NO_DATA]) * (len(self.teams) * len(self.dates) * len(METRICS))
+        self._date_keys = array('l', (date_key(date) for date in self.dates))
+        self._team_index = {team: i for i, team in enumerate(self.teams)}
+
+    @classmethod
+    def build(cls, season=None, start_date=None, end_date=None, client=None, max_workers=8, step=1):
+        """Fetch the daily standings of a season or date range concurrently (see standings_dates for the arguments)"""
+        client = client if client is not None else Nhl()
+        dates = standings_dates(season, start_date, end_date, client=client, step=step)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            snapshots = list(executor.map(lambda date: client.get_standings(date=date)['standings'], dates))
+        return cls.from_snapshots(dates, snapshots)
+
+    @classmethod
+    def from_snapshots(cls, dates, snapshots):
+        """Build from Nhl.get_standings(date=...)['standings'] lists, one per date"""
+        dates, snapshots = zip(*sorted(zip(dates, snapshots), key=lambda pair: pair[0])) if dates else ((), ())
+        teams = sorted({row['teamAbbrev']['default'] for rows in snapshots for row in rows})
+        history = cls(dates, teams)
+        for d, rows in enumerate(snapshots):
+            for row in rows:
+                offset = history._offset(history._team_index[row['teamAbbrev']['default']], d)
+                for m, key in enumerate(METRICS.values()):
+                    value = row.get(key)
+                    if value is not None:
+                        history.values[offset + m] = value
+        return history
+
+    def _offset(self, team, date):
+        return (team * len(self.dates) + date) * len(METRICS)
+
+    def _date_row(self, date):
+        """Index of the latest snapshot on or before `date`, or None"""
+        row = bisect.bisect_right(self._date_keys, date_key(date)) - 1
+        return row if row >= 0 else None
+
+    def value(self, team, date, metric='points'):
+        """One metric of a team as of a date (the latest snapshot on or before it), or None"""
+        row = self._date_row(date)
+        if row is None or team not in self._team_index:
+            return None
+        value = self.values[self._offset(self._team_index[team], row) + _metric_index(metric)]
+        return None if value == NO_DATA else value
+
+    def on(self, date):
+        """Standings as of a date: {tri-code: {metric: value}}, ordered by rank"""
+        row = self._date_row(date)
+        if row is None:
+            return {}
+        standings = {}
+        for team, t in self._team_index.items():
+            offset = self._offset(t, row)
+            values = self.values[offset:offset + len(METRICS)]
+            if any(value != NO_DATA for value in values):
+                standings[team] = {metric: (None if value == NO_DATA else value) for metric, value in zip(METRICS, values)}
+        return dict(sorted(standings.items(), key=lambda item: (item[1]['rank'] is None, item[1]['rank'] or 0)))
+
+    def series(self, team, metric='points'):
+        """[(date, value)] of one team and metric over the snapshots, skipping dates without a row"""
+        if team not in self._team_index:
+            return []
+        offset = self._offset(self._team_index[team], 0) + _metric_index(metric)
+        step = len(METRICS)
+        values = self.values[offset:offset + len(self.dates) * step:step]
+        return [(date, value) for date, value in zip(self.dates, values) if value != NO_DATA]
+
+    def points_pace(self, team, date=None, games=82):
+        """Points a team would finish with at its points per game as of a date (default: the last snapshot)"""
+        date = date if date is not None else self.dates[-1]
+        points, games_played = self.value(team, date, 'points'), self.value(team, date, 'games_played')
+        if not games_played or points is None:
+            return None
+        return points / games_played * games
+
+    def to_table(self):
+        """columnar Table with one row per (date, team) that has standings, columns STANDINGS_COLUMNS"""
+        table = Table(STANDINGS_COLUMNS, STANDINGS_CATEGORICAL)
+        for d, date in enumerate(self.dates):
+            for team, t in self._team_index.items():
+                offset = self._offset(t, d)
+                values = self.values[offset:offset + len(METRICS)]
+                if all(value == NO_DATA for value in values):
+                    continue
+                table.append_row((table.encode('date', date), table.encode('team_abbrev', team),
+                                  *(None if value == NO_DATA else value for value in values)))
+        return table
+
+    def to_numpy(self):
+        """numpy int16 array of shape (teams, dates, metrics) - a zero-copy view of values"""
+        import numpy as np
+        return np.frombuffer(self.values, dtype=np.int16).reshape(len(self.teams), len(self.dates), len(METRICS))
+
+    def to_dict(self):
+        return {'dates': self.dates, 'teams': self.teams, 'metrics': list(METRICS), 'values': list(self.values)}
+
+    @classmethod
+    def from_dict(cls, d):
+        if d['metrics'] != list(METRICS):
+            raise ValueError(f"Saved metrics {d['metrics']} do not match {list(METRICS)}")
+        return cls(d['dates'], d['teams'], array('h', d['values']))
+
+    def save(self, path):
+        with gzip.open(path, 'wt') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, 'rt') as f:
+            return cls.from_dict(json.load(f))
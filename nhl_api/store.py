@@ -0,0 +1,250 @@
+"""Incremental local mirror of games and their gamecenter responses
+
+GameStore keeps, in one SQLite database, every game listed by Nhl.iter_games with its
+gameState, plus the gamecenter responses (play-by-play, landing, boxscore, meta, shift charts)
+of each game and when they were fetched. `sync()` refreshes only what could have changed:
+    - the game list is re-read from the earliest game not yet final onwards (the whole list
+      only on the first sync), and rows of OFF/FINAL games are never rewritten;
+    - gamecenter endpoints are fetched for games whose date has passed or that are live,
+      unless they were already fetched once the game was OFF/FINAL.
+A daily sync therefore costs about one request per endpoint per game of the day.
+
+Example:
+    with GameStore('nhl.db') as store:
+        result = store.sync()
+        pbp = store.get(2023020204, 'play-by-play')
+        finals = store.games(season=20232024, game_state='OFF')
+
+Command line:
+    python -m nhl_api.store nhl.db --workers 8
+"""
+import argparse
+import datetime
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+from nhl_api.cache import FINAL_GAME_STATES
+from nhl_api.game import DETAIL_SOURCES, Game
+from nhl_api.nhl import Nhl
+from nhl_api.pool import map_bounded
+
+LIVE_GAME_STATES = ('LIVE', 'CRIT')
+
+# gameStateId of the stats API's /{lang}/game rows -> gameState of the gamecenter endpoints
+GAME_STATE_IDS = {1: 'FUT', 2: 'PRE', 3: 'LIVE', 4: 'CRIT', 5: 'OVER', 6: 'FINAL', 7: 'OFF'}
+
+SyncResult = namedtuple('SyncResult', ['listed', 'refreshed', 'errors'])
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS games ("
+    "id INTEGER PRIMARY KEY, season INTEGER, game_type INTEGER, game_date TEXT, start_time TEXT, "
+    "home_team_id INTEGER, visiting_team_id INTEGER, home_score INTEGER, visiting_score INTEGER, "
+    "game_state TEXT, listed_at REAL, fetched_at REAL, fetched_state TEXT)",
+    "CREATE INDEX IF NOT EXISTS games_season ON games (season)",
+    "CREATE INDEX IF NOT EXISTS games_date ON games (game_date)",
+    "CREATE TABLE IF NOT EXISTS responses ("
+    "game_id INTEGER, endpoint TEXT, body BLOB, fetched_at REAL, PRIMARY KEY (game_id, endpoint))",
+)
+
+_FINAL = ', '.join(f"'{state}'" for state in FINAL_GAME_STATES)
+_LIVE = ', '.join(f"'{state}'" for state in LIVE_GAME_STATES)
+
+
+class GameStore:
+    """SQLite mirror of the game list and gamecenter responses, synced incrementally
+
+    Args:
+        path (str): SQLite database file
+        client (Nhl, optional): Client to fetch with. Defaults to Nhl().
+        endpoints (iterable of str, optional): Keys of game.DETAIL_SOURCES to mirror per game. Defaults to all.
+        max_workers (int, optional): Games fetched concurrently. Defaults to 8.
+    """
+    def __init__(self, path, client=None, endpoints=None, max_workers=8):
+        self.path = path
+        self.client = client if client is not None else Nhl()
+        self.endpoints = list(endpoints) if endpoints is not None else list(DETAIL_SOURCES)
+        unknown = set(self.endpoints) - set(DETAIL_SOURCES)
+        if unknown:
+            raise ValueError(f"Unknown endpoints: {sorted(unknown)}. Choose from {list(DETAIL_SOURCES)}")
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def sync(self, season=None, today=None):
+        """Bring the store up to date: sync_index() then refresh()
+
+        Args:
+            season (int, optional): Limit the sync to one season (YYYYYYYY)
+            today (datetime.date, optional): Reference date. Defaults to today.
+
+        Returns:
+            SyncResult(listed, refreshed, errors) - games listed, games whose endpoints were
+            fetched, and [(game_id, exception)] for games that failed (retried on the next sync)
+        """
+        listed = self.sync_index(season=season)
+        refreshed, errors = self.refresh(self.stale_games(season=season, today=today))
+        return SyncResult(listed, refreshed, errors)
+
+    def watermark(self, season=None):
+        """Earliest gameDate the game list must be re-read from, or None for a full read"""
+        where, params = ("WHERE season = ?", (season,)) if season is not None else ('', ())
+        with self._lock:
+            unfinished = self._conn.execute(
+                f"SELECT MIN(game_date) FROM games {where} {'AND' if where else 'WHERE'} "
+                f"(game_state IS NULL OR game_state NOT IN ({_FINAL}))", params).fetchone()[0]
+            latest = self._conn.execute(f"SELECT MAX(game_date) FROM games {where}", params).fetchone()[0]
+        return unfinished or latest
+
+    def sync_index(self, season=None):
+        """Read new and unfinished games from Nhl.iter_games into the store; returns rows read"""
+        start_date = self.watermark(season)
+        count = 0
+        batch = []
+        for row in self.client.iter_games(season=season, start_date=start_date):
+            batch.append(row)
+            if len(batch) >= 1000:
+                count += self._upsert_rows(batch)
+                batch = []
+        return count + self._upsert_rows(batch)
+
+    def _upsert_rows(self, rows):
+        now = time.time()
+        values = [
+            (row['id'], row.get('season'), row.get('gameType'), (row.get('gameDate') or '')[:10] or None,
+             row.get('easternStartTime'), row.get('homeTeamId'), row.get('visitingTeamId'), row.get('homeScore'),
+             row.get('visitingScore'), GAME_STATE_IDS.get(row.get('gameStateId')), now)
+            for row in rows
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            # Rows of final games are left alone
+            self._conn.executemany(
+                "INSERT INTO games (id, season, game_type, game_date, start_time, home_team_id, visiting_team_id, "
+                "home_score, visiting_score, game_state, listed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET season = excluded.season, game_type = excluded.game_type, "
+                "game_date = excluded.game_date, start_time = excluded.start_time, "
+                "home_team_id = excluded.home_team_id, visiting_team_id = excluded.visiting_team_id, "
+                "home_score = excluded.home_score, visiting_score = excluded.visiting_score, "
+                "game_state = COALESCE(excluded.game_state, games.game_state), listed_at = excluded.listed_at "
+                f"WHERE games.game_state IS NULL OR games.game_state NOT IN ({_FINAL})",
+                values,
+            )
+            self._conn.execute("COMMIT")
+        return len(values)
+
+    def stale_games(self, season=None, today=None):
+        """IDs of games whose gamecenter responses could have changed since they were fetched:
+        not fetched since the game went OFF/FINAL (per the responses' gameState, or the listed
+        state when they carry none), and either dated before today or live"""
+        today = (today or datetime.date.today()).isoformat()
+        where, params = ("AND season = ?", (season,)) if season is not None else ('', ())
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM games WHERE (fetched_state IS NULL OR fetched_state NOT IN ({_FINAL})) "
+                f"AND (game_date < ? OR game_state IN ({_LIVE})) {where} ORDER BY id",
+                (today,) + params,
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def fetch(self, game_id):
+        """Fetch the mirrored endpoints of one game; returns {endpoint: payload}"""
+        game = Game(game_id, client=self.client)
+        return {endpoint: getattr(game, DETAIL_SOURCES[endpoint])() for endpoint in self.endpoints}
+
+    def refresh(self, game_ids):
+        """Fetch and store the endpoints of games concurrently; returns (games stored, [(game_id, exception)])"""
+        def fetch_and_store(game_id):
+            self._store(game_id, self.fetch(game_id))
+
+        errors = []
+        refreshed = 0
+        for _ in map_bounded(fetch_and_store, game_ids, self.max_workers, on_error=lambda game_id, e: errors.append((game_id, e))):
+            refreshed += 1
+        return refreshed, errors
+
+    def _store(self, game_id, payloads):
+        now = time.time()
+        game_state = next((payload['gameState'] for payload in payloads.values()
+                           if isinstance(payload, dict) and 'gameState' in payload), None)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO responses (game_id, endpoint, body, fetched_at) VALUES (?, ?, ?, ?)",
+                [(game_id, endpoint, zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8')), now)
+                 for endpoint, payload in payloads.items()],
+            )
+            # Without a gameState in the responses (e.g. only 'meta' / 'shiftcharts' mirrored), the
+            # listed state is what they were fetched at; the right-hand sides read the row before the update
+            self._conn.execute(
+                "UPDATE games SET game_state = COALESCE(?, game_state), fetched_at = ?, "
+                "fetched_state = COALESCE(?, game_state) WHERE id = ?",
+                (game_state, now, game_state, game_id),
+            )
+            self._conn.execute("COMMIT")
+
+    def get(self, game_id, endpoint):
+        """Stored payload of one endpoint of a game, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM responses WHERE game_id = ? AND endpoint = ?", (game_id, endpoint)).fetchone()
+        return None if row is None else json.loads(zlib.decompress(row[0]))
+
+    def get_all_details(self, game_id):
+        """Stored endpoints of a game merged like Game.get_all_details, or None if never fetched"""
+        with self._lock:
+            rows = self._conn.execute("SELECT endpoint, body FROM responses WHERE game_id = ?", (game_id,)).fetchall()
+        if not rows:
+            return None
+        bodies = dict(rows)
+        order = [endpoint for endpoint in DETAIL_SOURCES if endpoint in bodies]  # Game.get_all_details merge order
+        return Game._merge_details([json.loads(zlib.decompress(bodies[endpoint])) for endpoint in order])
+
+    def games(self, season=None, game_state=None):
+        """Stored games as dicts, ordered by id, optionally filtered by season and gameState"""
+        conditions, params = [], []
+        if season is not None:
+            conditions.append("season = ?")
+            params.append(season)
+        if game_state is not None:
+            conditions.append("game_state = ?")
+            params.append(game_state)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        with self._lock:
+            cursor = self._conn.execute(f"SELECT * FROM games {where} ORDER BY id", params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m nhl_api.store', description="Incrementally sync a local game store")
+    parser.add_argument('path', help="SQLite database file")
+    parser.add_argument('--season', type=int, help="Only sync this season (YYYYYYYY)")
+    parser.add_argument('--workers', type=int, default=8, help="Games fetched concurrently")
+    parser.add_argument('--endpoints', nargs='+', choices=list(DETAIL_SOURCES), help="Endpoints to mirror (default: all)")
+    args = parser.parse_args(argv)
+
+    with GameStore(args.path, max_workers=args.workers, endpoints=args.endpoints) as store:
+        result = store.sync(season=args.season)
+    print(f"{result.listed} games listed, {result.refreshed} games refreshed, {len(result.errors)} failed")
+    for game_id, error in result.errors[:20]:
+        print(f"  {game_id}: {error!r}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Compact typed records for the hot payloads
+
+Plays, shifts, game log rows and list_games rows decoded into objects with __slots__
+instead of dicts, which holds a season in memory at a fraction of the size. Times given
+as 'MM:SS' strings are converted to integer seconds.
+
+Example:
+    plays = structs.plays(Game(2023020204).get_play_by_play())
+    goals = [play for play in plays if play.type_desc_key == 'goal']
+    games = list(structs.games(client.iter_games(season=20232024)))
+"""
+from nhl_api.columnar import PRIMARY_PLAYER_KEYS, SECONDARY_PLAYER_KEYS, SHIFT_TYPE_CODE, mmss_to_seconds
+
+
+def _seconds(value):
+    return mmss_to_seconds(value) if value else None
+
+
+class Struct:
+    """Base for slotted records; FIELDS maps attribute name -> key in the source dict"""
+    __slots__ = ()
+    FIELDS = {}
+
+    @classmethod
+    def from_dict(cls, d):
+        record = cls.__new__(cls)
+        for attr, key in cls.FIELDS.items():
+            setattr(record, attr, d.get(key))
+        return record
+
+    def to_dict(self):
+        return {attr: getattr(self, attr) for attr in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, a) == getattr(other, a) for a in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f"{attr}={getattr(self, attr)!r}" for attr in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Play(Struct):
+    """One play from Game.get_play_by_play()['plays']"""
+    __slots__ = (
+        'game_id', 'event_id', 'sort_order', 'period', 'period_type', 'seconds_in_period',
+        'type_code', 'type_desc_key', 'situation_code', 'team_id', 'player1_id', 'player2_id',
+        'goalie_id', 'x_coord', 'y_coord', 'zone_code', 'shot_type',
+    )
+
+    @classmethod
+    def from_dict(cls, d, game_id=None):
+        details = d.get('details') or {}
+        period_descriptor = d.get('periodDescriptor') or {}
+        play = cls.__new__(cls)
+        play.game_id = game_id
+        play.event_id = d.get('eventId')
+        play.sort_order = d.get('sortOrder')
+        play.period = period_descriptor.get('number')
+        play.period_type = period_descriptor.get('periodType')
+        play.seconds_in_period = _seconds(d.get('timeInPeriod'))
+        play.type_code = d.get('typeCode')
+        play.type_desc_key = d.get('typeDescKey')
+        play.situation_code = d.get('situationCode')
+        play.team_id = details.get('eventOwnerTeamId')
+        play.player1_id = next((details[key] for key in PRIMARY_PLAYER_KEYS if key in details), None)
+        play.player2_id = next((details[key] for key in SECONDARY_PLAYER_KEYS if key in details), None)
+        play.goalie_id = details.get('goalieInNetId')
+        play.x_coord = details.get('xCoord')
+        play.y_coord = details.get('yCoord')
+        play.zone_code = details.get('zoneCode')
+        play.shot_type = details.get('shotType')
+        return play
+
+
+class Shift(Struct):
+    """One shift from Game.get_shift_charts()['data']; start/end/duration in seconds within the period"""
+    __slots__ = ('id', 'game_id', 'player_id', 'team_id', 'period', 'shift_number', 'start', 'end', 'duration', 'type_code')
+
+    @classmethod
+    def from_dict(cls, d):
+        shift = cls.__new__(cls)
+        shift.id = d.get('id')
+        shift.game_id = d.get('gameId')
+        shift.player_id = d.get('playerId')
+        shift.team_id = d.get('teamId')
+        shift.period = d.get('period')
+        shift.shift_number = d.get('shiftNumber')
+        shift.start = _seconds(d.get('startTime'))
+        shift.end = _seconds(d.get('endTime'))
+        shift.duration = _seconds(d.get('duration'))
+        shift.type_code = d.get('typeCode')
+        return shift
+
+
+class GameLogRow(Struct):
+    """One game from Player.get_game_log()['gameLog'] - skater or goalie (fields not reported are None)"""
+    FIELDS = {
+        'game_id': 'gameId', 'game_date': 'gameDate', 'team_abbrev': 'teamAbbrev',
+        'opponent_abbrev': 'opponentAbbrev', 'home_road_flag': 'homeRoadFlag',
+        'goals': 'goals', 'assists': 'assists', 'points': 'points', 'plus_minus': 'plusMinus',
+        'pim': 'pim', 'shots': 'shots', 'shifts': 'shifts', 'power_play_goals': 'powerPlayGoals',
+        'power_play_points': 'powerPlayPoints', 'shorthanded_goals': 'shorthandedGoals',
+        'game_winning_goals': 'gameWinningGoals', 'ot_goals': 'otGoals',
+        'games_started': 'gamesStarted', 'decision': 'decision', 'shots_against': 'shotsAgainst',
+        'goals_against': 'goalsAgainst', 'save_pctg': 'savePctg', 'shutouts': 'shutouts', 'toi': 'toi',
+    }
+    __slots__ = tuple(FIELDS)
+
+    @classmethod
+    def from_dict(cls, d):
+        row = super().from_dict(d)
+        row.toi = _seconds(row.toi)
+        return row
+
+
+class GameRow(Struct):
+    """One game from Nhl.list_games()['data'] / Nhl.iter_games()"""
+    FIELDS = {
+        'id': 'id', 'season': 'season', 'game_type': 'gameType', 'game_date': 'gameDate',
+        'eastern_start_time': 'easternStartTime', 'game_number': 'gameNumber',
+        'game_schedule_state_id': 'gameScheduleStateId', 'game_state_id': 'gameStateId',
+        'period': 'period', 'home_team_id': 'homeTeamId', 'home_score': 'homeScore',
+        'visiting_team_id': 'visitingTeamId', 'visiting_score': 'visitingScore',
+    }
+    __slots__ = tuple(FIELDS)
+
+
+def plays(play_by_play):
+    """Game.get_play_by_play() response -> list[Play]"""
+    game_id = play_by_play.get('id')
+    return [Play.from_dict(play, game_id) for play in play_by_play.get('plays', ())]
+
+
+def shifts(shift_charts, shifts_only=True):
+    """Game.get_shift_charts() response -> list[Shift] (only player shifts unless shifts_only=False)"""
+    return [Shift.from_dict(shift) for shift in shift_charts.get('data', ())
+            if not shifts_only or shift.get('typeCode') == SHIFT_TYPE_CODE]
+
+
+def game_log(game_log_response):
+    """Player.get_game_log() response -> list[GameLogRow]"""
+    return [GameLogRow.from_dict(row) for row in game_log_response.get('gameLog', ())]
+
+
+def games(rows):
+    """Nhl.list_games() response, or an iterable of its rows (e.g. Nhl.iter_games()) -> iterator of GameRow"""
+    if isinstance(rows, dict):
+        rows = rows.get('data', ())
+    return (GameRow.from_dict(row) for row in rows)
@@ -1,11 +1,19 @@
 from nhl_api.nhl import Nhl
 
 class Team:
-    def __init__(self, team_id):
-        self.nhl_client = Nhl()
+    def __init__(self, team_id, client=None):
+        self.nhl_client = client if client is not None else Nhl()
         self.team_id = team_id
-        self.team_info = self.get_team_info(self.team_id)
+        self.team_info = self.get_team_info()
         self.team_code = self.team_info['triCode']
+
+    @classmethod
+    def from_tricode(cls, tri_code, client=None, lang='en'):
+        """Build a Team from its three-letter code (example: 'STL')"""
+        client = client if client is not None else Nhl()
+        team = client.get_team_index(lang)['triCode'].get(tri_code)
+        assert team is not None, f"No team from Nhl.list_team_info with triCode: {tri_code}"
+        return cls(team['id'], client=client)
     
     def get_team_info(self, lang='en'):
         """
@@ -24,10 +32,9 @@ class Team:
                  'triCode': 'STL'
                 }
         """
-        all_teams = self.nhl_client.list_team_info(lang)
-        team = [team for team in all_teams['data'] if team['id'] == self.team_id]
-        assert len(team) == 1, f"Multiple teams from Nhl.list_team_info with id: {self.team_id}"
-        return team[0]
+        team = self.nhl_client.get_team_index(lang)['id'].get(self.team_id)
+        assert team is not None, f"No team from Nhl.list_team_info with id: {self.team_id}"
+        return team
 
     def get_team_stats(self, season=None, game_type=None):
         """
@@ -49,6 +56,23 @@ class Team:
         
         return self.nhl_client.get_url(endpoint=endpoint)
 
+    def get_roster(self, season=None):
+        """
+        Retrieve the team's roster: every player who belonged to the club in a season, or its current roster.
+
+        Parameters:
+            season (int, optional) - Season in YYYYYYYY format. Defaults to the current roster.
+
+        Returns:
+            {'forwards': [{'id': 8477934, 'firstName': {'default': 'Leon'}, 'positionCode': 'C', ...}, ...],
+             'defensemen': [...],
+             'goalies': [...]}
+
+        Example URL: https://api-web.nhle.com/v1/roster/EDM/20232024
+        """
+        endpoint = f"/v1/roster/{self.team_code}/{season if season is not None else 'current'}"
+        return self.nhl_client.get_url(endpoint=endpoint)
+
     def get_team_scoreboard_now(self):
         """
         Retrieve the scoreboard for a specific team as of the current moment.
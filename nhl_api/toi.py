@@ -0,0 +1,266 @@
+"""Time on ice, on-ice players and line combinations from shift charts
+
+Shift charts are turned once into integer-second intervals (seconds since the start of the
+game) and everything else is a sweep over sorted interval boundaries:
+    - time_on_ice: per-player TOI, overlapping shift rows of a player counted once
+    - on_ice_at / plays_on_ice: who was on the ice at each play of the play-by-play
+    - combinations: shared TOI of every line (3 forwards) or pairing (2 defensemen) - the
+      on-ice set only changes at shift boundaries, so each constant stretch is credited once
+      instead of comparing every pair of shifts
+analyze_season runs the per-game analysis for many games on a process pool.
+
+Example:
+    game = Game(2023020204)
+    intervals = Intervals.from_shift_charts(game.get_shift_charts())
+    toi = time_on_ice(intervals)
+    lines = combinations(intervals, positions_from_boxscore(game.get_boxscore()), group='F', size=3)
+
+    for game_id, analysis in analyze_season(season_game_ids(20232024), processes=8):
+        ...
+"""
+import itertools
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from nhl_api.columnar import elapsed_seconds, mmss_to_seconds, shifts_table
+from nhl_api.game import Game
+from nhl_api.nhl import Nhl
+from nhl_api.transport import Transport
+
+# boxscore playerByGameStats group -> position group used by combinations
+BOXSCORE_GROUPS = {'forwards': 'F', 'defense': 'D', 'goalies': 'G'}
+
+
+class Intervals:
+    """Shifts of one game as parallel integer arrays, sorted by start
+
+    Attributes:
+        player_id, team_id, start, end (array.array): One entry per shift; start/end in
+            seconds since the start of the game, end > start
+    """
+    def __init__(self, player_id, team_id, start, end):
+        order = sorted(range(len(start)), key=start.__getitem__)
+        self.player_id = array('l', (player_id[i] for i in order))
+        self.team_id = array('l', (team_id[i] for i in order))
+        self.start = array('l', (start[i] for i in order))
+        self.end = array('l', (end[i] for i in order))
+
+    @classmethod
+    def from_shift_charts(cls, shift_charts):
+        """Build from a Game.get_shift_charts() response, dropping shifts without a valid time range"""
+        table = shifts_table(shift_charts)
+        keep = [i for i, (start, end) in enumerate(zip(table.to_list('start_elapsed'), table.to_list('end_elapsed')))
+                if start is not None and end is not None and end > start]
+        return cls(*([table[name][i] for i in keep] for name in ('player_id', 'team_id', 'start_elapsed', 'end_elapsed')))
+
+    def __len__(self):
+        return len(self.start)
+
+    def teams(self):
+        """{player_id: team_id}"""
+        return dict(zip(self.player_id, self.team_id))
+
+    def boundaries(self):
+        """Sorted (time, +1 for a shift start / -1 for an end, shift index); ends sort before starts"""
+        events = [(t, 1, i) for i, t in enumerate(self.start)] + [(t, -1, i) for i, t in enumerate(self.end)]
+        events.sort()
+        return events
+
+
+def time_on_ice(intervals):
+    """Per-player time on ice in seconds: {player_id: seconds}"""
+    toi = defaultdict(int)
+    covered_until = {}  # player_id -> end of the player's latest shift so far (shifts are sorted by start)
+    for player_id, start, end in zip(intervals.player_id, intervals.start, intervals.end):
+        previous_end = covered_until.get(player_id, start)
+        if end > previous_end:
+            toi[player_id] += end - max(start, previous_end)
+            covered_until[player_id] = end
+    return dict(toi)
+
+
+def on_ice_at(intervals, times, starting=None):
+    """Players on the ice at each of `times` (seconds since the start of the game)
+
+    A shift covers (start, end]: players whose shift ends at t were on for what happened at t
+    (a goal, a whistle), players coming on at t were not. For faceoffs the opposite holds -
+    pass starting[k] = True to use [start, end) for times[k].
+
+    Args:
+        intervals (Intervals): Shifts of the game
+        times (sequence of int): Query times, in any order
+        starting (sequence of bool, optional): Per query, count players starting at t instead
+            of those ending at t
+
+    Returns:
+        list of {team_id: frozenset(player_id)}, aligned with `times`
+    """
+    starts, ends = intervals.start, intervals.end
+    by_end = sorted(range(len(ends)), key=ends.__getitem__)
+    result = [None] * len(times)
+    active = set()  # shifts with start <= t and end >= t
+    next_start = next_end = 0
+    for k in sorted(range(len(times)), key=times.__getitem__):
+        t = times[k]
+        while next_start < len(starts) and starts[next_start] <= t:
+            active.add(next_start)
+            next_start += 1
+        while next_end < len(by_end) and ends[by_end[next_end]] < t:
+            active.discard(by_end[next_end])
+            next_end += 1
+        if starting is not None and starting[k]:
+            on_ice = [i for i in active if ends[i] != t]
+        else:
+            on_ice = [i for i in active if starts[i] != t]
+        teams = defaultdict(set)
+        for i in on_ice:
+            teams[intervals.team_id[i]].add(intervals.player_id[i])
+        result[k] = {team_id: frozenset(players) for team_id, players in teams.items()}
+    return result
+
+
+def plays_on_ice(intervals, play_by_play):
+    """Players on the ice at every play of a Game.get_play_by_play() response
+
+    Returns:
+        list of (event_id, {team_id: frozenset(player_id)}) in play order; plays without a time are skipped
+    """
+    events, times, starting = [], [], []
+    for play in play_by_play.get('plays', ()):
+        seconds = mmss_to_seconds(play.get('timeInPeriod'))
+        if seconds is None:
+            continue
+        events.append(play.get('eventId'))
+        times.append(elapsed_seconds((play.get('periodDescriptor') or {}).get('number', 1), seconds))
+        starting.append(play.get('typeDescKey') == 'faceoff')
+    return list(zip(events, on_ice_at(intervals, times, starting)))
+
+
+def positions_from_boxscore(boxscore):
+    """{player_id: 'F' | 'D' | 'G'} from a Game.get_boxscore() response"""
+    positions = {}
+    for team in (boxscore.get('playerByGameStats') or {}).values():
+        for group, position in BOXSCORE_GROUPS.items():
+            for player in team.get(group, ()):
+                positions[player['playerId']] = position
+    return positions
+
+
+def combinations(intervals, positions=None, group=None, size=3):
+    """Shared time on ice of every combination of `size` teammates
+
+    Sweeps the shift boundaries in time order; between two boundaries the on-ice players are
+    constant, and every `size`-subset of each team's on-ice players (of the position group,
+    if given) is credited with the stretch.
+
+    Args:
+        intervals (Intervals): Shifts of the game
+        positions (dict, optional): {player_id: position group}, e.g. from positions_from_boxscore
+        group (str, optional): Only combine players of this position group - 'F' for lines
+            (size=3), 'D' for pairings (size=2). Defaults to all players.
+        size (int, optional): Players per combination. Defaults to 3.
+
+    Returns:
+        {(team_id, (player_id, ...)): seconds}, player ids sorted
+    """
+    if group is not None and positions is None:
+        raise ValueError("positions are required to filter combinations by group")
+    shared = defaultdict(int)
+    on_ice = defaultdict(dict)  # team_id -> {player_id: open shifts}, so overlapping rows of a player count once
+    events = intervals.boundaries()
+    for n, (t, kind, i) in enumerate(events):
+        player_id = intervals.player_id[i]
+        if group is None or positions.get(player_id) == group:
+            players = on_ice[intervals.team_id[i]]
+            count = players.get(player_id, 0) + kind
+            if count:
+                players[player_id] = count
+            else:
+                del players[player_id]
+        if n + 1 == len(events) or events[n + 1][0] == t:
+            continue  # credit once all boundaries at t are applied
+        stretch = events[n + 1][0] - t
+        for team_id, players in on_ice.items():
+            if len(players) >= size:
+                for combo in itertools.combinations(sorted(players), size):
+                    shared[team_id, combo] += stretch
+    return dict(shared)
+
+
+def analyze_game(shift_charts, boxscore=None, play_by_play=None):
+    """Time on ice, lines and pairings (and on-ice players per play, given play_by_play) of one game
+
+    Returns:
+        {'toi': {player_id: seconds}, 'teams': {player_id: team_id},
+         'lines': {(team_id, (f1, f2, f3)): seconds}, 'pairings': {(team_id, (d1, d2)): seconds},
+         'on_ice': [(event_id, {team_id: frozenset})]}
+        lines and pairings are empty without a boxscore, on_ice without play_by_play.
+    """
+    intervals = Intervals.from_shift_charts(shift_charts)
+    analysis = {'toi': time_on_ice(intervals), 'teams': intervals.teams(), 'lines': {}, 'pairings': {}, 'on_ice': []}
+    if boxscore is not None:
+        positions = positions_from_boxscore(boxscore)
+        analysis['lines'] = combinations(intervals, positions, group='F', size=3)
+        analysis['pairings'] = combinations(intervals, positions, group='D', size=2)
+    if play_by_play is not None:
+        analysis['on_ice'] = plays_on_ice(intervals, play_by_play)
+    return analysis
+
+
+_worker_client = None
+
+
+def _init_worker(base_urls):
+    global _worker_client
+    # A Transport of its own: a forked worker must not read from the parent's pooled sockets
+    _worker_client = Nhl(transport=Transport(base_urls=base_urls))
+
+
+def _analyze_game_id(game_id, with_plays=False):
+    game = Game(game_id, client=_worker_client)
+    play_by_play = game.get_play_by_play() if with_plays else None
+    return game_id, analyze_game(game.get_shift_charts(), game.get_boxscore(), play_by_play)
+
+
+def analyze_season(game_ids, processes=None, base_urls=None, with_plays=False, chunksize=4):
+    """Fetch and analyze many games on a process pool (each worker has its own client)
+
+    Parsing shift charts and sweeping them is CPU-bound, so processes rather than threads
+    give a near-linear speedup over a season.
+
+    Args:
+        game_ids (iterable of int): Games to analyze
+        processes (int, optional): Worker processes. Defaults to os.cpu_count().
+        base_urls (dict, optional): base_urls for the workers' Nhl clients
+        with_plays (bool, optional): Also fetch play-by-play and compute on-ice players per play. Defaults to False.
+        chunksize (int, optional): Games handed to a worker at a time. Defaults to 4.
+
+    Yields:
+        (game_id, analysis) as returned by analyze_game, in the order of game_ids
+    """
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(base_urls,)) as executor:
+        yield from executor.map(_analyze_game_id, game_ids, itertools.repeat(with_plays), chunksize=chunksize)
+
+
+def aggregate(analyses):
+    """Sum analyze_game / analyze_season results into season totals
+
+    Args:
+        analyses (iterable): analysis dicts, or (game_id, analysis) tuples from analyze_season
+
+    Returns:
+        {'toi': {player_id: seconds}, 'games': {player_id: games played},
+         'lines': {...: seconds}, 'pairings': {...: seconds}}
+    """
+    totals = {'toi': defaultdict(int), 'games': defaultdict(int), 'lines': defaultdict(int), 'pairings': defaultdict(int)}
+    for analysis in analyses:
+        if isinstance(analysis, tuple):
+            analysis = analysis[1]
+        for player_id, seconds in analysis['toi'].items():
+            totals['toi'][player_id] += seconds
+            totals['games'][player_id] += 1
+        for key in ('lines', 'pairings'):
+            for combo, seconds in analysis[key].items():
+                totals[key][combo] += seconds
+    return {key: dict(values) for key, values in totals.items()}
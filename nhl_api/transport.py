@@ -0,0 +1,178 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from nhl_api.scheduler import RequestScheduler
+from nhl_api.singleflight import SingleFlight
+
+BASE_URLS = {
+    'default': "https://api-web.nhle.com",
+    'stats': "https://api.nhle.com/stats/rest",
+}
+
+DEFAULT_HEADERS = {
+    'Accept': 'application/json',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+
+def resolve_base_url(base_urls, base_url_type):
+    """Look up base_url_type in a base_urls mapping, raising ValueError for unknown types"""
+    try:
+        return base_urls[base_url_type]
+    except KeyError:
+        raise ValueError(f"base_url_type must be one of {', '.join(repr(k) for k in base_urls)}. You provided: {base_url_type}") from None
+
+
+# Seconds spent opening connections (DNS + TCP + TLS) on this thread, for RequestRecord.connect
+_connect_timer = threading.local()
+
+
+class _TimedConnectionMixin:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timer.seconds = getattr(_connect_timer, 'seconds', 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class Transport:
+    """Pooled, keep-alive HTTP transport.
+
+    Holds one requests.Session per base URL, each mounted with an HTTPAdapter whose
+    connection pool holds up to `pool_size` sockets. Every Nhl client built on the same
+    Transport reuses those connections instead of opening a new TCP/TLS connection per call.
+    Requests are paced, limited and retried per host by a RequestScheduler.
+
+    Attributes:
+        base_urls (dict): Mapping of base_url_type ('default', 'stats') to base URL
+        pool_size (int): Maximum number of pooled connections per base URL
+        timeout (float or tuple): requests timeout - seconds, or (connect, read) tuple
+        headers (dict): Headers sent with every request
+        scheduler (RequestScheduler): Rate limiting, adaptive concurrency and retries
+        inflight (SingleFlight): Coalesces identical concurrent get_url calls of the clients sharing this Transport
+
+    Methods:
+        get(endpoint, base_url_type, params, headers): Send a GET request, return requests.Response
+        close(): Close all pooled sessions
+    """
+    def __init__(self, base_urls=None, pool_size=10, timeout=(3.05, 30), headers=None, scheduler=None):
+        self.base_urls = dict(BASE_URLS, **(base_urls or {}))
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        self.inflight = SingleFlight()
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def resolve(self, base_url_type):
+        """Return the base URL for a base_url_type ('default' or 'stats')"""
+        return resolve_base_url(self.base_urls, base_url_type)
+
+    def session(self, base_url):
+        """Return the pooled session for a base URL, creating it on first use"""
+        session = self._sessions.get(base_url)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(base_url)
+                if session is None:
+                    session = requests.Session()
+                    session.headers.update(self.headers)
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                    adapter.poolmanager.pool_classes_by_scheme = {
+                        'http': _TimedHTTPConnectionPool, 'https': _TimedHTTPSConnectionPool,
+                    }
+                    session.mount(base_url, adapter)
+                    self._sessions[base_url] = session
+        return session
+
+    def get(self, endpoint, base_url_type='default', params=None, headers=None, record=None):
+        """Send a GET request for an endpoint
+
+        Args:
+            endpoint (str): Path appended to the base URL (example: '/v1/season')
+            base_url_type (str, optional): Either 'default' or 'stats'. Defaults to 'default'.
+            params (dict, optional): Query string parameters
+            headers (dict, optional): Extra headers for this request only
+            record (RequestRecord, optional): Filled in with the url, attempts, status, size and
+                the connect / ttfb / download timings of the last attempt
+
+        Returns:
+            requests.Response with a 2xx or 304 status
+
+        Raises:
+            NhlHTTPError (or a subclass) for error statuses, NhlConnectionError for network failures,
+            once the scheduler's retries are exhausted
+        """
+        base_url = self.resolve(base_url_type)
+        session = self.session(base_url)
+        url = base_url + endpoint
+
+        def send():
+            if record is not None:
+                record.attempts += 1
+            _connect_timer.seconds = 0.0
+            start = time.perf_counter()
+            # stream=True returns once the headers are in, so TTFB and download can be told apart
+            r = session.get(url, params=params or None, headers=headers, timeout=self.timeout, stream=True)
+            headers_received = time.perf_counter()
+            content = r.content
+            if record is not None:
+                record.url = r.url
+                record.status = r.status_code
+                record.bytes = len(content)
+                record.connect = _connect_timer.seconds
+                record.ttfb = headers_received - start - record.connect
+                record.download = time.perf_counter() - headers_received
+            return r
+
+        return self.scheduler.send(url, send)
+
+    def close(self):
+        """Close every pooled session (and the connections they hold)"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+def get_default_transport():
+    """Return the process-wide Transport shared by every Nhl() built without its own transport"""
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = Transport()
+    return _default_transport
@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks.stub_server import StubServer
+from nhl_api.nhl import Nhl
+
+
+@pytest.fixture(scope='session')
+def stub_server():
+    with StubServer(total_games=40) as server:
+        yield server
+
+
+@pytest.fixture
+def stub_client(stub_server):
+    return Nhl(base_urls=stub_server.base_urls)
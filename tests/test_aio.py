@@ -0,0 +1,11 @@
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from nhl_api.aio import AsyncGame, AsyncNhl  # noqa: E402
+
+
+def test_async_game_does_not_follow():
+    game = AsyncGame(2023020204, client=AsyncNhl())
+    with pytest.raises(NotImplementedError, match='Game\\(game_id\\).follow'):
+        game.follow()
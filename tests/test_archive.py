@@ -0,0 +1,66 @@
+import importlib.util
+
+import pytest
+
+from nhl_api.archive import Archive
+from nhl_api.backfill import Backfill
+
+CODECS = ['gzip', pytest.param('zstd', marks=pytest.mark.skipif(importlib.util.find_spec('zstandard') is None,
+                                                                 reason='zstandard is not installed'))]
+
+
+@pytest.fixture(params=CODECS)
+def codec(request):
+    return request.param
+
+
+def test_round_trip(tmp_path, codec):
+    root = str(tmp_path / 'archive')
+    with Archive(root, codec=codec) as archive:
+        archive.add(2023020002, 'boxscore', {'id': 2023020002, 'version': 1})
+        archive.add(2023020001, 'meta', {'id': 2023020001})
+        archive.add(2023020001, 'play-by-play', {'plays': []})
+        archive.add(2023020002, 'boxscore', {'id': 2023020002, 'version': 2})
+        archive.add(2022020001, 'landing', {'id': 2022020001})
+    with Archive(root, codec='gzip') as archive:  # an existing season keeps its codec
+        assert archive.seasons() == [20222023, 20232024]
+        assert archive.get(2023020002, 'boxscore') == {'id': 2023020002, 'version': 2}
+        assert archive.get_game(2023020001) == {'play-by-play': {'plays': []}, 'meta': {'id': 2023020001}}
+        assert archive.games(20232024) == [2023020001, 2023020002]
+        assert archive.get(2023020003, 'boxscore') is None
+        assert [(game_id, endpoint) for game_id, endpoint, _payload in archive.iter_season(20232024)] == [
+            (2023020001, 'meta'), (2023020001, 'play-by-play'), (2023020002, 'boxscore')]
+        with pytest.raises(ValueError):
+            archive.get(2023020001, 'scoreboard')
+
+
+def test_interrupted_writes_lose_only_the_last_entry(tmp_path, codec):
+    root = str(tmp_path / 'archive')
+    with Archive(root, codec=codec) as archive:
+        archive.add(2023020001, 'boxscore', {'id': 1})
+        archive.add(2023020002, 'boxscore', {'id': 2})
+        index_path = archive.path(20232024)[:-1] + 'i'
+    with open(index_path, 'r+b') as f:
+        f.truncate(f.seek(0, 2) - 5)  # the second entry was cut off mid-write
+    with open(archive.path(20232024), 'ab') as f:
+        f.write(b'unindexed frame')
+    with Archive(root) as archive:
+        assert (2023020001, 'boxscore') in archive
+        assert (2023020002, 'boxscore') not in archive
+        archive.add(2023020002, 'boxscore', {'id': 2})
+    with Archive(root) as archive:
+        assert archive.get_game(2023020002) == {'boxscore': {'id': 2}}
+        assert [payload for _game_id, _endpoint, payload in archive.iter_season(20232024)] == [{'id': 1}, {'id': 2}]
+
+
+def test_fetch_and_import_from_the_stub(tmp_path, stub_client):
+    game_ids = [2023020001, 2023020002]
+    with Archive(str(tmp_path / 'archive')) as archive:
+        assert archive.fetch(game_ids, client=stub_client, endpoints=['boxscore', 'meta'], max_workers=2) == (4, [])
+        assert archive.fetch(game_ids, client=stub_client, endpoints=['boxscore', 'meta']) == (0, [])
+        assert archive.get(2023020002, 'boxscore') == stub_client.get_url('/v1/gamecenter/2023020002/boxscore')
+
+    Backfill(str(tmp_path / 'raw'), client=stub_client, endpoints=['landing'], progress=None).run(game_ids)
+    with Archive(str(tmp_path / 'imported')) as archive:
+        assert archive.import_backfill(str(tmp_path / 'raw')) == 2
+        assert archive.games(20232024) == game_ids
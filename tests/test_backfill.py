@@ -0,0 +1,39 @@
+import json
+
+from nhl_api.backfill import Backfill
+
+
+def _write_checkpoint(backfill, entries):
+    with open(backfill.checkpoint_path, 'w') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + '\n')
+        f.write('{"game_id": 1, "endp')  # interrupted write
+
+
+def test_only_final_games_are_done(tmp_path):
+    backfill = Backfill(str(tmp_path), client=object(), progress=None)
+    _write_checkpoint(backfill, [
+        # final game: state-less endpoints take the game's state
+        {'game_id': 1, 'endpoint': 'boxscore', 'state': 'OFF'},
+        {'game_id': 1, 'endpoint': 'shiftcharts', 'state': None},
+        # live game: nothing is done, shift charts included
+        {'game_id': 2, 'endpoint': 'boxscore', 'state': 'LIVE'},
+        {'game_id': 2, 'endpoint': 'shiftcharts', 'state': None},
+        # pregame fetch superseded by a final one
+        {'game_id': 3, 'endpoint': 'landing', 'state': 'FUT'},
+        {'game_id': 3, 'endpoint': 'landing', 'state': 'FINAL'},
+        # only state-less endpoints were fetched
+        {'game_id': 4, 'endpoint': 'meta', 'state': None},
+        # line written before states were recorded
+        {'game_id': 5, 'endpoint': 'boxscore'},
+    ])
+    assert backfill.load_checkpoint() == {(1, 'boxscore'), (1, 'shiftcharts'), (3, 'landing'), (4, 'meta'), (5, 'boxscore')}
+
+
+def test_rerun_skips_final_games(tmp_path, stub_client):
+    game_ids = [2023020001, 2023020002]
+    backfill = Backfill(str(tmp_path), client=stub_client, endpoints=['boxscore', 'meta'], progress=None)
+    stats = backfill.run(game_ids)
+    assert (stats.completed, stats.failed, stats.games) == (4, 0, 2)
+    stats = backfill.run(game_ids)
+    assert (stats.skipped, stats.completed) == (4, 0)
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from nhl_api.cache import FOREVER, CachePolicy, ResponseCache
+from nhl_api.nhl import Nhl
+
+BASE = 'https://api-web.nhle.com'
+
+
+@pytest.fixture(params=['sqlite', 'directory'])
+def make_cache(request, tmp_path):
+    path = str(tmp_path / ('cache.sqlite' if request.param == 'sqlite' else 'cache'))
+    return lambda policy=None: getattr(ResponseCache, request.param)(path, policy=policy)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    return now
+
+
+def test_live_game_expires(make_cache, clock):
+    cache = make_cache()
+    cache.set(BASE, '/v1/gamecenter/2023020204/boxscore', None, b'live', {'gameState': 'LIVE'})
+    clock[0] += 14
+    assert cache.get(BASE, '/v1/gamecenter/2023020204/boxscore') == b'live'
+    clock[0] += 2
+    assert cache.get(BASE, '/v1/gamecenter/2023020204/boxscore') is None
+
+
+def test_final_game_is_kept_for_good(make_cache, clock):
+    cache = make_cache()
+    assert cache.policy.ttl(cache, '/en/shiftcharts?cayenneExp=gameId=2023020204') == 60
+    cache.set(BASE, '/v1/gamecenter/2023020204/boxscore', None, b'final', {'gameState': 'OFF'})
+    # shift charts carry no gameState, but the game is now known to be over - also across restarts
+    cache = make_cache()
+    assert cache.is_final(2023020204)
+    assert cache.policy.ttl(cache, '/en/shiftcharts?cayenneExp=gameId=2023020204') == FOREVER
+    clock[0] += 10 * 365 * 24 * 3600
+    assert cache.get(BASE, '/v1/gamecenter/2023020204/boxscore') == b'final'
+
+
+def test_policy_rules(make_cache, clock):
+    cache = make_cache(CachePolicy(rules=[(r'^/v1/season$', None), (r'^/v1/player/', 10)], default_ttl=100))
+    cache.set(BASE, '/v1/season', None, b'seasons')
+    cache.set(BASE, '/v1/player/8478402/landing', None, b'player')
+    cache.set(BASE, '/v1/roster/STL/current', {'b': 2, 'a': 1}, b'roster')
+    assert cache.get(BASE, '/v1/season') is None
+    clock[0] += 50
+    assert cache.get(BASE, '/v1/player/8478402/landing') is None
+    assert cache.get(BASE, '/v1/roster/STL/current', {'a': 1, 'b': 2}) == b'roster'
+
+
+def test_client_serves_final_games_from_cache(tmp_path, stub_server):
+    client = Nhl(base_urls=stub_server.base_urls, cache=ResponseCache.sqlite(str(tmp_path / 'cache.sqlite')))
+    before = stub_server.request_count
+    boxscore = client.get_url('/v1/gamecenter/2023020204/boxscore')
+    assert client.get_url('/v1/gamecenter/2023020204/boxscore') == boxscore
+    assert stub_server.request_count == before + 1
+    assert client.cache.is_final(2023020204)
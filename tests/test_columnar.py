@@ -0,0 +1,69 @@
+import csv
+
+import pytest
+
+from nhl_api.columnar import MISSING, TableWriter, boxscore_players_table, game_log_table
+
+
+def _boxscore(plus_minus):
+    skater = {'playerId': 8478402, 'position': 'C', 'sweaterNumber': 97, 'goals': 0, 'assists': 1, 'points': 1,
+              'plusMinus': plus_minus, 'toi': '21:03', 'faceoffWinningPctg': 0.5}
+    goalie = {'playerId': 8475717, 'position': 'G', 'sweaterNumber': 74, 'toi': '60:00', 'savePctg': 0.9, 'starter': True}
+    return {
+        'id': 2023020204,
+        'awayTeam': {'id': 22},
+        'homeTeam': {'id': 20},
+        'playerByGameStats': {'awayTeam': {'forwards': [skater], 'goalies': [goalie]}, 'homeTeam': {}},
+    }
+
+
+def test_boxscore_negative_one_plus_minus_is_a_value():
+    table = boxscore_players_table(_boxscore(-1))
+    assert list(table['plus_minus']) == [-1, MISSING]
+
+
+def test_game_log_negative_one_plus_minus_is_a_value():
+    table = game_log_table({'seasonId': 20232024, 'gameTypeId': 2, 'gameLog': [{'gameId': 2023020204, 'plusMinus': -1}]},
+                           8478402)
+    assert list(table['plus_minus']) == [-1]
+
+
+def test_csv_keeps_negative_one(tmp_path):
+    path = str(tmp_path / 'players.csv')
+    with TableWriter(path) as writer:
+        writer.write(boxscore_players_table(_boxscore(-1)))
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['plus_minus'] for row in rows] == ['-1', '']
+
+
+def test_arrow_masks_only_missing():
+    pytest.importorskip('pyarrow')
+    table = boxscore_players_table(_boxscore(-1)).to_arrow()
+    assert table.column('plus_minus').to_pylist() == [-1, None]
+    assert table.column('starter').to_pylist() == [None, 1]
+
+
+def test_minus_128_is_not_missing(tmp_path):
+    table = boxscore_players_table(_boxscore(-128))
+    assert table.to_list('plus_minus') == [-128, None]
+    path = str(tmp_path / 'players.csv')
+    with TableWriter(path) as writer:
+        writer.write(table)
+    with open(path, newline='') as f:
+        assert [row['plus_minus'] for row in csv.DictReader(f)] == ['-128', '']
+
+
+def test_extend_keeps_validity_and_categories():
+    table = game_log_table({'gameLog': [{'gameId': 1, 'plusMinus': 2, 'decision': 'W'}]}, 8478402)
+    table.extend(game_log_table({'gameLog': [{'gameId': 2, 'decision': 'L'}, {'gameId': 3, 'plusMinus': -128}]}, 8478402))
+    assert table.to_list('plus_minus') == [2, None, -128]
+    assert table.decode('decision') == ['W', 'L', None]
+    assert table.code('decision', 'L') == 1
+    assert table.code('decision', 'OT') is None
+
+
+def test_arrow_keeps_minus_128():
+    pytest.importorskip('pyarrow')
+    table = boxscore_players_table(_boxscore(-128)).to_arrow()
+    assert table.column('plus_minus').to_pylist() == [-128, None]
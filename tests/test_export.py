@@ -0,0 +1,42 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from nhl_api import export as export_module
+from nhl_api.columnar import game_log_table
+from nhl_api.export import _Task, export
+
+
+def test_memory_limit_flushes_every_tenth_of_a_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_module, '_rss_bytes', lambda: 2 ** 40)
+    monkeypatch.setitem(export_module._worker, 'out', str(tmp_path))
+    monkeypatch.setitem(export_module._worker, 'file_format', 'csv')
+    monkeypatch.setitem(export_module._worker, 'batch_rows', 100)
+    monkeypatch.setitem(export_module._worker, 'memory_limit', 2 ** 20)
+    monkeypatch.setitem(export_module._worker, 'instrumentation', export_module.Instrumentation())
+    task = _Task(20232024, 0, ['game_logs'])
+    flushes = []
+    flush = task.flush
+    monkeypatch.setattr(task, 'flush', lambda: (flushes.append(1), flush()))
+    for game in range(100):
+        task.add('game_logs', game_log_table({'gameLog': [{'gameId': 2023020001 + game}]}, 8478402))
+    assert len(flushes) == 10
+    assert task.close()['rows'] == {'game_logs': 100}
+
+
+def test_failed_games_chunk_still_exports_game_logs(tmp_path, monkeypatch, stub_server):
+    export_games = export_module._export_games
+
+    def failing_export_games(season, part, *args):
+        if part == 0:
+            raise RuntimeError('worker failed')
+        return export_games(season, part, *args)
+
+    # threads instead of processes, so the patched task is the one that runs
+    monkeypatch.setattr(export_module, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(export_module, '_export_games', failing_export_games)
+    stats = export([20232024], str(tmp_path), datasets=['games', 'game_logs'], file_format='csv', game_types=(2,),
+                   processes=2, chunk_size=10, fetch_threads=2, base_urls=stub_server.base_urls)
+    assert stats.errors == [('games 20232024 part 0', "RuntimeError('worker failed')")]
+    assert stats.games == 30
+    assert stats.rows['game_logs'] > 0
+    assert os.listdir(tmp_path / 'game_logs' / 'season=20232024')
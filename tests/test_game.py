@@ -0,0 +1,15 @@
+from nhl_api.game import Game
+
+
+def test_get_all_details_many_merges_each_game_once(stub_client):
+    game_ids = [2023020001 + n for n in range(6)] + [2023020001]
+    results = list(Game.get_all_details_many(game_ids, max_workers=3, client=stub_client))
+    assert sorted(game_id for game_id, _details in results) == sorted(game_ids)
+    details = dict(results)
+    assert details[2023020003] == Game(2023020003, client=stub_client).get_all_details()
+
+
+def test_get_all_details_many_projects_sections(stub_client):
+    results = dict(Game.get_all_details_many([2023020001, 2023020002], max_workers=4, client=stub_client,
+                                             sections=['plays', 'playerByGameStats']))
+    assert results[2023020002] == Game(2023020002, client=stub_client).get_details(['plays', 'playerByGameStats'])
@@ -0,0 +1,67 @@
+import socket
+
+from nhl_api.live import LiveGame, LivePoller
+from nhl_api.nhl import Nhl
+from nhl_api.scheduler import RequestScheduler, RetryPolicy
+from nhl_api.transport import Transport
+
+
+def _play(event_id, type_desc_key='shot-on-goal'):
+    return {'eventId': event_id, 'sortOrder': event_id * 10, 'typeDescKey': type_desc_key}
+
+
+def _payload(plays, clock=None, home=0, state='LIVE'):
+    return {'plays': plays, 'clock': clock or {'running': True, 'timeRemaining': '12:00'},
+            'homeTeam': {'score': home}, 'awayTeam': {'score': 0}, 'gameState': state}
+
+
+def _kinds(events):
+    return [(event.kind, event.data['eventId'] if event.kind in ('play', 'correction') else event.data) for event in events]
+
+
+def test_update_yields_only_changes():
+    live = LiveGame(2023020204, client=object())
+    events = live.update(_payload([_play(2), _play(1)]))
+    assert _kinds(events)[:2] == [('play', 1), ('play', 2)]
+    assert [event.kind for event in events[2:]] == ['clock', 'score', 'state']
+    assert live.update(_payload([_play(1), _play(2)])) == []
+    events = live.update(_payload([_play(1), _play(2), _play(3, 'goal')], home=1))
+    assert _kinds(events) == [('play', 3), ('score', {'away': 0, 'home': 1})]
+    assert _kinds(live.update(_payload([_play(1), _play(2), _play(3, 'goal')], home=1, state='OFF'))) == [('state', 'OFF')]
+    assert live.done
+
+
+def test_corrections_inside_the_window():
+    live = LiveGame(2023020204, client=object(), correction_window=2)
+    plays = [_play(event_id) for event_id in range(1, 6)]
+    live.update(_payload(plays))
+    corrected = [_play(1, 'hit')] + plays[1:4] + [_play(5, 'goal')]
+    # play 1 is outside the last two known plays, so only play 5 is re-compared
+    assert _kinds(live.update(_payload(corrected + [_play(6)]))) == [('correction', 5), ('play', 6)]
+
+
+def test_poll_delays_follow_the_game():
+    live = LiveGame(2023020204, client=object(), intervals={'running': 1})
+    assert live.next_delay() == 0
+    live.update(_payload([], clock={'running': True}))
+    assert live.next_delay() == 1
+    live.update(_payload([], clock={'running': False, 'inIntermission': True}))
+    assert live.next_delay() == 30
+    live.update(_payload([], clock={'running': False}, state='FUT'))
+    assert live.next_delay() == 60
+
+
+def test_follow_stops_at_final(stub_client):
+    events = list(LiveGame(2023020204, client=stub_client))
+    assert events[-1].kind == 'state' and events[-1].data == 'OFF'
+    assert sum(event.kind == 'play' for event in events) > 0
+
+
+def test_poller_drops_games_that_keep_failing():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    scheduler = RequestScheduler(retry=RetryPolicy(max_retries=0))
+    client = Nhl(transport=Transport(base_urls={'default': f"http://127.0.0.1:{port}"}, scheduler=scheduler))
+    poller = LivePoller([2023020204], client=client, retry=RetryPolicy(backoff_base=0.01), max_failures=3)
+    assert [event.kind for event in poller] == ['error'] * 3
@@ -0,0 +1,56 @@
+from nhl_api.schedule import ScheduleIndex
+
+
+def _game(game_id, date, home, away, state='FUT'):
+    return {'id': game_id, 'season': 20232024, 'gameType': game_id // 10000 % 100, 'gameDate': date, 'gameState': state,
+            'homeTeam': {'id': home[0], 'abbrev': home[1]}, 'awayTeam': {'id': away[0], 'abbrev': away[1]}}
+
+
+STL, EDM, CHI = (19, 'STL'), (22, 'EDM'), (16, 'CHI')
+
+
+def _index():
+    games = [
+        _game(2023020003, '2024-01-02', STL, CHI, 'OFF'),
+        _game(2023020001, '2024-01-01', STL, EDM, 'OFF'),
+        _game(2023020002, '2024-01-02', EDM, CHI, 'OFF'),
+        _game(2023020004, '2024-01-05', CHI, EDM),
+    ]
+    return ScheduleIndex(games + games[:2])  # every game is listed by both clubs
+
+
+def test_lookups():
+    index = _index()
+    assert len(index) == 4
+    assert index.on_date('2024-01-02') == [2023020002, 2023020003]
+    assert index.on_date('2024-01-03') == []
+    assert index.between('2024-01-01', '2024-01-04') == [2023020001, 2023020002, 2023020003]
+    assert index.for_team('EDM') == [2023020001, 2023020002, 2023020004]
+    assert index.unfinished() == [2023020004]
+    assert index.get(2023020004)['home'] == 'CHI'
+
+
+def test_refresh_moves_postponed_game():
+    index = _index()
+    index.refresh([_game(2023020002, '2024-02-10', EDM, CHI, 'FUT'), _game(2023020005, '2024-01-02', STL, EDM)])
+    assert index.on_date('2024-01-02') == [2023020003, 2023020005]
+    assert index.between('2024-02-01', '2024-02-28') == [2023020002]
+    assert index.get(2023020002)['date'] == '2024-02-10'
+    assert index.unfinished() == [2023020002, 2023020004, 2023020005]
+
+
+def test_save_load(tmp_path):
+    index = _index()
+    path = str(tmp_path / 'schedule.json.gz')
+    index.save(path)
+    loaded = ScheduleIndex.load(path)
+    assert loaded.between('2024-01-01', '2024-12-31') == index.between('2024-01-01', '2024-12-31')
+    assert loaded.for_team('STL') == index.for_team('STL')
+
+
+def test_build_deduplicates_club_schedules(stub_client):
+    index = ScheduleIndex.build([20232024], client=stub_client, teams=['STL', 'EDM'])
+    ids = index.for_season(20232024)
+    assert ids == sorted(set(ids)) and len(ids) == len(index)
+    for game_id in ids[:5]:
+        assert game_id in index.on_date(index.get(game_id)['date'])
@@ -0,0 +1,64 @@
+import socket
+import time
+
+import pytest
+
+from benchmarks.stub_server import StubServer
+from nhl_api.errors import NhlConnectionError, NhlNotFoundError, NhlRateLimitError, NhlServerError
+from nhl_api.nhl import Nhl
+from nhl_api.scheduler import RequestScheduler, RetryPolicy, parse_retry_after
+from nhl_api.transport import Transport
+
+
+def _client(base_urls, max_retries):
+    scheduler = RequestScheduler(retry=RetryPolicy(max_retries=max_retries, backoff_base=0.01))
+    return Nhl(transport=Transport(base_urls=base_urls, scheduler=scheduler))
+
+
+def test_429_waits_retry_after_then_raises():
+    with StubServer(error_rate_429=1.0, retry_after=0.2) as server:
+        client = _client(server.base_urls, max_retries=2)
+        started = time.monotonic()
+        with pytest.raises(NhlRateLimitError) as error:
+            client.get_url('/v1/season')
+        assert time.monotonic() - started >= 0.4
+        assert error.value.retry_after == 0.2
+        assert server.request_count == 3
+        assert client.transport.scheduler.concurrency(server.url) == 4  # halved once per cooldown
+
+
+def test_5xx_raises_server_error_once_retries_run_out():
+    with StubServer(error_rate_500=1.0) as server:
+        with pytest.raises(NhlServerError) as error:
+            _client(server.base_urls, max_retries=3).get_url('/v1/season')
+        assert error.value.status_code == 500
+        assert server.request_count == 4
+
+
+def test_transient_errors_are_retried():
+    with StubServer(error_rate_500=0.5) as server:
+        assert _client(server.base_urls, max_retries=30).get_url('/v1/season')[0] == 19171918
+
+
+def test_404_is_not_retried(stub_server):
+    before = stub_server.request_count
+    with pytest.raises(NhlNotFoundError):
+        _client(stub_server.base_urls, max_retries=3).get_url('/v1/unknown')
+    assert stub_server.request_count == before + 1
+
+
+def test_connection_errors_are_typed():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]  # nothing listens on it once the socket is closed
+    with pytest.raises(NhlConnectionError):
+        _client({'default': f"http://127.0.0.1:{port}"}, max_retries=1).get_url('/v1/season')
+
+
+def test_retry_delays():
+    policy = RetryPolicy(backoff_base=1, backoff_cap=5)
+    assert all(0 <= policy.delay(attempt) <= min(5, 2 ** attempt) for attempt in range(6) for _ in range(20))
+    assert policy.delay(0, retry_after=60) == 5
+    assert parse_retry_after('2') == 2.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.stub_server import StubServer
+from nhl_api.nhl import Nhl
+from nhl_api.singleflight import SingleFlight
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_result():
+    flight, release, calls = SingleFlight(), threading.Event(), []
+
+    def func():
+        calls.append(1)
+        release.wait()
+        return {'value': 1}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(flight.do, 'key', func) for _ in range(8)]
+        _wait_for(lambda: flight.coalesced == 7)
+        release.set()
+        results = [future.result() for future in futures]
+    assert len(calls) == 1
+    assert sorted(shared for _result, shared in results) == [False] + [True] * 7
+    assert all(result is results[0][0] for result, _shared in results)
+    # the key is forgotten once the call completes
+    assert flight.do('key', lambda: 2) == (2, False)
+    assert (flight.leaders, flight.coalesced) == (2, 7)
+
+
+def test_followers_receive_the_error():
+    flight, release = SingleFlight(), threading.Event()
+
+    def func():
+        release.wait()
+        raise ValueError('boom')
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(flight.do, 'key', func) for _ in range(3)]
+        _wait_for(lambda: flight.coalesced == 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match='boom'):
+                future.result()
+
+
+def test_coroutines_share_one_call():
+    flight, calls = SingleFlight(), []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'value'
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async('key', func) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert [result for result, _shared in results] == ['value'] * 5
+
+
+def test_client_coalesces_identical_requests():
+    with StubServer(latency=0.2) as server:
+        client = Nhl(base_urls=server.base_urls)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: client.get_url('/v1/season'), range(8)))
+            other = client.get_url('/v1/season', params={'x': 1})
+        assert all(result == results[0] for result in results) and other == results[0]
+        assert server.request_count == 2
+        assert client.inflight.coalesced == 7
@@ -0,0 +1,65 @@
+import datetime
+
+from nhl_api.store import GameStore
+
+TODAY = datetime.date(2024, 3, 21)
+
+
+class _ListingClient:
+    """Stands in for Nhl.iter_games, serving fixed game rows"""
+    def __init__(self, rows):
+        self.rows = rows
+
+    def iter_games(self, season=None, start_date=None):
+        return [row for row in self.rows if start_date is None or row['gameDate'] >= start_date]
+
+
+def _row(game_id, game_date, state_id):
+    return {'id': game_id, 'season': 20232024, 'gameType': 2, 'gameDate': game_date, 'gameStateId': state_id}
+
+
+def _store(tmp_path, rows):
+    store = GameStore(str(tmp_path / 'games.db'), client=_ListingClient(rows), endpoints=['meta'])
+    store.sync_index()
+    return store
+
+
+def test_watermark_is_the_earliest_unfinished_game(tmp_path):
+    store = GameStore(str(tmp_path / 'games.db'), client=_ListingClient([]))
+    assert store.watermark() is None
+    store.client = _ListingClient([_row(1, '2024-03-01', 7), _row(2, '2024-03-20', 3), _row(3, '2024-03-25', 1)])
+    store.sync_index()
+    assert store.watermark() == '2024-03-20'
+    assert store.watermark(season=20222023) is None
+    # rows of final games are never rewritten; the rest are
+    store.client = _ListingClient([_row(1, '2024-03-01', 1), _row(2, '2024-03-20', 7), _row(3, '2024-03-25', 7)])
+    assert store.sync_index() == 2
+    assert [game['game_state'] for game in store.games()] == ['OFF', 'OFF', 'OFF']
+    assert store.watermark() == '2024-03-25'
+
+
+def test_stale_games(tmp_path):
+    store = _store(tmp_path, [
+        _row(1, '2024-03-01', 7),  # final, never fetched
+        _row(2, '2024-03-21', 3),  # live today
+        _row(3, '2024-03-21', 1),  # later today
+        _row(4, '2024-03-25', 1),  # future
+        _row(5, '2024-03-02', 7),  # final, fetched once final
+    ])
+    store._store(5, {'meta': {'season': 20232024}})  # no gameState: fetched at the listed OFF
+    assert store.stale_games(today=TODAY) == [1, 2]
+    store._store(1, {'boxscore': {'gameState': 'LIVE'}})  # fetched before it went final
+    store._store(2, {'boxscore': {'gameState': 'LIVE'}})
+    assert store.stale_games(today=TODAY) == [1, 2]
+    store._store(2, {'boxscore': {'gameState': 'FINAL'}})
+    assert store.stale_games(today=TODAY) == [1]
+    assert store.stale_games(season=20222023, today=TODAY) == []
+
+
+def test_sync_against_the_stub(tmp_path, stub_client):
+    with GameStore(str(tmp_path / 'games.db'), client=stub_client, endpoints=['boxscore', 'meta'], max_workers=4) as store:
+        result = store.sync(today=TODAY)
+        assert (result.listed, result.refreshed, result.errors) == (40, 40, [])
+        game_id = store.games()[0]['id']
+        assert store.get(game_id, 'boxscore')['id'] == game_id
+        assert store.sync(today=TODAY).refreshed == 0
@@ -0,0 +1,72 @@
+import itertools
+import random
+from collections import defaultdict
+
+from nhl_api.game import Game
+from nhl_api.toi import Intervals, analyze_game, analyze_season, combinations, on_ice_at, plays_on_ice, time_on_ice
+
+
+def _mmss(seconds):
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def _shift_charts(shifts):
+    """shifts: (player_id, team_id, period, start, end) with times in seconds of the period"""
+    return {'data': [{'gameId': 2023020204, 'playerId': player_id, 'teamId': team_id, 'period': period, 'typeCode': 517,
+                      'startTime': _mmss(start), 'endTime': _mmss(end) if end is not None else None}
+                     for player_id, team_id, period, start, end in shifts]}
+
+
+def test_time_on_ice_counts_overlaps_once():
+    intervals = Intervals.from_shift_charts(_shift_charts([
+        (1, 10, 1, 0, 60), (1, 10, 1, 30, 90), (1, 10, 1, 40, 50),
+        (2, 10, 2, 0, 45),
+        (3, 20, 1, 100, 100), (3, 20, 1, 200, None),  # dropped: empty and open-ended shifts
+    ]))
+    assert len(intervals) == 4
+    assert time_on_ice(intervals) == {1: 90, 2: 45}
+
+
+def test_on_ice_at_shift_boundaries():
+    intervals = Intervals.from_shift_charts(_shift_charts([(1, 10, 1, 0, 60), (2, 10, 1, 60, 120), (3, 20, 1, 0, 120)]))
+    # at 60 the player going off was on for a goal, the one coming on takes the faceoff
+    goal, faceoff = on_ice_at(intervals, [60, 60], starting=[False, True])
+    assert goal == {10: frozenset({1}), 20: frozenset({3})}
+    assert faceoff == {10: frozenset({2}), 20: frozenset({3})}
+    plays = {'plays': [{'eventId': 7, 'timeInPeriod': '01:30', 'periodDescriptor': {'number': 1}, 'typeDescKey': 'shot-on-goal'},
+                       {'eventId': 8, 'timeInPeriod': None}]}
+    assert plays_on_ice(intervals, plays) == [(7, {10: frozenset({2}), 20: frozenset({3})})]
+
+
+def test_combinations_match_a_second_by_second_count():
+    rng = random.Random(4)
+    shifts = []
+    for player_id in range(1, 9):
+        t = rng.randrange(30)
+        while t < 1100:
+            length = rng.randrange(20, 70)
+            shifts.append((player_id, 10 if player_id <= 5 else 20, 1, t, min(t + length, 1200)))
+            t += length + rng.randrange(0, 90)
+    intervals = Intervals.from_shift_charts(_shift_charts(shifts))
+
+    expected = defaultdict(int)
+    for second in range(1200):
+        for team_id in (10, 20):
+            players = sorted({player_id for player_id, team, _period, start, end in shifts
+                              if team == team_id and start <= second < end})
+            for combo in itertools.combinations(players, 2):
+                expected[team_id, combo] += 1
+    assert combinations(intervals, size=2) == dict(expected)
+    positions = {player_id: 'F' if player_id % 2 else 'D' for player_id in range(1, 9)}
+    assert all(all(positions[player_id] == 'D' for player_id in combo)
+               for _team_id, combo in combinations(intervals, positions, group='D', size=2))
+
+
+def test_analyze_season_matches_analyze_game(stub_server, stub_client):
+    game_ids = [2023020001, 2023020002]
+    analyses = list(analyze_season(game_ids, processes=2, base_urls=stub_server.base_urls, chunksize=1))
+    assert [game_id for game_id, _analysis in analyses] == game_ids
+    game = Game(2023020002, client=stub_client)
+    expected = analyze_game(game.get_shift_charts(), game.get_boxscore())
+    assert analyses[1][1] == expected
+    assert expected['toi'] and expected['lines'] and expected['pairings']